@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'tracker',
     
 ]
@@ -164,6 +165,116 @@ LOGGING = {
     },
 }
 
+# On-disk HTTP response cache used by the scrapers' fetch engine. Its index is a SQLite
+# file in DIR, so every worker process shares the entries and the MAX_BYTES bound.
+SCRAPER_HTTP_CACHE = {
+    'ENABLED': True,
+    'DIR': BASE_DIR / '.scraper_cache' / 'http',
+    'MAX_BYTES': 512 * 1024 * 1024,
+    # Seconds a response stays fresh, per URL class (see tracker/scrapers/http_cache.py)
+    'TTL': {
+        'search': 15 * 60,
+        'product': 60 * 60,
+        'default': 10 * 60,
+    },
+}
+
+# Per-host adaptive rate limits for the fetch engine (tracker/scrapers/rate_limit.py).
+# 'default' applies to every host; add a host key to override it.
+SCRAPER_RATE_LIMITS = {
+    'default': {'rate': 2.0, 'burst': 4, 'min_rate': 0.2, 'max_rate': 8.0},
+    'www.amazon.in': {'rate': 1.0, 'max_rate': 4.0},
+}
+
+# Product-page fan-out per platform (tracker/scrapers/fanout.py): how many pages are
+# fetched at once and the deadline in seconds after which partial results are returned.
+# Selenium platforms hold one pooled Chrome per page, so keep them at or under MAX_DRIVERS.
+SCRAPER_FANOUT = {
+    'default': {'fanout': 5, 'deadline': 45},
+    'croma': {'fanout': 3, 'deadline': 90},
+    'reliance': {'fanout': 4, 'deadline': 60},
+}
+
+# Long-lived process pool for the CPU-bound page parsing (tracker/scrapers/parse_pool.py).
+# WORKERS defaults to min(4, CPU count); with ENABLED False pages are parsed in the calling thread.
+SCRAPER_PARSE_POOL = {
+    'ENABLED': True,
+    'WORKERS': None,
+}
+
+# Per-platform circuit breakers in the search path (tracker/scrapers/circuit_breaker.py).
+# Health is visible at /api/scraper-health/.
+SCRAPER_CIRCUIT_BREAKER = {
+    'default': {'window': 20, 'min_calls': 5, 'failure_threshold': 0.5, 'slow_call_seconds': 45, 'open_seconds': 120},
+    'croma': {'slow_call_seconds': 90},
+}
+
+# Concurrent identical searches share one scrape per (platform, canonical query)
+# (tracker/scrapers/single_flight.py). Across processes the leader holds a PostgreSQL
+# advisory lock ('advisory_lock') or a lock entry in the scraper cache ('cache').
+SCRAPER_SINGLE_FLIGHT = {
+    'BACKEND': 'advisory_lock',
+    'WAIT_SECONDS': 120,
+}
+
+# Search queries are canonicalized before keying caches, single-flight, breakers and
+# tracked products (tracker/scrapers/query_utils.py), so "iPhone 15 128GB" and
+# "Apple iPhone 15 (128 GB)" share one key. Extra synonyms live in the QuerySynonym
+# table (admin); collapse metrics are under 'queries' at /api/scraper-health/.
+QUERY_CANONICALIZER = {
+    'SYNONYMS': True,
+    'SYNONYM_TTL': 300,
+    'TRACKED_KEYS': 1000,
+}
+
+# Resources the pooled Chrome instances refuse to download, per platform
+# (categories are defined in tracker/scrapers/driver_pool.py BLOCK_CATEGORIES).
+# Compare load time and bytes with: python manage.py bench_page_load
+SCRAPER_RESOURCE_BLOCKING = {
+    'default': ['images', 'fonts', 'stylesheets', 'media', 'trackers'],
+    # Arbitrary brand storefronts may lay out lazily rendered content with CSS
+    'brand': ['images', 'fonts', 'media', 'trackers'],
+}
+
+# Search results served from the DB are considered stale after this many seconds,
+# at which point a background scrape refreshes them for the next caller (at most once
+# per query and platform within this window).
+SEARCH_RESULT_TTL = {
+    'default': 6 * 60 * 60,
+    'amazon': 3 * 60 * 60,
+    'flipkart': 3 * 60 * 60,
+}
+SEARCH_REFRESH_WORKERS = 2
+# Threads shared by all in-flight async searches for blocking scrapes
+SEARCH_SCRAPE_WORKERS = 8
+
+# Cache shared by all scraper workers on this host; point 'scraper' at Redis/Memcached
+# to share it across machines.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'scraper': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.scraper_cache' / 'discovery',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Search query -> product URL cache (tracker/scrapers/discovery_cache.py).
+# Queries are normalized (case, whitespace, token order) before lookup.
+SCRAPER_DISCOVERY_CACHE = {
+    'ENABLED': True,
+    'ALIAS': 'scraper',
+    # Seconds a platform's search results are reused
+    'TTL': {
+        'amazon': 30 * 60,
+        'flipkart': 30 * 60,
+        'reliance': 60 * 60,
+        'croma': 2 * 60 * 60,
+    },
+}
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Kolkata'  # Set to IST for consistency with your timezone
 USE_I18N = True
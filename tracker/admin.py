@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import QuerySynonym
 
 # Register your models here.
+@admin.register(QuerySynonym)
+class QuerySynonymAdmin(admin.ModelAdmin):
+    list_display = ('phrase', 'canonical', 'created_at')
+    search_fields = ('phrase', 'canonical')
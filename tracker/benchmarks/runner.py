@@ -0,0 +1,159 @@
+import json
+import logging
+import time
+import tracemalloc
+from pathlib import Path
+
+from tracker.scrapers import amazon, brand, croma, flipkart, reliance
+from tracker.scrapers.price_refresh import parse_price_fields
+from tracker.scrapers.structured_data import HtmlPage
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+BRAND_FIXTURE_URL = 'https://www.brand.example/products/fixture'
+
+
+def _on_page(func):
+    # A fresh HtmlPage per call so no parse work is shared between iterations
+    return lambda page_html: func(HtmlPage(page_html))
+
+
+# platform -> benchmark case -> callable taking raw page HTML.
+# Amazon/Flipkart run the parsing half of extract_product_data (everything after the fetch).
+BENCHMARKS = {
+    'amazon': {
+        'extract_product_data': lambda page_html: amazon.parse_product_data(page_html, amazon.get_amazon_extractor()),
+        'price_refresh': lambda page_html: parse_price_fields('amazon', page_html),
+    },
+    'flipkart': {
+        'extract_product_data': lambda page_html: flipkart.parse_product_data(page_html, flipkart.get_flipkart_extractor()),
+        'price_refresh': lambda page_html: parse_price_fields('flipkart', page_html),
+    },
+    'croma': {
+        'parse_product_page': croma.parse_product_page,
+        'smart_extract_price': _on_page(croma.smart_extract_price),
+        'smart_extract_image': _on_page(croma.smart_extract_image),
+        'extract_reviews': _on_page(croma.extract_reviews),
+    },
+    'reliance': {
+        'parse_product_page': reliance.parse_product_page,
+        'smart_extract_price': _on_page(reliance.smart_extract_price),
+        'smart_extract_image': _on_page(reliance.smart_extract_image),
+        'extract_reviews': _on_page(reliance.extract_reviews),
+    },
+    'brand': {
+        'parse_brand_page': lambda page_html: brand.parse_brand_page(page_html, BRAND_FIXTURE_URL, 'fixture'),
+        'smart_extract_price': _on_page(brand.smart_extract_price),
+        'smart_extract_image': _on_page(brand.smart_extract_image),
+    },
+}
+
+
+class BenchmarkResult:
+    def __init__(self, platform, case, timings_ms, peak_bytes):
+        self.platform = platform
+        self.case = case
+        self.pages = len(timings_ms)
+        self.total_ms = sum(timings_ms)
+        ordered = sorted(timings_ms)
+        self.p50_ms = percentile(ordered, 50)
+        self.p99_ms = percentile(ordered, 99)
+        self.pages_per_sec = self.pages / (self.total_ms / 1000) if self.total_ms else 0.0
+        self.peak_kb = peak_bytes / 1024
+
+    @property
+    def key(self):
+        return f"{self.platform}/{self.case}"
+
+    def to_dict(self):
+        return {
+            'pages_per_sec': round(self.pages_per_sec, 2),
+            'p50_ms': round(self.p50_ms, 3),
+            'p99_ms': round(self.p99_ms, 3),
+            'peak_kb': round(self.peak_kb, 1),
+        }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def load_fixtures(platform):
+    """``(name, html)`` for every saved page of a platform, in name order."""
+    return [
+        (path.name, path.read_text(encoding='utf-8'))
+        for path in sorted((FIXTURES_DIR / platform).glob('*.html'))
+    ]
+
+
+def run_case(platform, case, func, fixtures, iterations):
+    for _, page_html in fixtures:
+        func(page_html)  # warm-up: compiled selectors, imports, regex caches
+
+    timings_ms = []
+    for _ in range(iterations):
+        for _, page_html in fixtures:
+            start = time.perf_counter()
+            func(page_html)
+            timings_ms.append((time.perf_counter() - start) * 1000)
+
+    # Memory is measured in a separate pass; tracing would skew the timings above
+    tracemalloc.start()
+    try:
+        peak_bytes = 0
+        for _, page_html in fixtures:
+            tracemalloc.reset_peak()
+            func(page_html)
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(platform, case, timings_ms, peak_bytes)
+
+
+def run_benchmarks(platforms=None, cases=None, iterations=20):
+    results = []
+    # The scrapers log every page at INFO; keep that out of the measurements
+    logging.disable(logging.INFO)
+    try:
+        for platform in platforms or sorted(BENCHMARKS):
+            fixtures = load_fixtures(platform)
+            if not fixtures:
+                continue
+            for case, func in BENCHMARKS[platform].items():
+                if cases and case not in cases:
+                    continue
+                results.append(run_case(platform, case, func, fixtures, iterations))
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+# -------------------- BASELINES --------------------
+def save_baseline(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({result.key: result.to_dict() for result in results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(result, baseline):
+    """Relative p50/throughput/memory change against a saved baseline, or None if absent."""
+    previous = baseline.get(result.key)
+    if not previous:
+        return None
+
+    def change(current, before):
+        return (current - before) / before if before else 0.0
+
+    return {
+        'p50': change(result.p50_ms, previous['p50_ms']),
+        'pages_per_sec': change(result.pages_per_sec, previous['pages_per_sec']),
+        'peak_kb': change(result.peak_kb, previous['peak_kb']),
+    }
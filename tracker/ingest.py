@@ -0,0 +1,257 @@
+import logging
+import re
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.models import (
+    AmazonProduct, FlipkartProduct, PriceHistory, PriceOfProductsHistory, ScrapedProduct,
+    analyze_product_reviews,
+)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_FIELDS = ['name', 'description', 'image_url', 'reviews', 'rating', 'content_hash']
+
+
+class IngestResult:
+    def __init__(self, platform, products, prices, seconds, changed=0):
+        self.platform = platform
+        self.products = products   # ScrapedProduct rows inserted or updated
+        self.prices = prices       # Price history rows inserted
+        self.changed = changed     # Products whose content was new or changed
+        self.seconds = seconds
+
+    @property
+    def rows(self):
+        return self.products + self.prices
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.platform}: {self.products} products ({self.changed} changed) and {self.prices} prices "
+                f"in {self.seconds * 1000:.0f} ms ({self.rows_per_sec:.0f} rows/s)")
+
+
+# -------------------- NORMALIZATION --------------------
+def parse_price(platform, raw_price):
+    """'₹1,23,999.00' -> Decimal('123999.00'); None when there is no usable price."""
+    price_str = str(raw_price or '')
+    if platform == 'flipkart':
+        price_str = price_str.split()[0] if price_str.split() else ''
+    price_str = price_str.replace('₹', '').replace(',', '').strip()
+    if not price_str or price_str.lower() == 'n/a':
+        return None
+    price_str = ''.join(c for c in price_str if c.isdigit() or c == '.')
+    if price_str.count('.') > 1:
+        price_str = price_str.rsplit('.', 1)[0]
+    try:
+        return Decimal(price_str) if price_str else None
+    except InvalidOperation:
+        logger.error(f"Price conversion error for {raw_price!r}")
+        return None
+
+
+def parse_rating(raw_rating):
+    """'4.2 out of 5 stars' -> Decimal('4.2'); None when unrated."""
+    match = re.match(r'(\d+\.\d+)', str(raw_rating or '').strip())
+    return Decimal(match.group(1)) if match else None
+
+
+# -------------------- ROW VALIDATION --------------------
+# Batches are written with a few bulk statements in one transaction, so a single row
+# the database rejects would roll back every product and price in the batch. Rows
+# are fitted to their columns up front and the ones that still don't fit are skipped.
+def truncate(model, field_name, value):
+    return value[:model._meta.get_field(field_name).max_length] if value else value
+
+
+def usable_image_url(model, value):
+    """The image URL, or '' when it is 'N/A', malformed or too long for the column."""
+    if not value:
+        return ''
+    try:
+        return model._meta.get_field('image_url').clean(value, None)
+    except ValidationError:
+        return ''
+
+
+def fits_columns(product, field_names, extra=()):
+    """Whether the database will accept these fields of ``product`` and the ``extra``
+    (field, value) pairs bound for other tables; logs what is wrong and returns False otherwise."""
+    errors = {}
+    values = [(product._meta.get_field(name), getattr(product, name)) for name in field_names]
+    for field, value in values + list(extra):
+        try:
+            field.clean(value, product)
+        except ValidationError as e:
+            errors[field.name] = e.messages[0]
+    if errors:
+        logger.warning(f"Skipping {product.url}: {'; '.join(f'{k}: {v}' for k, v in errors.items())}")
+        return False
+    return True
+
+
+# -------------------- POST-BATCH HOOKS --------------------
+# Called once per committed batch with (platform, products whose content changed);
+# this is where per-row post_save work belongs now that ingestion bypasses save().
+_post_batch_hooks = []
+
+
+def post_batch_hook(func):
+    _post_batch_hooks.append(func)
+    return func
+
+
+def run_post_batch_hooks(platform, changed_products):
+    for hook in _post_batch_hooks:
+        try:
+            hook(platform, changed_products)
+        except Exception as e:
+            logger.error(f"Post-batch hook {hook.__name__} failed for {platform}: {e}")
+
+
+@post_batch_hook
+def analyze_changed_reviews(platform, changed_products):
+    for product in changed_products:
+        analyze_product_reviews(product)
+
+
+# -------------------- SCRAPED PRODUCTS --------------------
+def ingest_scraped_items(platform, items):
+    """Upsert a batch of ScrapedItem and record their prices in a handful of statements.
+
+    New products and products whose content hash changed are written with one
+    ``bulk_create(update_conflicts=True)``; unchanged products only get a rating
+    fix-up. All prices go in with one insert, and the denormalized latest price
+    with one bulk update. Post-batch hooks (review analysis) then run for the
+    new and changed products. Items that can't fit their columns are skipped.
+    """
+    started = time.perf_counter()
+    platform = platform.lower()
+    now = timezone.now()
+
+    price_field = PriceOfProductsHistory._meta.get_field('price')
+    records = {}  # url -> product; a URL seen twice in one batch keeps its last scrape
+    prices = {}
+    for item in items:
+        name = truncate(ScrapedProduct, 'name', item.name)
+        image_url = usable_image_url(ScrapedProduct, item.image_url)
+        product = ScrapedProduct(
+            url=item.url,
+            name=name,
+            description=item.description,
+            image_url=image_url,
+            store=platform,
+            reviews=item.reviews,
+            rating=parse_rating(item.rating),
+            content_hash=ScrapedProduct.compute_content_hash(name, item.description, image_url, item.reviews),
+        )
+        price = parse_price(platform, item.price)
+        extra = [(price_field, price)] if price is not None else []
+        if not fits_columns(product, ['url', 'store', 'rating'], extra):
+            continue
+        records[item.url] = product
+        prices[item.url] = price
+    if not records:
+        return IngestResult(platform, 0, 0, time.perf_counter() - started)
+
+    existing = {
+        url: (pk, content_hash, rating)
+        for url, pk, content_hash, rating in ScrapedProduct.objects.filter(url__in=list(records))
+        .values_list('url', 'pk', 'content_hash', 'rating')
+    }
+    changed, rating_only = [], []
+    for url, product in records.items():
+        if url not in existing or existing[url][1] != product.content_hash:
+            changed.append(product)
+            continue
+        product.pk = existing[url][0]
+        if product.rating is not None and product.rating != existing[url][2]:
+            rating_only.append(product)
+
+    with transaction.atomic():
+        if changed:
+            # Primary keys come back on PostgreSQL/SQLite, which the latest-price update below needs
+            ScrapedProduct.objects.bulk_create(
+                changed, update_conflicts=True, unique_fields=['url'], update_fields=CONTENT_FIELDS,
+            )
+        if rating_only:
+            ScrapedProduct.objects.bulk_update(rating_only, ['rating'])
+
+        priced = [product for url, product in records.items() if prices[url] is not None]
+        PriceOfProductsHistory.objects.bulk_create([
+            PriceOfProductsHistory(url_id=product.url, price=prices[product.url], timestamp=now)
+            for product in priced
+        ])
+        for product in priced:
+            product.latest_price = prices[product.url]
+            product.latest_price_at = now
+        ScrapedProduct.objects.bulk_update(priced, ['latest_price', 'latest_price_at'])
+
+    result = IngestResult(platform, len(changed) + len(rating_only), len(priced), time.perf_counter() - started,
+                          changed=len(changed))
+    logger.info(f"Ingested {result}")
+    run_post_batch_hooks(platform, changed)
+    return result
+
+
+# -------------------- TRACKED AMAZON/FLIPKART PRODUCTS --------------------
+TRACKED_MODELS = {
+    'amazon': (AmazonProduct, 'asin', re.compile(r'/dp/([A-Z0-9]{10})')),
+    'flipkart': (FlipkartProduct, 'flipkart_id', re.compile(r'pid=([a-zA-Z0-9]+)', re.IGNORECASE)),
+}
+
+
+def ingest_tracked_prices(platform, items):
+    """Upsert scraped Amazon/Flipkart items into the tracked-product tables plus one PriceHistory insert.
+
+    Items that can't fit their columns (over-long URLs, prices beyond
+    max_digits) are skipped instead of aborting the batch.
+    """
+    started = time.perf_counter()
+    platform = platform.lower()
+    model, id_field, id_pattern = TRACKED_MODELS[platform]
+
+    products = {}
+    for item in items:
+        match = id_pattern.search(item.url)
+        if not match:
+            logger.warning(f"No product ID found in URL: {item.url}")
+            continue
+        price = parse_price(platform, item.price)
+        if price is None:
+            logger.warning(f"No price found for {item.url}")
+            continue
+        product = model(**{
+            id_field: match.group(1),
+            'name': truncate(model, 'name', item.name or 'Unknown Product'),
+            'url': item.url,
+            'image_url': usable_image_url(model, item.image_url),
+            'current_price': price,
+        })
+        if fits_columns(product, ['url', 'current_price', id_field]):
+            products[match.group(1)] = product
+    if not products:
+        return IngestResult(platform, 0, 0, time.perf_counter() - started)
+
+    content_type = ContentType.objects.get_for_model(model)
+    with transaction.atomic():
+        written = model.objects.bulk_create(
+            list(products.values()), update_conflicts=True, unique_fields=[id_field],
+            update_fields=['name', 'image_url', 'current_price', 'last_updated'],
+        )
+        PriceHistory.objects.bulk_create([
+            PriceHistory(content_type=content_type, object_id=product.pk, price=product.current_price)
+            for product in written
+        ])
+
+    result = IngestResult(platform, len(written), len(written), time.perf_counter() - started, changed=len(written))
+    logger.info(f"Ingested {result}")
+    return result
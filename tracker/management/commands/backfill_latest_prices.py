@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from tracker.models import ScrapedProduct, PriceOfProductsHistory
+
+
+class Command(BaseCommand):
+    help = "Populate ScrapedProduct.latest_price/latest_price_at from each product's newest price history row"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only-missing', action='store_true',
+                            help="Skip products that already have a latest price")
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Products updated per UPDATE statement")
+
+    def handle(self, *args, **options):
+        newest = PriceOfProductsHistory.objects.filter(url=OuterRef('url')).order_by('-timestamp')
+        products = ScrapedProduct.objects.order_by('pk')
+        if options['only_missing']:
+            products = products.filter(latest_price_at__isnull=True)
+
+        pks = list(products.values_list('pk', flat=True))
+        batch_size = max(1, options['batch_size'])
+        updated = 0
+        for start in range(0, len(pks), batch_size):
+            updated += ScrapedProduct.objects.filter(pk__in=pks[start:start + batch_size]).update(
+                latest_price=Subquery(newest.values('price')[:1]),
+                latest_price_at=Subquery(newest.values('timestamp')[:1]),
+            )
+            self.stdout.write(f"Backfilled {updated}/{len(pks)} products")
+
+        self.stdout.write(self.style.SUCCESS(f"Latest prices backfilled for {updated} products"))
@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand
+from selectorlib import Extractor
+from tracker.scrapers.amazon import AMAZON_SELECTORS, get_amazon_extractor
+from tracker.scrapers.flipkart import FLIPKART_SELECTORS, get_flipkart_extractor
+import statistics
+import time
+
+PLATFORMS = {
+    'amazon': (AMAZON_SELECTORS, get_amazon_extractor),
+    'flipkart': (FLIPKART_SELECTORS, get_flipkart_extractor),
+}
+
+SYNTHETIC_PRODUCT = {
+    'amazon': """
+        <span id="productTitle"> Apple iPhone 15 (128 GB) - Black </span>
+        <span class="a-price"><span class="a-offscreen">₹69,900.00</span></span>
+        <span class="a-icon-alt">4.5 out of 5 stars</span>
+        <span id="acrCustomerReviewText">12,345 ratings</span>
+        <div id="availability"><span> In stock </span></div>
+        <img id="landingImage" src="https://m.media-amazon.com/images/I/71d7rfSl0wL._SX679_.jpg">
+        <div id="feature-bullets"><ul>{bullets}</ul></div>
+        {reviews}
+    """,
+    'flipkart': """
+        <span class="VU-ZEz">Apple iPhone 15 (Black, 128 GB)</span>
+        <div class="UOCQB1">₹69,900</div>
+        <span class="Y1HWO0">4.6</span>
+        <span class="Wphh3N">1,23,456 Ratings &amp; 6,789 Reviews</span>
+        <div class="_16FRp0">In stock</div>
+        <img class="DByuf4 IZexXJ jLEJ7H" src="https://rukminim2.flixcart.com/image/416/416/iphone.jpeg">
+        <div class="_1mXcCf">{bullets}</div>
+        {reviews}
+    """,
+}
+
+
+def build_synthetic_page(platform, filler_blocks):
+    """A product page padded with navigation/markup noise to a realistic size."""
+    filler = "".join(
+        f'<div class="nav-item-{i}"><a href="/category/{i}">Category {i}</a>'
+        f'<span class="badge">Deal {i}</span><p>{"Lorem ipsum dolor sit amet. " * 4}</p></div>'
+        for i in range(filler_blocks)
+    )
+    product = SYNTHETIC_PRODUCT[platform].format(
+        bullets="".join(f"<li>Feature bullet {i}</li>" for i in range(8)),
+        reviews="".join(
+            f'<div class="review-text-content"><span>Review {i}: great phone.</span></div>'
+            f'<div class="_8-rIO3">Review {i}: great phone.</div>'
+            for i in range(20)
+        ),
+    )
+    return f"<html><head><title>Product</title></head><body>{filler[:len(filler) // 3]}{product}{filler[len(filler) // 3:]}</body></html>"
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark Amazon/Flipkart parsing: selectorlib rebuilt per call vs the compiled lxml extractors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platform', choices=sorted(PLATFORMS), action='append',
+                            help="Platform(s) to benchmark (default: all)")
+        parser.add_argument('--html', type=str, help="Benchmark a saved page instead of the synthetic one")
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--filler', type=int, default=3000,
+                            help="Filler blocks in the synthetic page (~250 bytes each)")
+
+    def handle(self, *args, **options):
+        for platform in options['platform'] or sorted(PLATFORMS):
+            yaml_string, get_compiled = PLATFORMS[platform]
+            if options['html']:
+                with open(options['html'], encoding='utf-8') as f:
+                    page = f.read()
+            else:
+                page = build_synthetic_page(platform, options['filler'])
+
+            def before():
+                return Extractor.from_yaml_string(yaml_string).extract(page)
+
+            def after():
+                return get_compiled().extract(page)
+
+            if before() != after():
+                self.stdout.write(self.style.WARNING(f"{platform}: compiled output differs from selectorlib"))
+
+            before_ms = self.time_it(before, options['iterations'])
+            after_ms = self.time_it(after, options['iterations'])
+            self.stdout.write(f"{platform}: {len(page) / 1024:.0f} KB page, {options['iterations']} iterations")
+            self.stdout.write(f"  selectorlib (rebuilt per call): median {statistics.median(before_ms):.2f} ms/page")
+            self.stdout.write(f"  compiled lxml extractor:        median {statistics.median(after_ms):.2f} ms/page")
+            self.stdout.write(self.style.SUCCESS(
+                f"  speedup: {statistics.median(before_ms) / statistics.median(after_ms):.2f}x"
+            ))
+
+    @staticmethod
+    def time_it(func, iterations):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
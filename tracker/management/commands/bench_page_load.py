@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand
+from selenium.webdriver.support.ui import WebDriverWait
+from tracker.scrapers.driver_pool import blocked_url_patterns, create_driver
+import statistics
+import time
+
+DEFAULT_URLS = {
+    'croma': 'https://www.croma.com/searchB?q=iphone%3Arelevance&text=iphone',
+    'reliance': 'https://www.reliancedigital.in/products?q=iphone',
+    'brand': 'https://www.boat-lifestyle.com/products/rockerz-450-bluetooth-headphone',
+    'bing': 'https://www.bing.com/search?q=boat+rockerz+450+official+store',
+}
+
+# Bytes and request count as seen by the page. Cross-origin responses without
+# Timing-Allow-Origin report a transferSize of 0, so totals are a lower bound.
+TRANSFER_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return {
+    bytes: (nav ? nav.transferSize : 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    requests: resources.length + 1,
+};
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare Selenium page-load time and bytes transferred with and without resource blocking"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platform', choices=sorted(DEFAULT_URLS), action='append',
+                            help="Platform(s) to load (default: all)")
+        parser.add_argument('--url', type=str, help="Load this URL instead (use with a single --platform)")
+        parser.add_argument('--runs', type=int, default=3, help="Page loads per mode")
+
+    def handle(self, *args, **options):
+        for platform in options['platform'] or sorted(DEFAULT_URLS):
+            url = options['url'] or DEFAULT_URLS[platform]
+            self.stdout.write(f"{platform}: {url}")
+            baseline = self.measure(url, None, options['runs'])
+            blocked = self.measure(url, blocked_url_patterns(platform), options['runs'])
+            for label, result in (('no blocking', baseline), ('blocking', blocked)):
+                self.stdout.write(
+                    f"  {label:<12} ready {result['ready_ms']:>7.0f} ms   complete {result['complete_ms']:>7.0f} ms   "
+                    f"{result['kb']:>7.0f} KB   {result['requests']:>4} requests"
+                )
+            if baseline['kb'] and baseline['ready_ms']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"  saved {1 - blocked['kb'] / baseline['kb']:.0%} of bytes, "
+                    f"{1 - blocked['ready_ms'] / baseline['ready_ms']:.0%} of time to page_source"
+                ))
+
+    def measure(self, url, patterns, runs):
+        """Median timings/bytes over ``runs`` cold-cache loads on a dedicated browser."""
+        driver = create_driver()
+        samples = []
+        try:
+            if patterns is not None:
+                driver.block_resources(patterns)
+            for _ in range(runs):
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                start = time.perf_counter()
+                driver.get(url)
+                ready_ms = (time.perf_counter() - start) * 1000  # when the scrapers read page_source
+                try:
+                    WebDriverWait(driver, 30).until(
+                        lambda d: d.execute_script("return document.readyState") == "complete"
+                    )
+                except Exception:
+                    pass
+                complete_ms = (time.perf_counter() - start) * 1000
+                transfer = driver.execute_script(TRANSFER_JS)
+                samples.append((ready_ms, complete_ms, transfer['bytes'] / 1024, transfer['requests']))
+        finally:
+            driver.quit()
+        return {
+            'ready_ms': statistics.median(s[0] for s in samples),
+            'complete_ms': statistics.median(s[1] for s in samples),
+            'kb': statistics.median(s[2] for s in samples),
+            'requests': int(statistics.median(s[3] for s in samples)),
+        }
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+from tracker.benchmarks.runner import (
+    BENCHMARKS, FIXTURES_DIR, compare_to_baseline, load_baseline, run_benchmarks, save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark every store's page parsing offline against the saved HTML fixtures"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platform', choices=sorted(BENCHMARKS), action='append',
+                            help="Platform(s) to benchmark (default: all)")
+        parser.add_argument('--case', action='append',
+                            help="Only run these extraction functions, e.g. smart_extract_price")
+        parser.add_argument('--iterations', type=int, default=20,
+                            help="Passes over each platform's fixtures")
+        parser.add_argument('--baseline', type=str, help="Compare against a baseline JSON file")
+        parser.add_argument('--save-baseline', type=str, help="Write this run's numbers as a baseline JSON file")
+        parser.add_argument('--threshold', type=float, default=0.10,
+                            help="Relative p50 slowdown reported as a regression (default 0.10)")
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help="Exit with an error if any case regressed past the threshold")
+
+    def handle(self, *args, **options):
+        baseline = load_baseline(options['baseline']) if options['baseline'] else None
+
+        self.stdout.write(f"Fixtures: {FIXTURES_DIR}")
+        results = run_benchmarks(options['platform'], options['case'], options['iterations'])
+        if not results:
+            raise CommandError("No benchmark cases matched the given platform/case filters")
+
+        regressions = []
+        self.stdout.write(f"{'case':<36}{'pages/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{result.key:<36}{result.pages_per_sec:>10.1f}{result.p50_ms:>10.2f}"
+                f"{result.p99_ms:>10.2f}{result.peak_kb:>10.0f}"
+            )
+            if baseline is None:
+                continue
+            delta = compare_to_baseline(result, baseline)
+            if delta is None:
+                self.stdout.write(f"  (no baseline for {result.key})")
+                continue
+            line = (f"  vs baseline: p50 {delta['p50']:+.1%}, pages/s {delta['pages_per_sec']:+.1%}, "
+                    f"peak {delta['peak_kb']:+.1%}")
+            if delta['p50'] > options['threshold']:
+                regressions.append(result.key)
+                self.stdout.write(self.style.ERROR(line))
+            elif delta['p50'] < -options['threshold']:
+                self.stdout.write(self.style.SUCCESS(line))
+            else:
+                self.stdout.write(line)
+
+        if options['save_baseline']:
+            save_baseline(results, options['save_baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['save_baseline']}"))
+
+        if regressions:
+            message = f"{len(regressions)} case(s) slower than baseline: {', '.join(regressions)}"
+            if options['fail_on_regression']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,100 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from tracker.benchmarks.runner import percentile
+from tracker.models import ScrapedProduct
+from tracker.search import search_products, search_queryset
+
+BENCH_STORE = 'benchmark'
+BENCH_URL = 'https://benchmark.invalid/p/{}'
+
+BRANDS = ['Samsung', 'Apple', 'OnePlus', 'Xiaomi', 'Sony', 'boAt', 'LG', 'Lenovo', 'HP', 'Dell', 'Realme', 'Noise']
+LINES = ['Galaxy', 'iPhone', 'Nord', 'Redmi', 'Bravia', 'Rockerz', 'IdeaPad', 'Pavilion', 'Inspiron', 'Narzo', 'ColorFit']
+MODELS = ['S23', 'S24 Ultra', '15 Pro', '14', 'CE 3', 'Note 13', '450', 'Slim 3', '5 Pro', 'Pro 2', 'X1']
+KINDS = ['Smartphone', 'Bluetooth Headphone', 'Smart TV', 'Laptop', 'Smartwatch', 'Earbuds', 'Tablet']
+COLOURS = ['Black', 'Blue', 'Silver', 'Phantom Green', 'Midnight', 'Cream']
+STORAGE = ['64GB', '128GB', '256GB', '512GB', '8GB RAM', '16GB RAM']
+
+# Exact, reordered, misspelled and a miss
+DEFAULT_QUERIES = ['samsung galaxy s23', 'galaxy s23 samsung', 'samsng galxy s23', 'rockerz 450', 'quantum toaster']
+
+
+class Command(BaseCommand):
+    help = "Compare name__icontains against the search index over a large synthetic product table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help="Synthetic products to search over")
+        parser.add_argument('--query', action='append', help="Query to time (repeatable)")
+        parser.add_argument('--runs', type=int, default=20, help="Timed runs per query and method")
+        parser.add_argument('--keep', action='store_true',
+                            help="Leave the synthetic rows in place for the next run")
+        parser.add_argument('--explain', action='store_true', help="Print the query plans")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("The search index benchmark needs PostgreSQL")
+
+        self.populate(options['rows'])
+        try:
+            methods = {
+                'icontains': lambda q: list(
+                    ScrapedProduct.objects.filter(name__icontains=q, store=BENCH_STORE).order_by('-scraped_at')[:5]
+                ),
+                'search_index': lambda q: search_products(q, BENCH_STORE),
+            }
+            self.stdout.write(f"{'query':<24}{'method':<14}{'hits':>6}{'p50 ms':>10}{'p99 ms':>10}")
+            for query in options['query'] or DEFAULT_QUERIES:
+                for name, method in methods.items():
+                    hits = len(method(query))  # warm-up
+                    timings_ms = []
+                    for _ in range(options['runs']):
+                        start = time.perf_counter()
+                        method(query)
+                        timings_ms.append((time.perf_counter() - start) * 1000)
+                    timings_ms.sort()
+                    self.stdout.write(
+                        f"{query:<24}{name:<14}{hits:>6}{percentile(timings_ms, 50):>10.2f}"
+                        f"{percentile(timings_ms, 99):>10.2f}"
+                    )
+                if options['explain']:
+                    self.explain(query)
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def populate(self, rows):
+        existing = ScrapedProduct.objects.filter(store=BENCH_STORE).count()
+        if existing >= rows:
+            self.stdout.write(f"Reusing {existing} synthetic products")
+            return
+
+        rng = random.Random(42)
+        batch_size = 10000
+        self.stdout.write(f"Inserting {rows - existing} synthetic products...")
+        for start in range(existing, rows, batch_size):
+            ScrapedProduct.objects.bulk_create([
+                ScrapedProduct(
+                    name=(f"{rng.choice(BRANDS)} {rng.choice(LINES)} {rng.choice(MODELS)} {rng.choice(KINDS)} "
+                          f"({rng.choice(COLOURS)}, {rng.choice(STORAGE)})"),
+                    url=BENCH_URL.format(i),
+                    description=f"{rng.choice(KINDS)} with {rng.choice(STORAGE)} in {rng.choice(COLOURS)}",
+                    store=BENCH_STORE,
+                )
+                for i in range(start, min(start + batch_size, rows))
+            ], ignore_conflicts=True)
+            self.stdout.write(f"  {min(start + batch_size, rows)}/{rows}")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE "{ScrapedProduct._meta.db_table}"')
+
+    def explain(self, query):
+        before = ScrapedProduct.objects.filter(name__icontains=query, store=BENCH_STORE).order_by('-scraped_at')[:5]
+        self.stdout.write(f"\nicontains plan for {query!r}:\n{before.explain()}")
+        self.stdout.write(f"search_index plan for {query!r}:\n{search_queryset(query, BENCH_STORE).explain()}\n")
+
+    def cleanup(self):
+        self.stdout.write("Removing synthetic products...")
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{ScrapedProduct._meta.db_table}" WHERE store = %s', [BENCH_STORE])
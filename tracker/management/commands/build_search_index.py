@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from tracker.models import ScrapedProduct
+from tracker.search import search_vector_expression
+
+SEARCH_INDEXES = ['tracker_scr_search_gin', 'tracker_scr_name_trgm']
+
+
+class Command(BaseCommand):
+    help = "Build or refresh the product search vectors and their GIN indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Only fill products whose search vector is empty")
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help="Products updated per UPDATE statement")
+        parser.add_argument('--reindex', action='store_true',
+                            help="Rebuild the GIN indexes afterwards (e.g. after a large backfill)")
+
+    def handle(self, *args, **options):
+        products = ScrapedProduct.objects.order_by('pk')
+        if options['missing_only']:
+            products = products.filter(search_vector__isnull=True)
+
+        pks = list(products.values_list('pk', flat=True))
+        batch_size = max(1, options['batch_size'])
+        updated = 0
+        for start in range(0, len(pks), batch_size):
+            updated += ScrapedProduct.objects.filter(pk__in=pks[start:start + batch_size]).update(
+                search_vector=search_vector_expression()
+            )
+            self.stdout.write(f"Indexed {updated}/{len(pks)} products")
+
+        with connection.cursor() as cursor:
+            if options['reindex']:
+                for index in SEARCH_INDEXES:
+                    self.stdout.write(f"Rebuilding {index}...")
+                    cursor.execute(f'REINDEX INDEX "{index}"')
+            # Fresh statistics so the planner picks the GIN indexes over a sequential scan
+            cursor.execute(f'ANALYZE "{ScrapedProduct._meta.db_table}"')
+
+        self.stdout.write(self.style.SUCCESS(f"Search index built for {updated} products"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from tracker.models import TrackedProduct
+from tracker.scrapers.query_utils import canonicalize_query, clear_synonym_cache
+
+
+class Command(BaseCommand):
+    help = "Recompute TrackedProduct.canonical_name after the canonicalizer rules or query synonyms change"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Products written per UPDATE batch")
+
+    def handle(self, *args, **options):
+        clear_synonym_cache()  # Key with the synonym table as it is now
+        batch_size = max(1, options['batch_size'])
+        changed = []
+        checked = 0
+        for tracked in TrackedProduct.objects.order_by('pk').only('pk', 'name', 'canonical_name').iterator(batch_size):
+            checked += 1
+            canonical_name = canonicalize_query(tracked.name)[:200]
+            if canonical_name != tracked.canonical_name:
+                tracked.canonical_name = canonical_name
+                changed.append(tracked)
+        TrackedProduct.objects.bulk_update(changed, ['canonical_name'], batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Re-keyed {len(changed)} of {checked} tracked products"))
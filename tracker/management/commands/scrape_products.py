@@ -1,10 +1,6 @@
 from django.core.management.base import BaseCommand
 import json
-from tracker.scrapers.amazon import scrape_amazon_products
-from tracker.scrapers.flipkart import scrape_flipkart_products
-from tracker.scrapers.reliance import scrape_reliance_product_page
-from tracker.scrapers.brand import get_brand_product_details
-from tracker.scrapers.croma import scrape_croma_product_page  # 👈 Import Croma scraper
+from tracker.scrapers.api import UnknownPlatform, scrape_platform
 
 class Command(BaseCommand):
     help = "Scrape Amazon, Flipkart, Reliance, Croma or Brand for up to 5 product results"
@@ -17,35 +13,26 @@ class Command(BaseCommand):
         platform = kwargs["platform"].lower()
         product_name = kwargs["product_name"].strip()
 
-        if platform == "amazon":
-            details = scrape_amazon_products(product_name)
-        elif platform == "flipkart":
-            details = scrape_flipkart_products(product_name)
-        elif platform == "reliance":
-            details = scrape_reliance_product_page(product_name)
-        elif platform == "croma":
-            details = scrape_croma_product_page(product_name)  # 👈 Add Croma logic
-        elif platform == "brand":
-            details = get_brand_product_details(product_name)
-        else:
+        try:
+            items = scrape_platform(platform, product_name)
+        except UnknownPlatform:
             self.stdout.write(self.style.ERROR("❌ Invalid platform. Use 'Amazon', 'Flipkart', 'Reliance', 'Croma', or 'Brand'."))
             return
 
-        output = []
-
-        if isinstance(details, list) and all(isinstance(item, tuple) and len(item) == 2 for item in details):
-            for item_details, url in details:
-                output.append({
-                    "platform": platform,
-                    "product_name": product_name,
-                    "details": item_details,
-                    "url": url,
-                })
-        else:
+        output = [
+            {
+                "platform": platform,
+                "product_name": product_name,
+                "details": item.details(),
+                "url": item.url,
+            }
+            for item in items
+        ]
+        if not output:
             output.append({
                 "platform": platform,
                 "product_name": product_name,
-                "error": "Invalid data format returned from scraper.",
+                "error": "No products returned from scraper.",
             })
 
-        self.stdout.write(json.dumps(output, indent=2))
\ No newline at end of file
+        self.stdout.write(json.dumps(output, indent=2))
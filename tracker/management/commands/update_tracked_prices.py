@@ -1,10 +1,14 @@
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
-from tracker.models import TrackedProduct, SavedProduct, PriceAlert
+from django.contrib.contenttypes.models import ContentType
+from tracker.models import TrackedProduct, SavedProduct, PriceAlert, AmazonProduct, FlipkartProduct, PriceHistory, ScrapedProduct
 from django.utils import timezone
 from datetime import timedelta
 import logging
 from tracker.scrapers.email_sender import EmailSender
+from tracker.ingest import parse_price
+from tracker.scrapers.price_refresh import refresh_prices
+from tracker.scrapers.query_utils import canonicalize_query
 
 logger = logging.getLogger(__name__)
 email_sender = EmailSender()
@@ -18,6 +22,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Force update all products regardless of last update time',
         )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Re-run the full search and scrape instead of the price-only refresh',
+        )
 
     def handle(self, *args, **options):
         force_update = options['force']
@@ -31,30 +40,51 @@ class Command(BaseCommand):
             )
 
         total_products = tracked_products.count()
-        self.stdout.write(f"Updating prices for {total_products} tracked products...")
-
+        # Users tracking "iPhone 15 128GB" and "apple iphone 15 (128 GB)" share one refresh
+        groups = {}
         for tracked_product in tracked_products:
+            key = tracked_product.canonical_name or canonicalize_query(tracked_product.name)
+            groups.setdefault(key, []).append(tracked_product)
+        self.stdout.write(f"Updating prices for {total_products} tracked products ({len(groups)} distinct)...")
+
+        for members in groups.values():
+            tracked_product = members[0]
+            names = {member.name for member in members}
             try:
                 self.stdout.write(f"Updating prices for: {tracked_product.name}")                # Update prices
-                call_command('scrape_and_store_prices', tracked_product.name)
-                tracked_product.last_updated = timezone.now()
-                tracked_product.save()
+                # Known product pages only need their price re-read; search and
+                # scrape from scratch when there are none or none could be refreshed
+                if options['full'] or not self.refresh_known_products(tracked_product):
+                    call_command('scrape_and_store_prices', tracked_product.name)
+                TrackedProduct.objects.filter(pk__in=[member.pk for member in members]).update(
+                    last_updated=timezone.now()
+                )
                 self.stdout.write(self.style.SUCCESS(f"Successfully updated prices for: {tracked_product.name}"))
 
                 # Check price alerts after updating prices
                 try:
-                    # Get all active alerts for this product
-                    alerts = PriceAlert.objects.filter(
-                        product_name=tracked_product.name,
+                    # Get all active alerts for this product, under any of its spellings
+                    alerts = list(PriceAlert.objects.filter(
+                        product_name__in=names,
                         is_active=True
-                    )
+                    ).select_related('user'))
+                    # Latest scraped prices for every alerted URL in one query
+                    latest_prices = dict(ScrapedProduct.objects.filter(
+                        url__in=[alert.product_url for alert in alerts],
+                        latest_price__isnull=False
+                    ).values_list('url', 'latest_price'))
 
                     # Check each alert
                     for alert in alerts:
                         try:
-                            # Get current price from saved product
-                            saved_product = SavedProduct.objects.get(product_url=alert.product_url)
-                            current_price = saved_product.price
+                            current_price = latest_prices.get(alert.product_url)
+                            if current_price is None:
+                                # Not scraped yet: fall back to the price it was saved at
+                                current_price = SavedProduct.objects.filter(
+                                    user=alert.user, product_url=alert.product_url
+                                ).values_list('price', flat=True).first()
+                                if current_price is None:
+                                    continue
 
                             # Update current price in alert
                             alert.current_price = current_price
@@ -72,8 +102,6 @@ class Command(BaseCommand):
                                     f"Price alert triggered for {alert.product_name} - "
                                     f"Current: ₹{current_price}, Target: ₹{alert.target_price}"
                                 ))
-                        except SavedProduct.DoesNotExist:
-                            continue
                         except Exception as alert_error:
                             logger.error(f"Error processing alert for {alert.product_name}: {str(alert_error)}")
                 except Exception as e:
@@ -82,4 +110,31 @@ class Command(BaseCommand):
                 logger.error(f"Error updating prices for {tracked_product.name}: {str(e)}")
                 self.stdout.write(self.style.ERROR(f"Failed to update prices for: {tracked_product.name}"))
 
-        self.stdout.write(self.style.SUCCESS(f"Completed price updates for {total_products} products")) 
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS(f"Completed price updates for {total_products} products")) 
+
+    def refresh_known_products(self, tracked_product):
+        """Price-only refresh of the stored products for a tracked name; False if nothing was refreshed."""
+        products = list(AmazonProduct.objects.filter(name__icontains=tracked_product.name))
+        products += list(FlipkartProduct.objects.filter(name__icontains=tracked_product.name))
+        if not products:
+            return False
+
+        results = refresh_prices([product.url for product in products])
+        refreshed = 0
+        for product in products:
+            fields = results.get(product.url)
+            price = parse_price(product.platform, fields['price']) if fields else None
+            if price is None:
+                continue
+            product.current_price = price
+            product.save(update_fields=['current_price', 'last_updated'])
+            PriceHistory.objects.create(
+                content_type=ContentType.objects.get_for_model(product),
+                object_id=product.id,
+                price=price
+            )
+            refreshed += 1
+            self.stdout.write(f"  ₹{price} ({fields['availability']}) for {product.name}")
+
+        self.stdout.write(f"Price-only refresh updated {refreshed}/{len(products)} known products")
+        return refreshed > 0
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_scrapedproduct_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedproduct',
+            name='latest_price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='scrapedproduct',
+            name='latest_price_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Keeps search_vector in step with name/description on every write, including
+# queryset update() and bulk inserts that bypass Model.save().
+CREATE_TRIGGER = """
+CREATE FUNCTION tracker_scrapedproduct_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tracker_scrapedproduct_search_vector_update
+    BEFORE INSERT OR UPDATE OF name, description ON tracker_scrapedproduct
+    FOR EACH ROW EXECUTE FUNCTION tracker_scrapedproduct_search_vector();
+
+UPDATE tracker_scrapedproduct SET search_vector =
+    setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(description, '')), 'B');
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS tracker_scrapedproduct_search_vector_update ON tracker_scrapedproduct;
+DROP FUNCTION IF EXISTS tracker_scrapedproduct_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_scrapedproduct_latest_price'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='scrapedproduct',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='scrapedproduct',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tracker_scr_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='scrapedproduct',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='tracker_scr_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,80 @@
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+# Frozen copy of tracker.scrapers.query_utils as of this migration, so later rule
+# changes don't alter what it writes. The synonym table is created empty here, so
+# no synonyms apply; run recanonicalize_tracked_products after changing the rules.
+UNIT_ALIASES = {
+    'gb': 'gb', 'gigabyte': 'gb', 'gigabytes': 'gb',
+    'tb': 'tb', 'terabyte': 'tb', 'terabytes': 'tb',
+    'mb': 'mb', 'mah': 'mah',
+    'in': 'in', 'inch': 'in', 'inches': 'in', '"': 'in',
+    'hz': 'hz', 'w': 'w', 'watt': 'w', 'watts': 'w',
+    'mp': 'mp', 'megapixel': 'mp', 'megapixels': 'mp',
+}
+UNIT_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(' + '|'.join(sorted((re.escape(u) for u in UNIT_ALIASES), key=len, reverse=True)) + r')(?![a-z])'
+)
+PUNCTUATION_RE = re.compile(r'[^\w.+]+|(?<!\d)\.|\.(?!\d)')
+BRAND_PHRASES = {'one plus': 'oneplus', 'hewlett packard': 'hp', 'bo at': 'boat'}
+BRAND_ALIASES = {'mi': 'xiaomi', 'one+': 'oneplus', '1+': 'oneplus'}
+PRODUCT_LINE_BRANDS = {
+    'iphone': 'apple', 'ipad': 'apple', 'macbook': 'apple', 'airpods': 'apple', 'imac': 'apple',
+    'galaxy': 'samsung', 'pixel': 'google', 'redmi': 'xiaomi', 'nord': 'oneplus',
+    'rockerz': 'boat', 'airdopes': 'boat', 'bravia': 'sony', 'ideapad': 'lenovo',
+    'thinkpad': 'lenovo', 'pavilion': 'hp', 'inspiron': 'dell', 'narzo': 'realme',
+}
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'for', 'with', 'of', 'buy', 'online', 'price', 'prices',
+    'best', 'cheap', 'new', 'latest', 'deal', 'deals', 'offer', 'offers', 'india',
+}
+
+
+def canonicalize_query(query):
+    text = unicodedata.normalize('NFKC', query or '').casefold()
+    text = UNIT_RE.sub(lambda m: m.group(1) + UNIT_ALIASES[m.group(2)], text)
+    text = ' '.join(PUNCTUATION_RE.sub(' ', text).split())
+    for phrase, brand in BRAND_PHRASES.items():
+        text = re.sub(r'(?<!\S)' + re.escape(phrase) + r'(?!\S)', brand, text)
+
+    tokens = [BRAND_ALIASES.get(token, token) for token in text.split()]
+    tokens = [token for token in tokens if token not in STOPWORDS]
+    implied = {PRODUCT_LINE_BRANDS[token] for token in tokens if token in PRODUCT_LINE_BRANDS}
+    tokens = {token for token in tokens if token not in implied}
+    if not tokens:
+        tokens = set(text.split())
+    return " ".join(sorted(tokens))
+
+
+def fill_canonical_names(apps, schema_editor):
+    TrackedProduct = apps.get_model('tracker', 'TrackedProduct')
+    for tracked in TrackedProduct.objects.all():
+        tracked.canonical_name = canonicalize_query(tracked.name)[:200]
+        tracked.save(update_fields=['canonical_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_scrapedproduct_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuerySynonym',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phrase', models.CharField(max_length=200, unique=True)),
+                ('canonical', models.CharField(max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='trackedproduct',
+            name='canonical_name',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=200),
+        ),
+        migrations.RunPython(fill_canonical_names, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,12 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django.contrib.auth.models import User
+import hashlib
+import json
 
 class Product(models.Model):
     name = models.CharField(max_length=200)
@@ -40,6 +44,7 @@ class PriceHistory(models.Model):
 
 class TrackedProduct(models.Model):
     name = models.CharField(max_length=200)
+    canonical_name = models.CharField(max_length=200, blank=True, default='', db_index=True)  # canonicalize_query(name)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
@@ -47,6 +52,21 @@ class TrackedProduct(models.Model):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.canonical_name:
+            from tracker.scrapers.query_utils import canonicalize_query
+            self.canonical_name = canonicalize_query(self.name)[:200]
+        super().save(*args, **kwargs)
+
+class QuerySynonym(models.Model):
+    """Phrase rewritten to a canonical phrase before search queries are keyed, e.g. "ip15" -> "iphone 15"."""
+    phrase = models.CharField(max_length=200, unique=True)
+    canonical = models.CharField(max_length=200)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.phrase} -> {self.canonical}"
+
 class ScrapedProduct(models.Model):
     name = models.CharField(max_length=500)
     url = models.URLField(max_length=1000,unique=True)
@@ -56,16 +76,38 @@ class ScrapedProduct(models.Model):
     store = models.CharField(max_length=50)  # amazon, flipkart, croma, etc.
     scraped_at = models.DateTimeField(auto_now_add=True)
     rating = models.DecimalField(max_digits=3, decimal_places=1, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='')  # See compute_content_hash
+    # Denormalized from the newest PriceOfProductsHistory row; tracker.ingest writes both together
+    # (backfill_latest_prices fills in rows recorded before this field existed)
+    latest_price = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
+    latest_price_at = models.DateTimeField(blank=True, null=True)
+    # Weighted name/description tsvector, maintained by a database trigger (see tracker.search)
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
     
     class Meta:
         ordering = ['-scraped_at']
         indexes = [
             models.Index(fields=['store']),
             models.Index(fields=['scraped_at']),
+            GinIndex(fields=['search_vector'], name='tracker_scr_search_gin'),
+            GinIndex(fields=['name'], name='tracker_scr_name_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
         return f"{self.name} - {self.store} - {self.scraped_at}"
+
+    @staticmethod
+    def compute_content_hash(name, description, image_url, reviews):
+        """Fingerprint of the scraped content; an unchanged hash means no UPDATE and no re-analysis."""
+        def normalize(value):
+            if isinstance(value, (list, tuple)):
+                return "\x1e".join(normalize(item) for item in value)
+            if isinstance(value, dict):
+                return json.dumps(value, sort_keys=True, ensure_ascii=False)
+            return " ".join(str(value or "").split())
+
+        payload = "\x1f".join(normalize(part) for part in (name, description, image_url, reviews))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
     
 class PriceOfProductsHistory(models.Model):
     url = models.ForeignKey(ScrapedProduct,on_delete=models.CASCADE,to_field='url',db_column='url')# This specifies we're referencing the 'url' fielddb_column='url')
@@ -94,7 +136,7 @@ class UserProfile(models.Model):
         return f"{self.user.username}'s Profile"
 
 # Signal to create user profile when user is created
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 @receiver(post_save, sender=User)
@@ -109,6 +151,13 @@ def save_user_profile(sender, instance, **kwargs):
     except UserProfile.DoesNotExist:
         UserProfile.objects.create(user=instance)
 
+@receiver([post_save, post_delete], sender=QuerySynonym)
+def reload_query_synonyms(sender, **kwargs):
+    # Other processes pick the change up within QUERY_CANONICALIZER['SYNONYM_TTL'];
+    # existing TrackedProduct keys are re-keyed by recanonicalize_tracked_products
+    from tracker.scrapers.query_utils import clear_synonym_cache
+    clear_synonym_cache()
+
 # Add after ScrapedProduct model
 class ReviewAnalysis(models.Model):
     url = models.ForeignKey(
@@ -132,9 +181,8 @@ class ReviewAnalysis(models.Model):
     def __str__(self):
         return f"Analysis for {self.url.name} at {self.analyzed_at}"
 
-# Add this signal after existing signals
-@receiver(post_save, sender=ScrapedProduct)
-def analyze_product_reviews(sender, instance, created, **kwargs):
+# Run after each ingested batch for products whose content changed (see tracker.ingest)
+def analyze_product_reviews(instance):
     from tracker.scrapers.summary_and_pros_cons import analyze_reviews
     
     MIN_REVIEW_LENGTH = 100  # Minimum characters required for analysis
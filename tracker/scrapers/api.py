@@ -0,0 +1,91 @@
+import logging
+from dataclasses import asdict, dataclass, field
+
+from .amazon import scrape_amazon_products
+from .brand import get_brand_product_details
+from .croma import scrape_croma_product_page
+from .flipkart import scrape_flipkart_products
+from .reliance import scrape_reliance_product_page
+
+logger = logging.getLogger(__name__)
+
+SCRAPERS = {
+    'amazon': scrape_amazon_products,
+    'flipkart': scrape_flipkart_products,
+    'reliance': scrape_reliance_product_page,
+    'croma': scrape_croma_product_page,
+    'brand': get_brand_product_details,
+}
+
+
+class UnknownPlatform(ValueError):
+    pass
+
+
+def _as_list(reviews):
+    if not reviews:
+        return []
+    return [reviews] if isinstance(reviews, str) else list(reviews)
+
+
+@dataclass
+class ScrapedItem:
+    """One product page as returned by a platform scraper."""
+    platform: str
+    url: str
+    name: str = ''
+    price: str = 'N/A'
+    image_url: str = ''
+    rating: str = 'N/A'
+    num_reviews: str = '0'
+    availability: str = 'N/A'
+    description: str = ''
+    reviews: list = field(default_factory=list)
+
+    @classmethod
+    def from_details(cls, platform, details, url):
+        return cls(
+            platform=platform,
+            url=url,
+            name=details.get('name') or '',
+            price=str(details.get('price') or 'N/A'),
+            image_url=details.get('image_url') or '',
+            rating=str(details.get('rating') or 'N/A').strip(),
+            num_reviews=str(details.get('num_reviews') or '0'),
+            availability=details.get('availability') or 'N/A',
+            description=details.get('description') or '',
+            reviews=_as_list(details.get('reviews')),
+        )
+
+    def details(self):
+        """The scrapers' original details dict, as printed by the scrape_products command."""
+        data = asdict(self)
+        del data['platform'], data['url']
+        return data
+
+
+def scrape_platform(platform, query):
+    """Scrape up to five products for ``query`` from one platform, in-process.
+
+    Returns a list of ScrapedItem (empty when the scraper found nothing or returned
+    something unexpected). Raises UnknownPlatform for an unsupported platform.
+    """
+    platform = platform.lower()
+    scraper = SCRAPERS.get(platform)
+    if scraper is None:
+        raise UnknownPlatform(f"Unknown platform {platform!r}; use one of {', '.join(sorted(SCRAPERS))}")
+
+    results = scraper(query.strip())
+    if not isinstance(results, list):
+        logger.warning(f"{platform} scraper returned {type(results).__name__} for {query!r}: {results}")
+        return []
+
+    items = []
+    for result in results:
+        if not (isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], dict)):
+            logger.warning(f"Skipping malformed {platform} result: {result!r}")
+            continue
+        details, url = result
+        if url and details:
+            items.append(ScrapedItem.from_details(platform, details, url))
+    return items
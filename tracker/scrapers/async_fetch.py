@@ -0,0 +1,362 @@
+import asyncio
+import atexit
+import functools
+import itertools
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .http_cache import get_http_cache, is_blocked_page
+from .rate_limit import get_rate_limiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+# User-Agent rotation to avoid detection
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.5735.110 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.5481.177 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.5672.124 Safari/537.36",
+]
+
+MAX_CONNECTIONS = 32      # Total sockets kept by the pooled client
+MAX_PER_HOST = 4          # Concurrent requests allowed against a single store
+KEEPALIVE_TIMEOUT = 30    # Seconds an idle keep-alive socket stays in the pool
+REQUEST_TIMEOUT = 10      # Seconds per attempt
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_PARSE_THREADS = 4  # Threads running streaming parsers, off the engine loop
+
+
+# -------------------- STREAM PARSE THREADS --------------------
+# An lxml parser must stay on the thread that created it, so each stream is
+# pinned to one single-thread executor for its reset, feeds and final result.
+_stream_parse_executors = []
+_stream_parse_lock = threading.Lock()
+_stream_parse_turn = itertools.count()
+
+
+def stream_parse_executor():
+    with _stream_parse_lock:
+        if not _stream_parse_executors:
+            _stream_parse_executors.extend(
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"stream-parse-{i}")
+                for i in range(STREAM_PARSE_THREADS)
+            )
+        return _stream_parse_executors[next(_stream_parse_turn) % STREAM_PARSE_THREADS]
+
+
+def build_headers():
+    return {
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Referer": "https://www.google.com/",
+    }
+
+
+class FetchResponse:
+    """The parts of an HTTP response the scrapers read, detached from the connection."""
+
+    def __init__(self, url, status_code, text, headers=None, truncated=False):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.truncated = truncated  # Streaming fetch hung up before the end of the body
+
+    def __repr__(self):
+        return f"<FetchResponse [{self.status_code}] {self.url}>"
+
+
+class AsyncFetcher:
+    """Pooled keep-alive HTTP client with per-host concurrency caps and non-blocking backoff."""
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, max_per_host=MAX_PER_HOST, timeout=REQUEST_TIMEOUT):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._session = None
+        self._host_semaphores = {}
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _host_semaphore(self, url):
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    async def fetch(self, url, max_retries=5, use_cache=True):
+        """Fetch one URL, queueing on the host's adaptive rate limiter before every attempt.
+
+        503/429 responses and network errors slow the host's limiter down instead
+        of sleeping blindly, so the retry waits for the next slot the store allows.
+        With ``use_cache`` a fresh cached copy is returned without touching the
+        network, and a stale one is revalidated with a conditional request.
+        """
+        cache = get_http_cache() if use_cache else None
+        cached = await asyncio.to_thread(cache.lookup, url) if cache else None
+        if cached:
+            entry, cached_text = cached
+            if cache.is_fresh(entry):
+                cache.record_hit()
+                return FetchResponse(url, 200, cached_text, entry.headers)
+        elif cache:
+            cache.record_miss()
+
+        session = await self._get_session()
+        limiter = get_rate_limiter(url)
+        for attempt in range(max_retries):
+            await limiter.acquire_async()
+            headers = build_headers()
+            if cached and entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if cached and entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            try:
+                async with self._host_semaphore(url):
+                    async with session.get(url, headers=headers) as response:
+                        if response.status in (429, 503):
+                            logger.warning(f"{response.status} from {url} (attempt {attempt + 1}/{max_retries})")
+                            limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                            continue
+                        limiter.on_success()
+                        if response.status == 304 and cached:
+                            await asyncio.to_thread(cache.revalidate, entry, response.headers)
+                            return FetchResponse(url, 200, cached_text, entry.headers)
+                        elif response.status == 200:
+                            text = await response.text(errors="replace")
+                            if is_blocked_page(text):
+                                logger.warning(f"Bot-check page served for {url}")
+                                limiter.on_blocked_page()
+                                # A stale copy beats the block page; it is never cached
+                                return FetchResponse(url, 200, cached_text, entry.headers) if cached else None
+                            if cache:
+                                if cached:
+                                    cache.record_miss()  # stale copy was replaced by a full download
+                                await asyncio.to_thread(cache.store, url, text, response.headers)
+                            return FetchResponse(str(response.url), response.status, text, dict(response.headers))
+                        else:
+                            logger.warning(f"Unexpected status code {response.status} for {url}")
+                            if response.status >= 500:
+                                limiter.on_gave_up()
+                            return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                logger.warning(f"Request error for {url} (attempt {attempt + 1}/{max_retries}): {err!r}")
+                limiter.on_throttle()
+        logger.error(f"Max retries reached for {url}")
+        limiter.on_gave_up()
+        return None
+
+    async def fetch_streaming(self, url, consumer, max_retries=5):
+        """Fetch ``url`` feeding body chunks to ``consumer``; hang up once it is satisfied.
+
+        ``consumer.feed(chunk)`` returns True when it needs no more data, and the
+        connection is then closed without downloading the rest of the body.
+        ``consumer.reset()`` runs before every body so a retried attempt starts
+        clean, and ``consumer.result()`` once the body is done. All three parse,
+        so they run on one stream-parse thread instead of the engine loop shared
+        by every other fetch. Streamed bodies may be partial, so they are never cached.
+        """
+        session = await self._get_session()
+        limiter = get_rate_limiter(url)
+        parse_thread = stream_parse_executor()
+        loop = asyncio.get_running_loop()
+
+        def parse(func, *args):
+            return loop.run_in_executor(parse_thread, func, *args)
+
+        for attempt in range(max_retries):
+            await limiter.acquire_async()
+            try:
+                async with self._host_semaphore(url):
+                    async with session.get(url, headers=build_headers()) as response:
+                        if response.status in (429, 503):
+                            logger.warning(f"{response.status} from {url} (attempt {attempt + 1}/{max_retries})")
+                            limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                            continue
+                        limiter.on_success()
+                        if response.status != 200:
+                            logger.warning(f"Unexpected status code {response.status} for {url}")
+                            if response.status >= 500:
+                                limiter.on_gave_up()
+                            return None
+                        await parse(consumer.reset)
+                        chunks = []
+                        truncated = False
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            chunks.append(chunk)
+                            if await parse(consumer.feed, chunk):
+                                truncated = not response.content.at_eof()
+                                response.close()
+                                break
+                        await parse(consumer.result)
+                        text = b"".join(chunks).decode(response.charset or "utf-8", errors="replace")
+                        if is_blocked_page(text):
+                            logger.warning(f"Bot-check page served for {url}")
+                            limiter.on_blocked_page()
+                            return None
+                        if truncated:
+                            logger.debug(f"Stopped reading {url} after {len(text)} chars")
+                        return FetchResponse(str(response.url), response.status, text, dict(response.headers), truncated)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                logger.warning(f"Request error for {url} (attempt {attempt + 1}/{max_retries}): {err!r}")
+                limiter.on_throttle()
+        logger.error(f"Max retries reached for {url}")
+        limiter.on_gave_up()
+        return None
+
+    async def _run_all(self, jobs, concurrency=None, deadline=None):
+        """Await ``(url, coroutine function)`` jobs concurrently; results are aligned with ``jobs``.
+
+        At most ``concurrency`` jobs run at once. Jobs still in flight when
+        ``deadline`` seconds have passed are cancelled and come back as None,
+        so callers get whatever finished in time.
+        """
+        semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def run_one(job):
+            if semaphore is None:
+                return await job()
+            async with semaphore:
+                return await job()
+
+        tasks = [asyncio.ensure_future(run_one(job)) for _, job in jobs]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        if pending:
+            logger.warning(f"Deadline of {deadline}s hit with {len(pending)}/{len(tasks)} fetches unfinished")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        results = []
+        for (url, _), task in zip(jobs, tasks):
+            if task not in done:
+                results.append(None)
+            elif task.exception() is not None:
+                logger.error(f"Fetch of {url} failed: {task.exception()!r}")
+                results.append(None)
+            else:
+                results.append(task.result())
+        return results
+
+    async def fetch_many(self, urls, max_retries=5, use_cache=True, concurrency=None, deadline=None):
+        """Fetch all URLs concurrently; the result list is aligned with ``urls``."""
+        return await self._run_all(
+            [(url, functools.partial(self.fetch, url, max_retries, use_cache)) for url in urls],
+            concurrency, deadline,
+        )
+
+    async def stream_many(self, jobs, max_retries=5, concurrency=None, deadline=None):
+        """``fetch_streaming`` for each ``(url, consumer)`` pair, concurrently."""
+        return await self._run_all(
+            [(url, functools.partial(self.fetch_streaming, url, consumer, max_retries)) for url, consumer in jobs],
+            concurrency, deadline,
+        )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+# -------------------- PROCESS-WIDE ENGINE --------------------
+# The pooled client lives on a single background event loop so that every
+# thread (the search view's platform workers, management commands) shares the
+# same keep-alive connections.
+_engine_lock = threading.Lock()
+_engine_loop = None
+_engine_fetcher = None
+
+
+def get_engine_loop():
+    global _engine_loop, _engine_fetcher
+    with _engine_lock:
+        if _engine_loop is None or _engine_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="scraper-fetch-loop", daemon=True)
+            thread.start()
+            _engine_loop = loop
+            _engine_fetcher = AsyncFetcher()
+        return _engine_loop
+
+
+def shutdown_engine():
+    """Close pooled connections and stop the engine loop (registered at exit)."""
+    global _engine_loop, _engine_fetcher
+    with _engine_lock:
+        loop, fetcher = _engine_loop, _engine_fetcher
+        _engine_loop = _engine_fetcher = None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(fetcher.close(), loop).result(timeout=5)
+    except Exception as e:
+        logger.debug(f"Error closing fetch engine session: {e!r}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(shutdown_engine)
+
+
+def get_fetcher():
+    get_engine_loop()
+    return _engine_fetcher
+
+
+async def _on_engine(coro):
+    """Await ``coro`` on the engine loop, from whichever loop the caller runs on."""
+    loop = get_engine_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def run_sync(coro):
+    """Block the calling thread until ``coro`` completes on the engine loop."""
+    loop = get_engine_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the fetch engine loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+async def fetch(url, max_retries=5, use_cache=True):
+    return await _on_engine(get_fetcher().fetch(url, max_retries, use_cache))
+
+
+async def fetch_many(urls, max_retries=5, use_cache=True, concurrency=None, deadline=None):
+    """Awaitable batch fetch; returns a FetchResponse or None per URL, in order."""
+    return await _on_engine(get_fetcher().fetch_many(list(urls), max_retries, use_cache, concurrency, deadline))
+
+
+def fetch_many_sync(urls, max_retries=5, use_cache=True, concurrency=None, deadline=None):
+    return run_sync(get_fetcher().fetch_many(list(urls), max_retries, use_cache, concurrency, deadline))
+
+
+async def fetch_streaming(url, consumer, max_retries=5):
+    return await _on_engine(get_fetcher().fetch_streaming(url, consumer, max_retries))
+
+
+def stream_many_sync(jobs, max_retries=5, concurrency=None, deadline=None):
+    return run_sync(get_fetcher().stream_many(list(jobs), max_retries, concurrency, deadline))
@@ -1,31 +1,17 @@
 
 # tracker/scrapers/brand.py
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from urllib.parse import urlparse, quote_plus
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
 import time
-import random
 import re
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.5735.110 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.5481.177 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.5672.124 Safari/537.36",
-]
-
-def init_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
-    return webdriver.Chrome(options=options)
+from .driver_pool import pooled_driver
+from .parse_pool import parse_in_pool
+from .structured_data import HtmlPage
 
 def extract_domain_from_url(url):
     try:
@@ -39,12 +25,12 @@ def search_bing_for_brand_link(product_name):
     query = f"{product_name} official store"
     search_url = f"https://www.bing.com/search?q={quote_plus(query)}"
 
-    driver = init_driver()
-    driver.get(search_url)
-    time.sleep(3)
+    with pooled_driver(platform='bing') as driver:
+        driver.get(search_url)
+        time.sleep(3)
+        page_source = driver.page_source
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    driver.quit()
+    soup = BeautifulSoup(page_source, 'html.parser')
 
     results = soup.select("li.b_algo a[href]")
 
@@ -56,83 +42,108 @@ def search_bing_for_brand_link(product_name):
 
     return None, None
 
-def smart_extract_image(soup):
-    og_image = soup.find("meta", property="og:image")
-    if og_image and og_image.get("content"):
-        return og_image["content"]
-
-    containers = soup.select("main img, article img, div.product img, section img")
-    bad_keywords = ['logo', 'icon', 'sprite', 'placeholder', 'banner', 'facebook', 'twitter', 'pixel', '1x1']
-    for img in containers:
-        src = img.get("src") or img.get("data-src") or img.get("data-lazy-src")
-        if src and not any(bad in src.lower() for bad in bad_keywords):
-            if any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
-                return src
-
-    for img in soup.find_all('img'):
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp']
+BAD_IMAGE_KEYWORDS = ['logo', 'icon', 'sprite', 'placeholder', 'banner', 'facebook', 'twitter', 'pixel', '1x1']
+PRICE_CLASS_KEYWORDS = ['price', 'cost', 'amount', 'value']
+PRICE_TEXT_LIMIT = 60     # Longer texts are page sections, not a price label
+SKIP_TEXT_PARENTS = {'script', 'style', 'noscript', 'template'}
+
+PRICE_RE = re.compile(r'(₹|\$)\s?\d[\d,]*(\.\d{1,2})?')
+
+def is_product_image_src(src):
+    src = src.lower()
+    return not any(bad in src for bad in BAD_IMAGE_KEYWORDS) and any(ext in src for ext in IMAGE_EXTENSIONS)
+
+def in_product_container(tag):
+    for parent in tag.parents:
+        if parent.name in ('main', 'article', 'section'):
+            return True
+        if parent.name == 'div' and 'product' in (parent.get('class') or []):
+            return True
+    return False
+
+def smart_extract_image(page):
+    og_image = page.data.meta_content(property="og:image")
+    if og_image:
+        return og_image
+
+    # One pass over <img>: the first image inside a product container wins,
+    # otherwise the first usable image anywhere on the page.
+    fallback = None
+    for img in page.soup.find_all('img'):
         src = img.get("src") or img.get("data-src") or img.get("data-lazy-src")
-        if src and not any(bad in src.lower() for bad in bad_keywords):
-            if any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
-                return src
+        if not src or not is_product_image_src(src):
+            continue
+        if in_product_container(img):
+            return src
+        if fallback is None:
+            fallback = src
 
-    return "N/A"
+    return fallback or "N/A"
 
 def is_valid_price(text):
-    return bool(re.search(r'(₹|\$)\s?\d[\d,]*(\.\d{1,2})?', text))
+    return bool(PRICE_RE.search(text))
 
 def clean_html_text(text):
     if not text or any(tag in text for tag in ['<', '{', '}', 'function', 'style', '</']):
         return None
     return text.strip()
 
-def smart_extract_price(soup):
-    price_meta = soup.find("meta", {"property": "product:price:amount"}) or soup.find("meta", {"name": "price"})
-    if price_meta and price_meta.get("content"):
-        content = clean_html_text(price_meta["content"])
-        if content and is_valid_price(content):
-            return content
-
-    keywords = ['price', 'cost', 'amount', 'value']
-    for tag in soup.find_all():
-        class_list = tag.get('class', [])
-        if any(k in ' '.join(class_list).lower() for k in keywords):
-            text = clean_html_text(tag.get_text(strip=True))
-            if text and is_valid_price(text):
-                return text
-
-    for tag in soup.find_all():
-        text = clean_html_text(tag.get_text(strip=True))
-        if text and is_valid_price(text):
-            return text
-
-    return "N/A"
-
-def scrape_brand_product_page(brand_url, product_name):
-    driver = init_driver()
-    driver.get(brand_url)
-
-    try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-    except Exception:
-        pass
-
-    time.sleep(3)
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    driver.quit()
+def short_text(tag, limit=PRICE_TEXT_LIMIT):
+    """``tag.get_text(strip=True)``, abandoned as soon as it grows past ``limit``."""
+    parts = []
+    length = 0
+    for text in tag.stripped_strings:
+        parts.append(text)
+        length += len(text)
+        if length > limit:
+            return None
+    return "".join(parts)
+
+def has_price_class(tag):
+    classes = tag.get('class')
+    if not classes:
+        return False
+    class_text = ' '.join(classes).lower()
+    return any(k in class_text for k in PRICE_CLASS_KEYWORDS)
+
+def smart_extract_price(page):
+    content = page.data.meta_content(property="product:price:amount") or page.data.meta_content(name="price")
+    content = clean_html_text(content)
+    if content and is_valid_price(content):
+        return content
+
+    # Single document-order walk. Elements with a price-like class are checked as
+    # soon as they are reached (only their short text is ever joined); bare text
+    # nodes matching the price pattern are remembered as the fallback.
+    fallback = None
+    for node in page.soup.descendants:
+        if isinstance(node, Tag):
+            if has_price_class(node):
+                text = clean_html_text(short_text(node))
+                if text and is_valid_price(text):
+                    return text
+        elif fallback is None and type(node) is NavigableString and node.parent.name not in SKIP_TEXT_PARENTS:
+            text = clean_html_text(node)
+            if text and len(text) <= PRICE_TEXT_LIMIT and is_valid_price(text):
+                fallback = text
+
+    return fallback or "N/A"
+
+def parse_brand_page(page_html, brand_url, product_name):
+    page = HtmlPage(page_html)
+    soup = page.soup
 
     title_tag = soup.find('h1') or soup.find('title')
     name = clean_html_text(title_tag.text) if title_tag else product_name
     if not name or len(name) > 100:
         name = product_name
 
-    price = smart_extract_price(soup)
+    price = smart_extract_price(page)
 
-    description_tag = soup.find('meta', attrs={'name': 'description'})
-    description = clean_html_text(description_tag['content']) if description_tag else 'N/A'
-    if not description:
-        description = 'N/A'
+    description = clean_html_text(page.data.meta_content(name='description')) or 'N/A'
 
-    image_url = smart_extract_image(soup)
+    image_url = smart_extract_image(page)
     if image_url.startswith('//'):
         parsed_url = urlparse(brand_url)
         image_url = f"{parsed_url.scheme}:{image_url}"
@@ -144,7 +155,7 @@ def scrape_brand_product_page(brand_url, product_name):
     availability = "In Stock" if "out of stock" not in soup.get_text().lower() else "Out of Stock"
     reviews = []
 
-    product_details = {
+    return {
         "name": name,
         "price": price,
         "rating": rating,
@@ -155,6 +166,20 @@ def scrape_brand_product_page(brand_url, product_name):
         "description": description,
     }
 
+def scrape_brand_product_page(brand_url, product_name):
+    with pooled_driver(platform='brand') as driver:
+        driver.get(brand_url)
+
+        try:
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        except Exception:
+            pass
+
+        time.sleep(3)
+        page_source = driver.page_source
+
+    product_details = parse_in_pool('brand', page_source, brand_url, product_name)
+
     results = [(product_details, brand_url)]
     return results
 
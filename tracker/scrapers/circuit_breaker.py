@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .query_utils import canonicalize_query
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_BREAKER = {
+    'window': 20,               # Most recent scrapes the failure rate is computed over
+    'min_calls': 5,             # Never open on fewer calls than this
+    'failure_threshold': 0.5,   # Failure rate that opens the circuit
+    'slow_call_seconds': 45,    # Scrapes slower than this count as failures
+    'open_seconds': 120,        # How long an open circuit skips the platform before probing
+}
+LAST_GOOD_TTL = 24 * 60 * 60
+
+
+class CircuitBreaker:
+    """Rolling failure-rate breaker for one platform's scraper.
+
+    A failure is an exception, a call slower than ``slow_call_seconds``, or
+    whatever the caller reports as one (the search path: bot-check pages, given-up
+    fetches, or no product with a name and price; see views._scrape_and_store).
+    Once the failure rate over the last ``window`` calls reaches
+    ``failure_threshold`` the circuit opens and the platform is skipped. After ``open_seconds`` one probe is let through (half-open): success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, platform, window, min_calls, failure_threshold, slow_call_seconds, open_seconds):
+        self.platform = platform
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self._calls = deque(maxlen=window)   # (ok, latency) of recent scrapes
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"{self.platform} circuit half-open, probing")
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._skipped += 1
+            return False
+
+    def record(self, ok, latency):
+        ok = ok and latency <= self.slow_call_seconds
+        with self._lock:
+            self._calls.append((ok, latency))
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if ok:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"{self.platform} circuit closed after a successful probe")
+                else:
+                    self._open()
+            elif self.state == CLOSED and len(self._calls) >= self.min_calls \
+                    and self._failure_rate() >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        logger.warning(
+            f"{self.platform} circuit opened: failure rate {self._failure_rate():.0%} "
+            f"over {len(self._calls)} calls; skipping for {self.open_seconds}s"
+        )
+
+    def _failure_rate(self):
+        if not self._calls:
+            return 0.0
+        return sum(1 for ok, _ in self._calls if not ok) / len(self._calls)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(latency for _, latency in self._calls)
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            return {
+                'state': self.state,
+                'calls': len(self._calls),
+                'failure_rate': round(self._failure_rate(), 3),
+                'p50_seconds': round(latencies[len(latencies) // 2], 2) if latencies else None,
+                'max_seconds': round(latencies[-1], 2) if latencies else None,
+                'skipped': self._skipped,
+                'retry_in_seconds': round(retry_in, 1),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(platform):
+    """Process-wide breaker for a platform, configured from settings.SCRAPER_CIRCUIT_BREAKER."""
+    platform = platform.lower()
+    with _breakers_lock:
+        breaker = _breakers.get(platform)
+        if breaker is None:
+            overrides = getattr(settings, 'SCRAPER_CIRCUIT_BREAKER', {})
+            config = dict(DEFAULT_BREAKER, **overrides.get('default', {}))
+            config.update(overrides.get(platform, {}))
+            breaker = _breakers[platform] = CircuitBreaker(platform, **config)
+        return breaker
+
+
+def circuit_breaker_snapshot():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.platform: breaker.snapshot() for breaker in breakers}
+
+
+# -------------------- LAST GOOD RESULTS --------------------
+# Served while a platform's circuit is open, from the shared scraper cache.
+def _last_good_key(platform, query):
+    digest = hashlib.sha1(canonicalize_query(query).encode('utf-8')).hexdigest()
+    return f"last_good:{platform.lower()}:{digest}"
+
+
+def remember_results(platform, query, results):
+    try:
+        caches['scraper'].set(_last_good_key(platform, query), results, LAST_GOOD_TTL)
+    except Exception as e:
+        logger.warning(f"Could not cache results for {platform}: {e}")
+
+
+def cached_results(platform, query):
+    try:
+        return caches['scraper'].get(_last_good_key(platform, query)) or []
+    except Exception as e:
+        logger.warning(f"Could not read cached results for {platform}: {e}")
+        return []
@@ -1,11 +1,4 @@
-import requests
-import random
-import time
 import re
-from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -13,13 +6,12 @@ import logging
 from selenium.common.exceptions import WebDriverException, TimeoutException
 
 from .url_utils import fetch_url_with_retries, get_croma_product_urls
-
-# -------------------- USER AGENTS --------------------
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.5735.110 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.5481.177 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.5672.124 Safari/537.36",
-]
+from .driver_pool import CHECKOUT_TIMEOUT, pooled_driver
+from .parse_pool import parse_in_pool
+from .fanout import Deadline, platform_budget, run_with_deadline
+from .http_cache import is_blocked_page
+from .rate_limit import get_rate_limiter
+from .structured_data import HtmlPage
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -30,23 +22,6 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 ch.setFormatter(formatter)
 logger.addHandler(ch)
 
-# -------------------- HEADLESS BROWSER --------------------
-def init_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
-    options.page_load_strategy = 'eager'  # Don't wait for all resources to load
-    driver = webdriver.Chrome(options=options)
-    driver.set_page_load_timeout(30)  # Set page load timeout
-    driver.set_script_timeout(30)     # Set script timeout
-    return driver
-
 # -------------------- HTML CLEANING --------------------
 def clean_html_text(text):
     if not text or any(tag in text for tag in ['<', '{', '}', 'function', 'style', '</']):
@@ -56,30 +31,49 @@ def clean_html_text(text):
 def is_valid_price(text):
     return bool(re.search(r'(₹|\$)\s?\d[\d,]*(\.\d{1,2})?', text))
 
-def smart_extract_price(soup):
-    meta_price = soup.find("meta", {"property": "product:price:amount"}) or soup.find("meta", {"itemprop": "price"})
+def smart_extract_price(page):
+    data = page.data
+    meta_price = data.find_meta(property="product:price:amount") or data.find_meta(itemprop="price")
     if meta_price and meta_price.get("content"):
         content = clean_html_text(meta_price["content"])
         if content and content.replace(",", "").replace(".", "").isdigit():
             return f"₹{content}"
-    price_candidates = soup.find_all(string=re.compile(r'(₹|\$)\s?\d[\d,]*'))
+    ld_price = data.product_price()
+    if ld_price:
+        return f"₹{ld_price}"
+    price_candidates = page.soup.find_all(string=re.compile(r'(₹|\$)\s?\d[\d,]*'))
     for price_text in price_candidates:
         if is_valid_price(price_text):
             return price_text.strip()
     return "N/A"
 
-def smart_extract_image(soup):
-    og_image = soup.find("meta", property="og:image")
-    if og_image and og_image.get("content"):
-        return og_image["content"]
-    for img in soup.find_all("img"):
+def smart_extract_image(page):
+    og_image = page.data.meta_content(property="og:image")
+    if og_image:
+        return og_image
+    ld_image = page.data.product_image()
+    if ld_image:
+        return ld_image
+    for img in page.soup.find_all("img"):
         src = img.get("src") or img.get("data-src")
         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
             return src
     return "N/A"
 
-def extract_reviews(soup):
+def extract_availability(page):
+    availability = page.data.product_availability()
+    if availability:
+        return availability
+    return "In Stock" if "out of stock" not in page.soup.get_text().lower() else "Out of Stock"
+
+def extract_reviews(page):
     reviews = []
+
+    # Skip building the DOM at all when the page has no review widget
+    if not page.contains("rd-feedback-service"):
+        logger.info("Found 0 review containers")
+        return {"overall_rating": "N/A", "num_reviews": "0", "reviews": reviews}
+    soup = page.soup
     
     # Look for review containers based on the HTML structure provided
     review_containers = soup.find_all("div", class_="rd-feedback-service-review-container")
@@ -139,129 +133,150 @@ def extract_reviews(soup):
         "reviews": reviews
     }
 
-# -------------------- SCRAPE CROMA PRODUCT PAGE --------------------
-def scrape_croma_product_page(product_name, max_retries=3):
-    logger.info(f"Searching Croma for: {product_name}")
-    
-    # Get product URLs from search results
-    product_urls = get_croma_product_urls(product_name)
-    if not product_urls:
-        logger.warning(f"No products found for: {product_name}")
-        return []
-    
-    results = []
-    driver = None
-    
-    try:
-        driver = init_driver()
-        
-        for product_url in product_urls:
-            retry_count = 0
-            while retry_count < max_retries:
-                try:
-                    logger.info(f"Scraping product page: {product_url} (attempt {retry_count + 1}/{max_retries})")
-                    driver.get(product_url)
+# -------------------- PARSE PRODUCT PAGE --------------------
+def parse_product_page(page_html):
+    page = HtmlPage(page_html)
+    data = page.data
 
-                    # Wait for body with increased timeout
-                    WebDriverWait(driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-                    )
-                    
-                    # Wait for reviews with shorter timeout
-                    try:
-                        WebDriverWait(driver, 10).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, 
-                            "div[class*='ReviewContainer'], div[id*='review']"))
-                        )
-                    except TimeoutException:
-                        logger.warning(f"Timeout waiting for reviews on {product_url} - continuing anyway")
+    # Product name
+    name = "N/A"
+    og_title = data.meta_content(property="og:title")
+    if og_title:
+        name = clean_html_text(og_title)
+    else:
+        h1_tag = page.soup.find("h1")
+        name = clean_html_text(h1_tag.text) if h1_tag else "N/A"
 
-                    time.sleep(2)
+    # Description
+    description = "N/A"
+    desc_meta = data.meta_content(name="description")
+    if desc_meta:
+        description = clean_html_text(desc_meta)
+    else:
+        # Try to find product description in the page
+        desc_div = page.soup.find("div", class_="product-description") or page.soup.find("div", class_="description")
+        if desc_div:
+            description = clean_html_text(desc_div.get_text())
 
-                    try:
-                        see_more_buttons = driver.find_elements(By.XPATH, 
-                            "//button[contains(text(), 'See more')] | //a[contains(text(), 'See more reviews')]")
-                        for button in see_more_buttons[:1]:
-                            driver.execute_script("arguments[0].click();", button)
-                            time.sleep(1)
-                    except Exception as e:
-                        logger.debug(f"No review expansion needed or error expanding: {str(e)}")
-                    
-                    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    # Price, Image, Availability
+    price = smart_extract_price(page)
+    image_url = smart_extract_image(page)
+    availability = extract_availability(page)
 
-                    # Product name
-                    name = "N/A"
-                    title_tag = soup.find("meta", property="og:title")
-                    if title_tag and title_tag.get("content"):
-                        name = clean_html_text(title_tag["content"])
-                    else:
-                        h1_tag = soup.find("h1")
-                        name = clean_html_text(h1_tag.text) if h1_tag else "N/A"
+    # Extract reviews
+    review_data = extract_reviews(page)
 
-                    # Description
-                    description = "N/A"
-                    desc_meta = soup.find("meta", attrs={'name': 'description'})
-                    if desc_meta and desc_meta.get("content"):
-                        description = clean_html_text(desc_meta["content"])
-                    else:
-                        # Try to find product description in the page
-                        desc_div = soup.find("div", class_="product-description") or soup.find("div", class_="description")
-                        if desc_div:
-                            description = clean_html_text(desc_div.get_text())
+    return {
+        "name": name,
+        "price": price,
+        "rating": review_data["overall_rating"],
+        "num_reviews": review_data["num_reviews"],
+        "availability": availability,
+        "image_url": image_url,
+        "description": description,
+        "reviews": review_data["reviews"]
+    }
 
-                    # Price, Image, Availability
-                    price = smart_extract_price(soup)
-                    image_url = smart_extract_image(soup)
-                    availability = "In Stock" if "out of stock" not in soup.get_text().lower() else "Out of Stock"
-                    
-                    # Extract reviews
-                    review_data = extract_reviews(soup)
+# -------------------- SCRAPE CROMA PRODUCT PAGE --------------------
+REVIEW_CONTAINER_CSS = "div.rd-feedback-service-review-container"
 
-                    product_details = {
-                        "name": name,
-                        "price": price,
-                        "rating": review_data["overall_rating"],
-                        "num_reviews": review_data["num_reviews"],
-                        "availability": availability,
-                        "image_url": image_url,
-                        "description": description,
-                        "reviews": review_data["reviews"]
-                    }
+def expand_reviews(driver, timeout=3):
+    """Click the first 'See more' control and wait until extra reviews render."""
+    try:
+        see_more_buttons = driver.find_elements(By.XPATH, 
+            "//button[contains(text(), 'See more')] | //a[contains(text(), 'See more reviews')]")
+        for button in see_more_buttons[:1]:
+            shown = len(driver.find_elements(By.CSS_SELECTOR, REVIEW_CONTAINER_CSS))
+            driver.execute_script("arguments[0].click();", button)
+            WebDriverWait(driver, timeout).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, REVIEW_CONTAINER_CSS)) > shown
+            )
+    except TimeoutException:
+        logger.debug("No extra reviews appeared after expanding")
+    except Exception as e:
+        logger.debug(f"No review expansion needed or error expanding: {str(e)}")
 
-                    results.append((product_details, product_url))
-                    logger.info(f"Successfully scraped product: {name} with {review_data['num_reviews']} reviews")
-                    break  # Success, exit retry loop
+def scrape_single_product(product_url, max_retries=3, deadline=None):
+    """Scrape one product page, retrying up to ``max_retries`` times.
 
-                except TimeoutException as e:
-                    logger.warning(f"Timeout error on {product_url} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
-                    retry_count += 1
-                    if retry_count == max_retries:
-                        logger.error(f"Max retries reached for {product_url}")
-                        break
-                    time.sleep(2)  # Wait before retry
-                    
-                except WebDriverException as e:
-                    logger.error(f"WebDriver error on {product_url}: {str(e)}")
-                    retry_count += 1
-                    if retry_count == max_retries:
-                        break
-                    time.sleep(2)  # Wait before retry
-                    
-                except Exception as e:
-                    logger.error(f"Unexpected error on {product_url}: {str(e)}")
-                    retry_count += 1
-                    if retry_count == max_retries:
-                        break
-                    time.sleep(2)  # Wait before retry
-                
-    except Exception as e:
-        logger.error(f"Fatal error in scraper: {str(e)}")
+    ``deadline`` is the fan-out batch's Deadline: once it expires no further
+    attempt, driver checkout or retry sleep is started, so an abandoned worker
+    hands its pooled driver back as soon as its current page load ends.
+    """
+    deadline = deadline or Deadline()
+    retry_count = 0
+    while retry_count < max_retries:
+        if deadline.expired:
+            logger.warning(f"Deadline passed, giving up on {product_url} after {retry_count} attempts")
+            return None
+        try:
+            with pooled_driver(timeout=deadline.cap(CHECKOUT_TIMEOUT), platform='croma') as driver:
+                logger.info(f"Scraping product page: {product_url} (attempt {retry_count + 1}/{max_retries})")
+                driver.get(product_url)
+
+                # Wait for body with increased timeout
+                WebDriverWait(driver, deadline.cap(20)).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
+                )
+            
+                # Wait for reviews with shorter timeout
+                try:
+                    WebDriverWait(driver, deadline.cap(10)).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, 
+                        "div[class*='ReviewContainer'], div[id*='review']"))
+                    )
+                except TimeoutException:
+                    logger.warning(f"Timeout waiting for reviews on {product_url} - continuing anyway")
+
+                expand_reviews(driver)
+                page_source = driver.page_source
+
+            if is_blocked_page(page_source):
+                logger.warning(f"Bot-check page served for {product_url}")
+                get_rate_limiter(product_url).on_blocked_page()
+                return None
+            product_details = parse_in_pool('croma', page_source)
+            logger.info(f"Successfully scraped product: {product_details['name']} with {product_details['num_reviews']} reviews")
+            return (product_details, product_url)
+
+        except TimeoutException as e:
+            logger.warning(f"Timeout error on {product_url} (attempt {retry_count + 1}/{max_retries}): {str(e)}")
+            retry_count += 1
+            if retry_count == max_retries:
+                logger.error(f"Max retries reached for {product_url}")
+                break
+            deadline.sleep(2)  # Wait before retry
+        
+        except WebDriverException as e:
+            logger.error(f"WebDriver error on {product_url}: {str(e)}")
+            retry_count += 1
+            if retry_count == max_retries:
+                break
+            deadline.sleep(2)  # Wait before retry
         
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing driver: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error on {product_url}: {str(e)}")
+            retry_count += 1
+            if retry_count == max_retries:
+                break
+            deadline.sleep(2)  # Wait before retry
+
+    get_rate_limiter(product_url).on_gave_up()
+    return None
+
+def scrape_croma_product_page(product_name, max_retries=3):
+    logger.info(f"Searching Croma for: {product_name}")
+    
+    # Get product URLs from search results
+    product_urls = get_croma_product_urls(product_name)
+    if not product_urls:
+        logger.warning(f"No products found for: {product_name}")
+        return []
     
-    return results
\ No newline at end of file
+    # Each product page gets its own pooled driver; the platform budget caps how
+    # many run at once and how long the whole batch may take
+    budget = platform_budget('croma')
+    return run_with_deadline(
+        lambda product_url, deadline: scrape_single_product(product_url, max_retries, deadline),
+        product_urls, budget['fanout'], budget['deadline'], name="croma",
+    )
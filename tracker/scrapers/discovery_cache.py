@@ -0,0 +1,71 @@
+import functools
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .query_utils import canonicalize_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALIAS = 'scraper'
+DEFAULT_TTLS = {
+    'amazon': 30 * 60,
+    'flipkart': 30 * 60,
+    'reliance': 60 * 60,
+    'croma': 2 * 60 * 60,   # Discovery runs a full Selenium session, keep it longest
+    'default': 30 * 60,
+}
+
+
+def _config():
+    return getattr(settings, 'SCRAPER_DISCOVERY_CACHE', {})
+
+
+def discovery_ttl(platform):
+    ttls = dict(DEFAULT_TTLS, **_config().get('TTL', {}))
+    return ttls.get(platform, ttls['default'])
+
+
+def discovery_key(platform, query, max_results):
+    # Hashed so any query is a valid key for every cache backend (memcached rejects spaces)
+    digest = hashlib.sha1(canonicalize_query(query).encode('utf-8')).hexdigest()
+    return f"discovery:{platform}:{max_results}:{digest}"
+
+
+def cached_discovery(platform):
+    """Cache a ``get_<platform>_product_urls(product_name, max_results=5, ...)`` function.
+
+    Results are stored in the shared ``scraper`` cache under the canonical
+    query for the platform's TTL. Empty results are not cached so a failed
+    search is retried on the next request.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(product_name, max_results=5, *args, **kwargs):
+            config = _config()
+            if not config.get('ENABLED', True):
+                return func(product_name, max_results, *args, **kwargs)
+
+            key = discovery_key(platform, product_name, max_results)
+            try:
+                cache = caches[config.get('ALIAS', DEFAULT_ALIAS)]
+                urls = cache.get(key)
+            except Exception as e:
+                logger.warning(f"Discovery cache unavailable, searching {platform} directly: {e}")
+                return func(product_name, max_results, *args, **kwargs)
+
+            if urls is not None:
+                logger.debug(f"Discovery cache hit for {platform}: {product_name!r}")
+                return list(urls)
+
+            urls = func(product_name, max_results, *args, **kwargs)
+            if urls:
+                try:
+                    cache.set(key, list(urls), discovery_ttl(platform))
+                except Exception as e:
+                    logger.warning(f"Could not cache {platform} discovery for {product_name!r}: {e}")
+            return urls
+        return wrapper
+    return decorator
@@ -0,0 +1,216 @@
+import atexit
+import logging
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from .async_fetch import USER_AGENTS
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is skipped without psutil
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MAX_DRIVERS = 4               # Chrome processes alive at once across all scrapers
+MAX_PAGES_PER_DRIVER = 50     # Recycle a browser after this many page loads
+MAX_DRIVER_RSS_MB = 1024      # ... or once chromedriver + Chrome exceed this RSS
+CHECKOUT_TIMEOUT = 90         # Seconds to wait for a free browser
+
+# URL patterns handed to Chrome's Network.setBlockedURLs, grouped so each platform
+# can opt in per category (settings.SCRAPER_RESOURCE_BLOCKING). Documents, XHR and
+# first-party scripts are never matched, so pages still render their product data.
+BLOCK_CATEGORIES = {
+    'images': ['*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*'],
+    'fonts': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'stylesheets': ['*.css*'],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*'],
+    'trackers': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*googlesyndication.com*', '*googleadservices.com*', '*facebook.net*',
+        '*hotjar.com*', '*clarity.ms*', '*criteo.*', '*taboola.com*', '*moengage.com*',
+        '*webengage.com*', '*branch.io*', '*nr-data.net*', '*newrelic.com*',
+        '*adobedtm.com*', '*omtrdc.net*', '*demdex.net*', '*bat.bing.com*',
+    ],
+}
+DEFAULT_BLOCKING = ['images', 'fonts', 'stylesheets', 'media', 'trackers']
+
+
+def blocked_url_patterns(platform=None):
+    """Patterns to block for a platform, from its categories in settings.SCRAPER_RESOURCE_BLOCKING."""
+    policies = getattr(settings, 'SCRAPER_RESOURCE_BLOCKING', {})
+    categories = policies.get(platform, policies.get('default', DEFAULT_BLOCKING))
+    return [pattern for category in categories for pattern in BLOCK_CATEGORIES[category]]
+
+
+class PooledChrome(webdriver.Chrome):
+    """Chrome driver that counts page loads so the pool knows when to recycle it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pages_loaded = 0
+
+    def get(self, url):
+        self.pages_loaded += 1
+        return super().get(url)
+
+    def block_resources(self, patterns):
+        """Apply a resource-blocking policy through the DevTools protocol (no-op if unchanged)."""
+        if patterns == getattr(self, 'blocked_patterns', None):
+            return
+        if not getattr(self, 'network_enabled', False):
+            self.execute_cdp_cmd('Network.enable', {})
+            self.network_enabled = True
+        self.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        self.blocked_patterns = patterns
+
+
+def create_driver():
+    """A fresh headless Chrome; resource blocking is applied per checkout (PooledChrome.block_resources)."""
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-popup-blocking")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
+    options.page_load_strategy = 'eager'  # Don't wait for all resources to load
+    driver = PooledChrome(options=options)
+    driver.set_page_load_timeout(30)
+    driver.set_script_timeout(30)
+    return driver
+
+
+class DriverPool:
+    """Bounded pool of warm headless Chrome instances shared by the Selenium scrapers."""
+
+    def __init__(self, max_size=MAX_DRIVERS, max_pages=MAX_PAGES_PER_DRIVER,
+                 max_rss_mb=MAX_DRIVER_RSS_MB, factory=create_driver):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._factory = factory
+        self._idle = []  # LIFO so the most recently used (warmest) browser is reused first
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        if psutil is None and max_rss_mb:
+            logger.warning(f"psutil is not installed; Chrome instances will only be recycled "
+                           f"after {max_pages} pages, not at {max_rss_mb}MB RSS")
+
+    def checkout(self, timeout=CHECKOUT_TIMEOUT):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser available within {timeout}s (pool size {self.max_size})")
+        try:
+            while True:
+                with self._lock:
+                    driver = self._idle.pop() if self._idle else None
+                if driver is None:
+                    logger.info("Starting a new pooled Chrome instance")
+                    return self._factory()
+                if self._is_healthy(driver):
+                    return driver
+                logger.warning("Discarding unhealthy pooled Chrome instance")
+                self._discard(driver)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver):
+        try:
+            if self._needs_recycle(driver):
+                self._discard(driver)
+                return
+            try:
+                # Park the browser on a blank page so the last site's scripts stop running
+                webdriver.Chrome.get(driver, "about:blank")
+            except Exception:
+                self._discard(driver)
+                return
+            with self._lock:
+                self._idle.append(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout=CHECKOUT_TIMEOUT, platform=None):
+        driver = self.checkout(timeout)
+        try:
+            try:
+                driver.block_resources(blocked_url_patterns(platform))
+            except Exception as e:
+                logger.warning(f"Could not apply resource blocking for {platform}: {e}")
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, driver):
+        pages = getattr(driver, "pages_loaded", 0)
+        if pages >= self.max_pages:
+            logger.info(f"Recycling Chrome after {pages} pages")
+            return True
+        rss_mb = self._rss_mb(driver)
+        if rss_mb is not None and rss_mb > self.max_rss_mb:
+            logger.info(f"Recycling Chrome at {rss_mb:.0f}MB RSS")
+            return True
+        return False
+
+    def _rss_mb(self, driver):
+        if psutil is None:
+            return None
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def _discard(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing driver: {str(e)}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
+
+
+def pooled_driver(timeout=CHECKOUT_TIMEOUT, platform=None):
+    """Context manager yielding a warm driver from the process-wide pool.
+
+    ``platform`` selects the resource-blocking policy applied for this checkout.
+    """
+    return get_driver_pool().driver(timeout, platform)
+
+
+@atexit.register
+def _close_pool():
+    if _pool is not None:
+        _pool.close_all()
@@ -0,0 +1,176 @@
+import threading
+
+import yaml
+from cssselect import HTMLTranslator
+from lxml import etree
+
+_translator = HTMLTranslator()
+_text_xpath = etree.XPath('.//text()', smart_strings=False)
+_has_following = etree.XPath('boolean(following::node())')
+_STEP_PREFIX = 'descendant-or-self::'
+
+
+def is_single_step(xpath):
+    """True if ``xpath`` is one descendant-or-self step (no path or union outside predicates)."""
+    if not xpath.startswith(_STEP_PREFIX):
+        return False
+    depth = 0
+    quote = None
+    for char in xpath[len(_STEP_PREFIX):]:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif depth == 0 and char in '/|':
+            return False
+    return True
+
+
+def parse_html(html):
+    """Parse a page once into an lxml tree (same parser settings selectorlib/parsel use)."""
+    if not html:
+        return None
+    parser = etree.HTMLParser(recover=True, encoding='utf8')
+    return etree.fromstring(html.encode('utf8'), parser=parser)
+
+
+class CompiledField:
+    def __init__(self, name, config):
+        self.name = name
+        self.type = config.get('type', 'Text')
+        self.attribute = config.get('attribute')
+        self.multiple = config.get('multiple') is True
+        if config.get('xpath') is not None:
+            self.xpath_source = config['xpath']
+        else:
+            self.xpath_source = _translator.css_to_xpath(config['css'])
+        if not self.multiple and is_single_step(self.xpath_source):
+            # Positional predicate on a single step lets libxml2 stop at the first match
+            self.xpath_source += '[1]'
+        self.xpath = etree.XPath(self.xpath_source, smart_strings=False)
+
+    def value_of(self, element):
+        if self.type == 'Text':
+            return " ".join(t.strip() for t in _text_xpath(element) if t.strip())
+        if self.type == 'Attribute':
+            return element.get(self.attribute)
+        if self.type == 'Image':
+            return element.get('src')
+        if self.type == 'Link':
+            links = element.xpath('.//@href')
+            return links[0] if links else None
+        if self.type == 'HTML':
+            return etree.tostring(element, method='html', encoding='unicode', with_tail=False)
+        raise ValueError(f"Unsupported selector type: {self.type}")
+
+    def extract(self, root):
+        elements = self.xpath(root)
+        if not elements:
+            return None
+        if not self.multiple:
+            return self.value_of(elements[0])
+        return [self.value_of(element) for element in elements]
+
+
+class CompiledExtractor:
+    """Drop-in replacement for selectorlib.Extractor with selectors precompiled to XPath.
+
+    The page is parsed into a single lxml tree and every compiled field runs
+    against it; ``fields`` limits extraction to a subset of the configured names.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.fields = {name: CompiledField(name, field_config) for name, field_config in config.items()}
+
+    @classmethod
+    def from_yaml_string(cls, yaml_string):
+        return cls(yaml.safe_load(yaml_string))
+
+    def extract_tree(self, root, fields=None):
+        names = fields or self.fields.keys()
+        if root is None:
+            return {name: None for name in names}
+        return {name: self.fields[name].extract(root) for name in names}
+
+    def extract(self, html, fields=None):
+        return self.extract_tree(parse_html(html), fields)
+
+    def streaming(self, fields=None, encoding='utf-8'):
+        return StreamingExtraction(self, fields or list(self.fields), encoding)
+
+
+class StreamingExtraction:
+    """Incremental parse of a page that reports once every requested field is resolved.
+
+    Body chunks go into an lxml HTMLPullParser as they arrive and the missing
+    fields are looked up on the partial tree after each one. A field counts as
+    resolved when its first match is complete, i.e. the parser has already
+    read past the matched element. ``multiple`` fields only resolve at EOF.
+    Like any lxml parser it must be reset, fed and closed on a single thread.
+    """
+
+    def __init__(self, extractor, fields, encoding='utf-8'):
+        self.extractor = extractor
+        self.fields = list(fields)
+        self.encoding = encoding
+        self.reset()
+
+    def reset(self):
+        """Start over, e.g. when a fetch is retried after a partial body."""
+        self._parser = etree.HTMLPullParser(events=('start',), recover=True, encoding=self.encoding)
+        self._root = None
+        self._pending = [self.extractor.fields[name] for name in self.fields]
+        self._result = None
+        self.bytes_fed = 0
+        self.done = False
+
+    def _is_resolved(self, field):
+        if field.multiple:
+            return False
+        matches = field.xpath(self._root)
+        return bool(matches) and _has_following(matches[0])
+
+    def feed(self, chunk):
+        """Parse one chunk of the body; True once no more data is needed."""
+        self._parser.feed(chunk)
+        self.bytes_fed += len(chunk)
+        for _, element in self._parser.read_events():
+            if self._root is None:
+                self._root = element.getroottree().getroot()
+        if self._root is not None:
+            self._pending = [field for field in self._pending if not self._is_resolved(field)]
+            self.done = not self._pending
+        return self.done
+
+    def result(self):
+        """The extracted fields; closes the parser, so later calls return the same dict."""
+        if self._result is None:
+            try:
+                root = self._parser.close()
+            except etree.XMLSyntaxError:
+                root = None
+            self._result = self.extractor.extract_tree(root, self.fields)
+        return self._result
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register_extractor(name, yaml_string):
+    """Compile a selectorlib-style YAML config once and keep it for the process."""
+    with _registry_lock:
+        extractor = _registry.get(name)
+        if extractor is None:
+            extractor = _registry[name] = CompiledExtractor.from_yaml_string(yaml_string)
+        return extractor
+
+
+def get_extractor(name):
+    return _registry[name]
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = {
+    'fanout': 5,      # Product pages worked on at once
+    'deadline': 45,   # Seconds the whole product-page stage may take
+}
+
+
+def platform_budget(platform):
+    """Fan-out and deadline for a platform from settings.SCRAPER_FANOUT."""
+    overrides = getattr(settings, 'SCRAPER_FANOUT', {})
+    budget = dict(DEFAULT_BUDGET, **overrides.get('default', {}))
+    budget.update(overrides.get(platform, {}))
+    return budget
+
+
+class Deadline:
+    """Time budget shared by the workers of one fan-out batch.
+
+    ``run_with_deadline`` cancels it when it stops waiting, so workers it has
+    abandoned see ``expired`` before their next retry or driver checkout and
+    give their resources back instead of running to completion in the background.
+    """
+
+    def __init__(self, seconds=None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def expired(self):
+        return self._cancelled.is_set() or self.remaining() <= 0
+
+    def remaining(self):
+        if self._cancelled.is_set():
+            return 0.0
+        if self.expires_at is None:
+            return float('inf')
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def cap(self, seconds):
+        """``seconds``, shortened to what is left of the budget."""
+        return min(seconds, self.remaining())
+
+    def sleep(self, seconds):
+        """Sleep up to ``seconds``; False (possibly early) once the budget is used up."""
+        self._cancelled.wait(self.cap(seconds))
+        return not self.expired
+
+
+def run_with_deadline(func, items, fanout, deadline, name="fan-out"):
+    """Call ``func(item, batch_deadline)`` for every item on up to ``fanout`` threads.
+
+    Returns the non-None results of the calls that finished within ``deadline``
+    seconds, in the order of ``items``. Calls that never started are cancelled;
+    calls still running at the deadline are abandoned and their results dropped,
+    and ``batch_deadline`` (a Deadline) is cancelled so they stop at their next
+    check instead of holding pooled drivers until they finish.
+    """
+    items = list(items)
+    if not items:
+        return []
+    started = time.monotonic()
+    batch_deadline = Deadline(deadline)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(fanout, len(items))), thread_name_prefix=name)
+    futures = {executor.submit(func, item, batch_deadline): index for index, item in enumerate(items)}
+    finished = {}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            try:
+                finished[futures[future]] = future.result()
+            except Exception as e:
+                logger.error(f"{name}: {items[futures[future]]} failed: {e!r}")
+    except FuturesTimeoutError:
+        logger.warning(
+            f"{name}: deadline of {deadline}s hit after {time.monotonic() - started:.1f}s, "
+            f"returning {len(finished)}/{len(items)} results"
+        )
+    finally:
+        batch_deadline.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return [finished[index] for index in sorted(finished) if finished[index] is not None]
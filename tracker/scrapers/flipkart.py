@@ -1,5 +1,8 @@
 import logging
-from selectorlib import Extractor
+from .async_fetch import fetch_many_sync
+from .extractors import register_extractor
+from .fanout import platform_budget
+from .parse_pool import submit_parse
 from .url_utils import fetch_url_with_retries, get_flipkart_product_urls
 
 # Configure logger
@@ -10,8 +13,8 @@ formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
-def get_flipkart_extractor():
-    return Extractor.from_yaml_string("""
+# Selectors in selectorlib's YAML format; compiled to XPath once per process
+FLIPKART_SELECTORS = """
     product_name:
         css: 'span.VU-ZEz'
         type: Text
@@ -46,7 +49,10 @@ def get_flipkart_extractor():
         css: 'div._8-rIO3, div._6K-7Co'
         multiple: true
         type: Text
-    """)
+    """
+
+def get_flipkart_extractor():
+    return register_extractor('flipkart', FLIPKART_SELECTORS)
 
 def extract_product_data(url, extractor):
     """Extract product data from the given URL using the extractor."""
@@ -54,8 +60,11 @@ def extract_product_data(url, extractor):
     if not response:
         logger.warning(f"Failed to fetch URL: {url}")
         return None
+    return parse_product_data(response.text, extractor)
 
-    data = extractor.extract(response.text) or {}
+def parse_product_data(page_html, extractor):
+    """Parse an already-fetched product page with the extractor."""
+    data = extractor.extract(page_html) or {}
     product_details = {
         "name": data.get("product_name", "N/A").strip() if data.get("product_name") else "N/A",
         "price": data.get("price", "N/A").strip() if data.get("price") else "N/A",
@@ -69,14 +78,19 @@ def extract_product_data(url, extractor):
     return product_details
 
 def scrape_flipkart_products(product_name):
-    extractor = get_flipkart_extractor()
     product_urls = get_flipkart_product_urls(product_name)
-    results = []
 
-    for url in product_urls:
-        product_data = extract_product_data(url, extractor)
-        if product_data:
-            results.append((product_data, url))
+    # Fetch product pages concurrently within the platform's budget; pages still
+    # loading at the deadline are skipped. Parsing runs on the parse pool's cores.
+    budget = platform_budget('flipkart')
+    responses = fetch_many_sync(product_urls, concurrency=budget['fanout'], deadline=budget['deadline'])
+    tasks = []
+    for url, response in zip(product_urls, responses):
+        if not response:
+            logger.warning(f"Failed to fetch URL: {url}")
+            continue
+        tasks.append((submit_parse('flipkart', response.text), url))
+    results = [(task.result(), url) for task, url in tasks]
 
     logger.info(f"Scraped {len(results)} products for '{product_name}'")
     return results
\ No newline at end of file
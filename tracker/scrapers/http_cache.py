@@ -0,0 +1,319 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTLS = {
+    'search': 15 * 60,
+    'product': 60 * 60,
+    'default': 10 * 60,
+}
+
+# URL class -> patterns; the first match decides which TTL applies
+URL_CLASSES = [
+    ('search', re.compile(r'amazon\.in/s\?|flipkart\.com/search\?|reliancedigital\.in/products\?|croma\.com/search')),
+    ('product', re.compile(r'amazon\.in/dp/|flipkart\.com/.+/p/|reliancedigital\.in/product/|croma\.com/.+/p/')),
+]
+
+
+# Robot-check / captcha / WAF pages the stores serve with a 200 status
+BLOCK_PAGE_MARKERS = [
+    'To discuss automated access to Amazon data',
+    '/errors/validateCaptcha',
+    'Enter the characters you see below',
+    'Are you a human?',
+    'Flipkart Recaptcha',
+    '<title>Access Denied</title>',
+    "You don't have permission to access",
+    'captcha-delivery.com',
+]
+
+
+def classify_url(url):
+    for url_class, pattern in URL_CLASSES:
+        if pattern.search(url):
+            return url_class
+    return 'default'
+
+
+def is_blocked_page(text):
+    """True for a store's bot-check page, which must never be cached or parsed as a product."""
+    head = (text or '')[:20000]
+    return any(marker in head for marker in BLOCK_PAGE_MARKERS)
+
+
+class CacheEntry:
+    def __init__(self, url, body_hash, stored_at, size, etag=None, last_modified=None, headers=None,
+                 last_access=None):
+        self.url = url
+        self.body_hash = body_hash
+        self.stored_at = stored_at
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers or {}
+        self.last_access = last_access or stored_at
+
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS entries_body_hash ON entries (body_hash);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS blobs (
+    body_hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL
+);
+"""
+ENTRY_COLUMNS = 'e.url, e.body_hash, e.stored_at, b.size, e.etag, e.last_modified, e.headers, e.last_access'
+EVICT_BATCH = 100
+
+
+class HttpCache:
+    """On-disk response cache: compressed bodies stored by content hash, metadata per URL.
+
+    The index (URL entries and blob sizes) is a SQLite database in the cache
+    directory, so every worker process sees the same entries, the same size
+    bound and the same blob reference counts. Entries are fresh for the TTL of
+    their URL class; stale entries that carry an ETag or Last-Modified header
+    are revalidated with a conditional request. Total blob size is bounded and
+    the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.directory = str(directory)
+        self.blob_dir = os.path.join(self.directory, 'blobs')
+        self.index_path = os.path.join(self.directory, 'index.sqlite3')
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Counters are per process; entries and bytes come from the shared index
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.blocked = 0
+
+    # -------------------- PATHS --------------------
+    @staticmethod
+    def url_key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self.blob_dir, body_hash[:2], f"{body_hash}.z")
+
+    @staticmethod
+    def _write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # -------------------- INDEX --------------------
+    def _connect(self):
+        """This thread's connection to the shared index (reopened after a fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(self.index_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(INDEX_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        """Index transaction holding SQLite's write lock, so writers in every process take turns."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _entry(row):
+        url, body_hash, stored_at, size, etag, last_modified, headers, last_access = row
+        return CacheEntry(url, body_hash, stored_at, size, etag, last_modified, json.loads(headers), last_access)
+
+    def _release_blobs(self, conn, body_hashes):
+        """Delete the given blobs once no entry (from any process) points at them; returns bytes freed."""
+        freed = 0
+        for body_hash in set(body_hashes):
+            if conn.execute('SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1', (body_hash,)).fetchone():
+                continue
+            row = conn.execute('SELECT size FROM blobs WHERE body_hash = ?', (body_hash,)).fetchone()
+            conn.execute('DELETE FROM blobs WHERE body_hash = ?', (body_hash,))
+            freed += row[0] if row else 0
+            try:
+                os.remove(self._blob_path(body_hash))
+            except OSError:
+                pass
+        return freed
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        while total > self.max_bytes:
+            oldest = conn.execute(
+                'SELECT key, body_hash FROM entries ORDER BY last_access LIMIT ?', (EVICT_BATCH,)
+            ).fetchall()
+            if not oldest:
+                break
+            for key, body_hash in oldest:
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                total -= self._release_blobs(conn, [body_hash])
+                with self._lock:
+                    self.evictions += 1
+                if total <= self.max_bytes:
+                    break
+
+    # -------------------- PUBLIC API --------------------
+    def ttl_for(self, url):
+        return self.ttls.get(classify_url(url), self.ttls['default'])
+
+    def is_fresh(self, entry):
+        return time.time() - entry.stored_at < self.ttl_for(entry.url)
+
+    def lookup(self, url):
+        """Return ``(entry, text)`` for a cached URL, or None on a miss."""
+        key = self.url_key(url)
+        conn = self._connect()
+        row = conn.execute(
+            f'SELECT {ENTRY_COLUMNS} FROM entries e JOIN blobs b ON b.body_hash = e.body_hash WHERE e.key = ?',
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        entry = self._entry(row)
+        try:
+            with open(self._blob_path(entry.body_hash), 'rb') as f:
+                text = zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error, UnicodeDecodeError):
+            with self._write() as conn:
+                conn.execute('DELETE FROM entries WHERE key = ? AND body_hash = ?', (key, entry.body_hash))
+                self._release_blobs(conn, [entry.body_hash])
+            return None
+        entry.last_access = time.time()
+        conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (entry.last_access, key))
+        return entry, text
+
+    def store(self, url, text, headers):
+        """Cache a 200 response; bot-check pages are refused. Returns whether it was stored."""
+        if is_blocked_page(text):
+            with self._lock:
+                self.blocked += 1
+            logger.warning(f"Not caching bot-check page served for {url}")
+            return False
+        body = text.encode('utf-8')
+        body_hash = hashlib.sha256(body).hexdigest()
+        key = self.url_key(url)
+        blob_path = self._blob_path(body_hash)
+        compressed = zlib.compress(body, 6)
+        now = time.time()
+        with self._write() as conn:
+            known = conn.execute('SELECT 1 FROM blobs WHERE body_hash = ?', (body_hash,)).fetchone()
+            if known is None or not os.path.exists(blob_path):
+                self._write_atomic(blob_path, compressed)
+                conn.execute('INSERT OR REPLACE INTO blobs (body_hash, size) VALUES (?, ?)',
+                             (body_hash, len(compressed)))
+            old = conn.execute('SELECT body_hash FROM entries WHERE key = ?', (key,)).fetchone()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, url, body_hash, stored_at, last_access, etag, last_modified, headers) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, url, body_hash, now, now, headers.get('ETag'), headers.get('Last-Modified'),
+                 json.dumps({'Content-Type': headers.get('Content-Type', '')})),
+            )
+            # The URL's previous body goes unless another entry shares it
+            if old is not None and old[0] != body_hash:
+                self._release_blobs(conn, [old[0]])
+            self._evict(conn)
+        return True
+
+    def revalidate(self, entry, headers):
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        entry.stored_at = time.time()
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        with self._write() as conn:
+            conn.execute(
+                'UPDATE entries SET stored_at = ?, last_access = ?, etag = ?, last_modified = ? '
+                'WHERE key = ? AND body_hash = ?',
+                (entry.stored_at, entry.stored_at, entry.etag, entry.last_modified,
+                 self.url_key(entry.url), entry.body_hash),
+            )
+        with self._lock:
+            self.revalidated += 1
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        conn = self._connect()
+        entries = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.revalidated + self.misses
+            return {
+                'entries': entries,
+                'bytes': total,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'revalidated': self.revalidated,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'blocked_not_cached': self.blocked,
+                'hit_rate': round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Process-wide cache configured from settings.SCRAPER_HTTP_CACHE; None when disabled."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = getattr(settings, 'SCRAPER_HTTP_CACHE', {})
+            if not config.get('ENABLED', True):
+                return None
+            directory = config.get('DIR') or os.path.join(settings.BASE_DIR, '.scraper_cache', 'http')
+            _cache = HttpCache(directory, config.get('MAX_BYTES', DEFAULT_MAX_BYTES), config.get('TTL'))
+        return _cache
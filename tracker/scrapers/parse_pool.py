@@ -0,0 +1,143 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_TASKS_PER_CHILD = 200   # Recycle workers now and then so parser memory can't creep
+
+
+# -------------------- PARSE FUNCTIONS (run in the workers) --------------------
+# Top-level and argument-only so they pickle; scraper modules are imported lazily
+# because they import this module themselves.
+def _parse_amazon(page_html):
+    from .amazon import get_amazon_extractor, parse_product_data
+    return parse_product_data(page_html, get_amazon_extractor())
+
+
+def _parse_flipkart(page_html):
+    from .flipkart import get_flipkart_extractor, parse_product_data
+    return parse_product_data(page_html, get_flipkart_extractor())
+
+
+def _parse_croma(page_html):
+    from .croma import parse_product_page
+    return parse_product_page(page_html)
+
+
+def _parse_reliance(page_html):
+    from .reliance import parse_product_page
+    return parse_product_page(page_html)
+
+
+def _parse_brand(page_html, brand_url, product_name):
+    from .brand import parse_brand_page
+    return parse_brand_page(page_html, brand_url, product_name)
+
+
+PARSERS = {
+    'amazon': _parse_amazon,
+    'flipkart': _parse_flipkart,
+    'croma': _parse_croma,
+    'reliance': _parse_reliance,
+    'brand': _parse_brand,
+}
+
+
+def parse_page(platform, page_html, *args):
+    """Parse one product page into the plain details dict the scrapers return."""
+    return PARSERS[platform](page_html, *args)
+
+
+def _init_worker():
+    # Workers are spawned, not forked, so they start without Django configured
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'price_tracker.settings')
+    import django
+    django.setup()
+
+
+# -------------------- POOL --------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _pool_size():
+    workers = getattr(settings, 'SCRAPER_PARSE_POOL', {}).get('WORKERS')
+    return workers or min(4, os.cpu_count() or 1)
+
+
+def get_parse_pool():
+    """Process-wide parse pool; None when disabled in settings.SCRAPER_PARSE_POOL."""
+    global _pool
+    if not getattr(settings, 'SCRAPER_PARSE_POOL', {}).get('ENABLED', True):
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs the fetch-engine and driver threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                max_tasks_per_child=MAX_TASKS_PER_CHILD,
+            )
+        return _pool
+
+
+def _discard_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parse_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_parse_pool)
+
+
+class ParseTask:
+    """A page handed to the pool. ``result()`` parses inline if the pool is unusable."""
+
+    def __init__(self, platform, page_html, args):
+        self.platform = platform
+        self.page_html = page_html
+        self.args = args
+        self.pool = get_parse_pool()
+        self.future = None
+        if self.pool is not None:
+            try:
+                self.future = self.pool.submit(parse_page, platform, page_html, *args)
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning(f"Parse pool unavailable, parsing {platform} page inline: {e!r}")
+                _discard_pool(self.pool)
+
+    def result(self):
+        if self.future is not None:
+            try:
+                return self.future.result()
+            except BrokenProcessPool as e:
+                logger.warning(f"Parse pool broke, parsing {self.platform} page inline: {e!r}")
+                _discard_pool(self.pool)
+        return parse_page(self.platform, self.page_html, *self.args)
+
+
+def submit_parse(platform, page_html, *args):
+    """Queue a page for parsing in the pool; call ``.result()`` for the details dict."""
+    return ParseTask(platform, page_html, args)
+
+
+def parse_in_pool(platform, page_html, *args):
+    return submit_parse(platform, page_html, *args).result()
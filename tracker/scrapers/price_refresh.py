@@ -0,0 +1,67 @@
+import logging
+from urllib.parse import urlparse
+
+from .amazon import get_amazon_extractor
+from .async_fetch import stream_many_sync
+from .fanout import platform_budget
+from .flipkart import get_flipkart_extractor
+
+logger = logging.getLogger(__name__)
+
+# The only selectors evaluated on a refresh; descriptions, images and reviews are skipped
+PRICE_FIELDS = ['price', 'availability']
+
+EXTRACTORS = {
+    'amazon': get_amazon_extractor,
+    'flipkart': get_flipkart_extractor,
+}
+
+
+def platform_for_url(url):
+    host = urlparse(url).netloc
+    for platform in EXTRACTORS:
+        if platform in host:
+            return platform
+    return None
+
+
+def clean_price_fields(data):
+    return {
+        field: data[field].strip() if data.get(field) else "N/A"
+        for field in PRICE_FIELDS
+    }
+
+
+def parse_price_fields(platform, page_html):
+    """Price and availability from an already-fetched product page."""
+    return clean_price_fields(EXTRACTORS[platform]().extract(page_html, fields=PRICE_FIELDS))
+
+
+def refresh_prices(urls):
+    """Stream known product URLs and read only their price fields.
+
+    Skips search/discovery entirely, and each download stops as soon as the
+    price and availability elements have been parsed. Returns ``{url: {'price', 'availability'}}``
+    with None for pages that could not be fetched or belong to an unsupported
+    store; callers fall back to the full scrape for those.
+    """
+    results = {url: None for url in urls}
+    by_platform = {}
+    for url in urls:
+        platform = platform_for_url(url)
+        if platform:
+            by_platform.setdefault(platform, []).append(url)
+        else:
+            logger.warning(f"No price-only refresh for {url}")
+
+    for platform, platform_urls in by_platform.items():
+        budget = platform_budget(platform)
+        extractor = EXTRACTORS[platform]()
+        jobs = [(url, extractor.streaming(PRICE_FIELDS)) for url in platform_urls]
+        responses = stream_many_sync(jobs, concurrency=budget['fanout'], deadline=budget['deadline'])
+        for (url, stream), response in zip(jobs, responses):
+            if not response:
+                logger.warning(f"Price refresh failed to fetch {url}")
+                continue
+            results[url] = clean_price_fields(stream.result())
+    return results
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# "128 GB", "128gb", "128 Gigabytes" -> "128gb"; '6.1"' / "6.1 inch" -> "6.1in"
+UNIT_ALIASES = {
+    'gb': 'gb', 'gigabyte': 'gb', 'gigabytes': 'gb',
+    'tb': 'tb', 'terabyte': 'tb', 'terabytes': 'tb',
+    'mb': 'mb', 'mah': 'mah',
+    'in': 'in', 'inch': 'in', 'inches': 'in', '"': 'in',
+    'hz': 'hz', 'w': 'w', 'watt': 'w', 'watts': 'w',
+    'mp': 'mp', 'megapixel': 'mp', 'megapixels': 'mp',
+}
+UNIT_RE = re.compile(
+    r'(\d+(?:\.\d+)?)\s*(' + '|'.join(sorted((re.escape(u) for u in UNIT_ALIASES), key=len, reverse=True)) + r')(?![a-z])'
+)
+PUNCTUATION_RE = re.compile(r'[^\w.+]+|(?<!\d)\.|\.(?!\d)')
+
+BRAND_PHRASES = {'one plus': 'oneplus', 'hewlett packard': 'hp', 'bo at': 'boat'}
+BRAND_ALIASES = {'mi': 'xiaomi', 'one+': 'oneplus', '1+': 'oneplus'}
+# Product lines that already imply the brand, so "apple iphone 15" == "iphone 15"
+PRODUCT_LINE_BRANDS = {
+    'iphone': 'apple', 'ipad': 'apple', 'macbook': 'apple', 'airpods': 'apple', 'imac': 'apple',
+    'galaxy': 'samsung', 'pixel': 'google', 'redmi': 'xiaomi', 'nord': 'oneplus',
+    'rockerz': 'boat', 'airdopes': 'boat', 'bravia': 'sony', 'ideapad': 'lenovo',
+    'thinkpad': 'lenovo', 'pavilion': 'hp', 'inspiron': 'dell', 'narzo': 'realme',
+}
+STOPWORDS = {
+    'a', 'an', 'the', 'and', 'for', 'with', 'of', 'buy', 'online', 'price', 'prices',
+    'best', 'cheap', 'new', 'latest', 'deal', 'deals', 'offer', 'offers', 'india',
+}
+
+DEFAULT_CANONICALIZER = {
+    'SYNONYMS': True,       # Apply the QuerySynonym table
+    'SYNONYM_TTL': 300,     # Seconds the table is cached per process
+    'TRACKED_KEYS': 1000,   # Canonical keys kept in the collapse metrics
+}
+
+
+def _config():
+    return dict(DEFAULT_CANONICALIZER, **getattr(settings, 'QUERY_CANONICALIZER', {}))
+
+
+# -------------------- SYNONYMS --------------------
+_synonyms = None
+_synonyms_loaded_at = 0.0
+_synonyms_lock = threading.Lock()
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def load_synonyms():
+    """(phrase regex, replacement) pairs from the QuerySynonym table, longest phrase first."""
+    global _synonyms, _synonyms_loaded_at
+    config = _config()
+    if not config['SYNONYMS']:
+        return []
+    with _synonyms_lock:
+        if _synonyms is not None and time.monotonic() - _synonyms_loaded_at < config['SYNONYM_TTL']:
+            return _synonyms
+        if _in_event_loop():
+            # No sync ORM on the event loop; keep what we have until a sync caller reloads
+            return _synonyms or []
+        try:
+            from tracker.models import QuerySynonym
+            rows = QuerySynonym.objects.values_list('phrase', 'canonical')
+            pairs = sorted(((p.casefold().strip(), c.casefold().strip()) for p, c in rows), key=lambda r: -len(r[0]))
+            _synonyms = [(re.compile(r'(?<!\S)' + re.escape(p) + r'(?!\S)'), c) for p, c in pairs if p]
+        except Exception as e:
+            logger.warning(f"Could not load query synonyms: {e}")
+            _synonyms = _synonyms or []
+        _synonyms_loaded_at = time.monotonic()
+        return _synonyms
+
+
+def clear_synonym_cache():
+    global _synonyms
+    with _synonyms_lock:
+        _synonyms = None
+
+
+# -------------------- CANONICALIZER --------------------
+def canonicalize_query(query):
+    """Canonical key of a search query, used by every cache and dedup structure.
+
+    Case-folds, writes units one way ("128 GB" -> "128gb"), applies the learned
+    synonyms and brand aliases, drops stopwords and brands implied by a product
+    line ("apple iphone" -> "iphone"), then sorts the unique tokens. "iPhone 15
+    128GB", "iphone 15 128 gb" and "Apple iPhone 15 (128GB)" all become
+    "128gb 15 iphone". The stores still see the original query.
+    """
+    text = unicodedata.normalize('NFKC', query or '').casefold()
+    text = UNIT_RE.sub(lambda m: m.group(1) + UNIT_ALIASES[m.group(2)], text)
+    text = ' '.join(PUNCTUATION_RE.sub(' ', text).split())
+    for phrase, brand in BRAND_PHRASES.items():
+        text = re.sub(r'(?<!\S)' + re.escape(phrase) + r'(?!\S)', brand, text)
+    for pattern, replacement in load_synonyms():
+        text = pattern.sub(replacement, text)
+
+    tokens = [BRAND_ALIASES.get(token, token) for token in text.split()]
+    tokens = [token for token in tokens if token not in STOPWORDS]
+    implied = {PRODUCT_LINE_BRANDS[token] for token in tokens if token in PRODUCT_LINE_BRANDS}
+    tokens = {token for token in tokens if token not in implied}
+    if not tokens:
+        # All stopwords: fall back to the plain tokens so the key never collapses to ""
+        tokens = set(text.split())
+    return " ".join(sorted(tokens))
+
+
+# -------------------- COLLAPSE METRICS --------------------
+_query_stats = OrderedDict()   # canonical key -> {'hits': n, 'variants': {raw spelling, ...}}
+_query_stats_lock = threading.Lock()
+MAX_VARIANTS = 20
+
+
+def record_query(query):
+    """Canonicalize a user-entered query and count which raw spellings collapse onto its key."""
+    canonical = canonicalize_query(query)
+    raw = " ".join((query or "").split())
+    with _query_stats_lock:
+        stats = _query_stats.pop(canonical, None) or {'hits': 0, 'variants': set()}
+        stats['hits'] += 1
+        if len(stats['variants']) < MAX_VARIANTS:
+            stats['variants'].add(raw)
+        _query_stats[canonical] = stats  # most recently used last
+        while len(_query_stats) > _config()['TRACKED_KEYS']:
+            _query_stats.popitem(last=False)
+    return canonical
+
+
+def query_collapse_snapshot(top=20):
+    with _query_stats_lock:
+        items = [(key, stats['hits'], sorted(stats['variants'])) for key, stats in _query_stats.items()]
+    raw_spellings = sum(len(variants) for _, _, variants in items)
+    items.sort(key=lambda item: (-len(item[2]), -item[1]))
+    return {
+        'queries': sum(hits for _, hits, _ in items),
+        'raw_spellings': raw_spellings,
+        'canonical_keys': len(items),
+        'spellings_per_key': round(raw_spellings / len(items), 2) if items else 0.0,
+        'top': [{'key': key, 'hits': hits, 'variants': variants} for key, hits, variants in items[:top]],
+    }
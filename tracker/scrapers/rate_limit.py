@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMITS = {
+    'rate': 2.0,        # Requests per second we start at
+    'burst': 4,         # Bucket capacity
+    'min_rate': 0.2,    # Never slow below one request every 5s
+    'max_rate': 8.0,    # Ceiling for additive increase
+    'increase': 0.1,    # Requests/sec added after each successful response
+    'decrease': 0.5,    # Multiplier applied on 503/429
+}
+
+
+class HostRateLimiter:
+    """Token bucket for one host whose refill rate adapts to the store's feedback.
+
+    Successful responses raise the rate additively; 503/429 responses cut it
+    multiplicatively and honour Retry-After. Callers reserve the next free slot
+    and wait exactly until it comes up, so concurrent callers queue in order.
+    """
+
+    def __init__(self, host, rate, burst, min_rate, max_rate, increase, decrease):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.blocked_pages = 0
+        self.gave_up = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a slot and return how many seconds the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            # Drop any saved-up burst so the next callers actually slow down
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            logger.warning(f"Throttled by {self.host}; rate now {self.rate:.2f} req/s")
+
+    def on_blocked_page(self):
+        """The store answered with a bot-check page: slow down like a 429 and count it."""
+        with self._lock:
+            self.blocked_pages += 1
+        self.on_throttle()
+
+    def on_gave_up(self):
+        """A fetch or page load ran out of retries or time; counted against the platform's circuit breaker."""
+        with self._lock:
+            self.gave_up += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'blocked_pages': self.blocked_pages,
+                'gave_up': self.gave_up,
+                'tokens': round(self._tokens, 2),
+                'blocked_for': round(max(0.0, self._blocked_until - time.monotonic()), 2),
+            }
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header; HTTP-date values are ignored."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url_or_host):
+    """Process-wide limiter for the host of ``url_or_host``."""
+    host = urlparse(url_or_host).netloc or url_or_host
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            overrides = getattr(settings, 'SCRAPER_RATE_LIMITS', {})
+            config = dict(DEFAULT_LIMITS, **overrides.get('default', {}))
+            config.update(overrides.get(host, {}))
+            limiter = _limiters[host] = HostRateLimiter(host, **config)
+        return limiter
+
+
+def failure_count(platform):
+    """Bot-check pages and given-up fetches so far from every host of a platform
+    (e.g. 'amazon' -> www.amazon.in). Scrapers swallow these and return fewer or no
+    results, so the circuit breaker compares this count before and after a scrape."""
+    with _limiters_lock:
+        limiters = [limiter for host, limiter in _limiters.items() if platform.lower() in host]
+    return sum(limiter.blocked_pages + limiter.gave_up for limiter in limiters)
+
+
+def rate_limiter_snapshot():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.snapshot() for limiter in limiters}
@@ -1,27 +1,18 @@
-import requests
-import random
-import time
 import re
 import logging
-from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import WebDriverException, TimeoutException
 
 from .url_utils import fetch_url_with_retries, get_reliance_product_urls
-
-# -------------------- USER AGENTS --------------------
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.5735.110 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.5481.177 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.5672.124 Safari/537.36",
-]
+from .driver_pool import CHECKOUT_TIMEOUT, pooled_driver
+from .parse_pool import parse_in_pool
+from .fanout import Deadline, platform_budget, run_with_deadline
+from .http_cache import is_blocked_page
+from .rate_limit import get_rate_limiter
+from .structured_data import HtmlPage
 
 # -------------------- LOGGER --------------------
 logger = logging.getLogger(__name__)
@@ -32,16 +23,6 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 ch.setFormatter(formatter)
 logger.addHandler(ch)
 
-# -------------------- DRIVER INIT --------------------
-def init_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
-    return webdriver.Chrome(options=options)
-
 # -------------------- UTILITY FUNCTIONS --------------------
 def clean_html_text(text):
     if not text or any(tag in text for tag in ['<', '{', '}', 'function', 'style', '</']):
@@ -51,31 +32,50 @@ def clean_html_text(text):
 def is_valid_price(text):
     return bool(re.search(r'(₹|\$)\s?\d[\d,]*(\.\d{1,2})?', text))
 
-def smart_extract_price(soup):
-    meta_price = soup.find("meta", {"property": "product:price:amount"}) or soup.find("meta", {"itemprop": "price"})
+def smart_extract_price(page):
+    data = page.data
+    meta_price = data.find_meta(property="product:price:amount") or data.find_meta(itemprop="price")
     if meta_price and meta_price.get("content"):
         content = clean_html_text(meta_price["content"])
         if content and content.replace(",", "").replace(".", "").isdigit():
             return f"₹{content}"
-    price_candidates = soup.find_all(string=re.compile(r'(₹|\$)\s?\d[\d,]*'))
+    ld_price = data.product_price()
+    if ld_price:
+        return f"₹{ld_price}"
+    price_candidates = page.soup.find_all(string=re.compile(r'(₹|\$)\s?\d[\d,]*'))
     for price_text in price_candidates:
         if is_valid_price(price_text):
             return price_text.strip()
     return "N/A"
 
-def smart_extract_image(soup):
-    og_image = soup.find("meta", property="og:image")
-    if og_image and og_image.get("content"):
-        return og_image["content"]
-    for img in soup.find_all("img"):
+def smart_extract_image(page):
+    og_image = page.data.meta_content(property="og:image")
+    if og_image:
+        return og_image
+    ld_image = page.data.product_image()
+    if ld_image:
+        return ld_image
+    for img in page.soup.find_all("img"):
         src = img.get("src") or img.get("data-src")
         if src and any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']):
             return src
     return "N/A"
 
+def extract_availability(page):
+    availability = page.data.product_availability()
+    if availability:
+        return availability
+    return "In Stock" if "out of stock" not in page.soup.get_text().lower() else "Out of Stock"
+
 # -------------------- REVIEWS --------------------
-def extract_reviews(soup):
+def extract_reviews(page):
     reviews = []
+
+    # Skip building the DOM at all when the page has no review widget
+    if not page.contains("rd-feedback-service"):
+        logger.info("Found 0 review containers")
+        return {"overall_rating": "N/A", "num_reviews": "0", "reviews": reviews}
+    soup = page.soup
     review_containers = soup.find_all("div", class_="rd-feedback-service-review-container")
     logger.info(f"Found {len(review_containers)} review containers")
 
@@ -112,83 +112,105 @@ def extract_reviews(soup):
         "reviews": reviews
     }
 
-# -------------------- SCRAPE ONE PRODUCT --------------------
-def scrape_single_product(product_url):
-    driver = init_driver()
-    try:
-        logger.info(f"Scraping product page: {product_url}")
-        driver.get(product_url)
+# -------------------- PARSE ONE PRODUCT --------------------
+def parse_product_page(page_html):
+    page = HtmlPage(page_html)
+    data = page.data
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-        )
+    title_meta = data.find_meta(property="og:title")
+    if title_meta:
+        name = clean_html_text(title_meta.get("content"))
+    else:
+        h1_tag = page.soup.find("h1")
+        name = clean_html_text(h1_tag.text if h1_tag else "N/A")
 
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='rd-feedback-service-review'], div[id='review']"))
-            )
-        except TimeoutException:
-            logger.warning(f"Timeout waiting for review section: {product_url}")
-
-        time.sleep(2)
+    desc_meta = data.find_meta(name="description")
+    description = clean_html_text(desc_meta.get("content")) if desc_meta else "N/A"
 
-        try:
-            see_more_buttons = driver.find_elements(By.XPATH,
-                "//button[contains(text(), 'See more')] | //a[contains(text(), 'See more reviews')]")
-            for button in see_more_buttons[:1]:
-                driver.execute_script("arguments[0].click();", button)
-                time.sleep(1)
-        except Exception as e:
-            logger.debug(f"No review expansion or error: {str(e)}")
+    price = smart_extract_price(page)
+    image_url = smart_extract_image(page)
+    availability = extract_availability(page)
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+    review_data = extract_reviews(page)
 
-        title_tag = soup.find("meta", property="og:title")
-        name = clean_html_text(title_tag["content"]) if title_tag else clean_html_text(soup.find("h1").text if soup.find("h1") else "N/A")
+    return {
+        "name": name,
+        "description": description,
+        "price": price,
+        "rating": review_data["overall_rating"],
+        "num_reviews": review_data["num_reviews"],
+        "availability": availability,
+        "image_url": image_url,
+        "reviews": review_data["reviews"]
+    }
 
-        desc_meta = soup.find("meta", attrs={'name': 'description'})
-        description = clean_html_text(desc_meta["content"]) if desc_meta else "N/A"
+# -------------------- SCRAPE ONE PRODUCT --------------------
+REVIEW_CONTAINER_CSS = "div.rd-feedback-service-review-container"
 
-        price = smart_extract_price(soup)
-        image_url = smart_extract_image(soup)
-        availability = "In Stock" if "out of stock" not in soup.get_text().lower() else "Out of Stock"
+def expand_reviews(driver, timeout=3):
+    """Click the first 'See more' control and wait until extra reviews render."""
+    try:
+        see_more_buttons = driver.find_elements(By.XPATH,
+            "//button[contains(text(), 'See more')] | //a[contains(text(), 'See more reviews')]")
+        for button in see_more_buttons[:1]:
+            shown = len(driver.find_elements(By.CSS_SELECTOR, REVIEW_CONTAINER_CSS))
+            driver.execute_script("arguments[0].click();", button)
+            WebDriverWait(driver, timeout).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, REVIEW_CONTAINER_CSS)) > shown
+            )
+    except TimeoutException:
+        logger.debug("No extra reviews appeared after expanding")
+    except Exception as e:
+        logger.debug(f"No review expansion or error: {str(e)}")
 
-        review_data = extract_reviews(soup)
+def scrape_single_product(product_url, deadline=None):
+    """Scrape one product page; skipped once the fan-out batch's ``deadline`` has expired."""
+    deadline = deadline or Deadline()
+    if deadline.expired:
+        logger.warning(f"Deadline passed, skipping {product_url}")
+        return None
+    try:
+        with pooled_driver(timeout=deadline.cap(CHECKOUT_TIMEOUT), platform='reliance') as driver:
+            logger.info(f"Scraping product page: {product_url}")
+            driver.get(product_url)
 
-        product_details = {
-            "name": name,
-            "description": description,
-            "price": price,
-            "rating": review_data["overall_rating"],
-            "num_reviews": review_data["num_reviews"],
-            "availability": availability,
-            "image_url": image_url,
-            "reviews": review_data["reviews"]
-        }
+            WebDriverWait(driver, deadline.cap(10)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
+            )
 
-        logger.info(f"Successfully scraped: {name}")
+            try:
+                WebDriverWait(driver, deadline.cap(5)).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div[class*='rd-feedback-service-review'], div[id='review']"))
+                )
+            except TimeoutException:
+                logger.warning(f"Timeout waiting for review section: {product_url}")
+
+            expand_reviews(driver)
+            page_source = driver.page_source
+
+        if is_blocked_page(page_source):
+            logger.warning(f"Bot-check page served for {product_url}")
+            get_rate_limiter(product_url).on_blocked_page()
+            return None
+        product_details = parse_in_pool('reliance', page_source)
+        logger.info(f"Successfully scraped: {product_details['name']}")
         return (product_details, product_url)
 
     except Exception as e:
         logger.error(f"Failed to scrape {product_url}: {str(e)}")
+        get_rate_limiter(product_url).on_gave_up()
         return None
-    finally:
-        driver.quit()
 
 # -------------------- MAIN SCRAPER WITH CONCURRENCY --------------------
-def scrape_reliance_product_page(product_name, max_threads=4):
+def scrape_reliance_product_page(product_name, max_threads=None):
     logger.info(f"Searching for: {product_name}")
     product_urls = get_reliance_product_urls(product_name)
     if not product_urls:
         logger.warning("No product URLs found")
         return []
 
-    results = []
-    with ThreadPoolExecutor(max_workers=min(max_threads, len(product_urls))) as executor:
-        future_to_url = {executor.submit(scrape_single_product, url): url for url in product_urls}
-        for future in as_completed(future_to_url):
-            result = future.result()
-            if result:
-                results.append(result)
-
-    return results
\ No newline at end of file
+    budget = platform_budget('reliance')
+    return run_with_deadline(
+        scrape_single_product, product_urls,
+        max_threads or budget['fanout'], budget['deadline'], name="reliance",
+    )
@@ -0,0 +1,258 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, connection
+
+from .circuit_breaker import cached_results
+from .query_utils import canonicalize_query
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SINGLE_FLIGHT = {
+    'BACKEND': 'advisory_lock',  # 'advisory_lock' (PostgreSQL), 'cache' (scraper cache) or None: in-process only
+    'WAIT_SECONDS': 120,         # How long a follower waits for the leader's scrape
+}
+POLL_SECONDS = 0.25
+
+
+def _config():
+    return dict(DEFAULT_SINGLE_FLIGHT, **getattr(settings, 'SCRAPER_SINGLE_FLIGHT', {}))
+
+
+def flight_key(platform, query):
+    return f"{platform.lower()}:{canonicalize_query(query)}"
+
+
+# -------------------- CROSS-PROCESS LOCKS --------------------
+class _ProcessLock:
+    """Non-blocking lock shared by every process; ``wait`` polls until the holder lets go."""
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.is_free():
+                return True
+            time.sleep(POLL_SECONDS)
+        return False
+
+
+class _AdvisoryLock(_ProcessLock):
+    """PostgreSQL session-level advisory lock on this thread's connection."""
+
+    def __init__(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).digest()
+        self.lock_id = int.from_bytes(digest[:8], 'big', signed=True)
+
+    def _query(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.lock_id])
+            return cursor.fetchone()[0]
+
+    def acquire(self):
+        return self._query('SELECT pg_try_advisory_lock(%s)')
+
+    def release(self):
+        self._query('SELECT pg_advisory_unlock(%s)')
+
+    def is_free(self):
+        if self.acquire():
+            self.release()
+            return True
+        return False
+
+
+class _CacheLock(_ProcessLock):
+    """Lock entry in the shared scraper cache; expires on its own if the holder dies."""
+
+    def __init__(self, key, timeout):
+        self.cache_key = 'single_flight:' + hashlib.sha1(key.encode('utf-8')).hexdigest()
+        self.token = uuid.uuid4().hex
+        self.timeout = timeout
+
+    def acquire(self):
+        return caches['scraper'].add(self.cache_key, self.token, self.timeout)
+
+    def release(self):
+        if caches['scraper'].get(self.cache_key) == self.token:
+            caches['scraper'].delete(self.cache_key)
+
+    def is_free(self):
+        return caches['scraper'].get(self.cache_key) is None
+
+
+def _process_lock(key, config):
+    if config['BACKEND'] == 'advisory_lock' and connection.vendor == 'postgresql':
+        return _AdvisoryLock(key)
+    if config['BACKEND'] == 'cache':
+        return _CacheLock(key, config['WAIT_SECONDS'])
+    return None
+
+
+# -------------------- SINGLE FLIGHT --------------------
+class _Flight:
+    """One in-process scrape; sync callers block on ``future``, async callers await it."""
+
+    def __init__(self):
+        self.future = concurrent.futures.Future()
+
+
+_flights = {}
+_flights_lock = threading.Lock()
+_stats = {'leaders': 0, 'coalesced': 0, 'waited_on_other_process': 0, 'timeouts': 0}
+
+
+def _count(stat):
+    with _flights_lock:
+        _stats[stat] += 1
+
+
+def _join(key):
+    """``(flight, leader)``: start a new flight for ``key`` or join the one already in the air."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None:
+            _stats['coalesced'] += 1
+            logger.info(f"Joining in-flight {key} scrape")
+            return flight, False
+        flight = _flights[key] = _Flight()
+        _stats['leaders'] += 1
+        return flight, True
+
+
+def _land(key, flight, result=None, error=None):
+    """Hand the leader's result (or error) to everyone on the flight."""
+    with _flights_lock:
+        _flights.pop(key, None)
+    if error is not None:
+        flight.future.set_exception(error)
+    else:
+        flight.future.set_result(result)
+
+
+def _fly(key, flight, platform, query, scrape, config):
+    try:
+        result = _lead(key, platform, query, scrape, config)
+    except BaseException as e:
+        _land(key, flight, error=e)
+    else:
+        _land(key, flight, result)
+
+
+def _fly_in_worker(key, flight, platform, query, scrape, config):
+    try:
+        _fly(key, flight, platform, query, scrape, config)
+    finally:
+        # After the advisory lock is released: closing drops the session that holds it
+        close_old_connections()
+
+
+def single_flight(platform, query, scrape):
+    """Run ``scrape()`` once for concurrent callers of the same (platform, canonical query).
+
+    The first caller leads; callers in this process arriving meanwhile wait for and
+    share its result. Across processes the leader also holds a lock (see
+    settings.SCRAPER_SINGLE_FLIGHT); a process that finds it taken waits for the
+    holder and serves the results it cached (``remember_results``) instead of scraping.
+    """
+    key = flight_key(platform, query)
+    config = _config()
+    flight, leader = _join(key)
+    if leader:
+        _fly(key, flight, platform, query, scrape, config)
+    try:
+        return flight.future.result(timeout=config['WAIT_SECONDS'])
+    except concurrent.futures.TimeoutError:
+        _count('timeouts')
+        logger.warning(f"Timed out waiting for in-flight {key} scrape")
+        return cached_results(platform, query)
+
+
+def _copy_state(future, waiter):
+    if waiter.cancelled():
+        return
+    if future.exception() is not None:
+        waiter.set_exception(future.exception())
+    else:
+        waiter.set_result(future.result())
+
+
+def _waiter(future):
+    """Asyncio future on the running loop that completes with ``future``.
+
+    Unlike ``asyncio.wrap_future``, cancelling it (timeout, client gone) leaves
+    the shared flight alone, and a loop closed in the meantime is simply skipped.
+    """
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+
+    def on_done(done):
+        try:
+            loop.call_soon_threadsafe(_copy_state, done, waiter)
+        except RuntimeError:  # the waiting loop is closed
+            pass
+
+    future.add_done_callback(on_done)
+    return waiter
+
+
+async def single_flight_async(platform, query, scrape, executor):
+    """``single_flight`` for the event loop.
+
+    A leader's scrape runs on ``executor``; followers only await its future on
+    their own loop, so a burst of identical searches takes one executor thread
+    instead of one each. The flight completes even if the leading request goes away.
+    """
+    key = flight_key(platform, query)
+    config = _config()
+    flight, leader = _join(key)
+    if leader:
+        try:
+            executor.submit(_fly_in_worker, key, flight, platform, query, scrape, config)
+        except RuntimeError as e:  # executor shut down
+            _land(key, flight, error=e)
+    try:
+        return await asyncio.wait_for(_waiter(flight.future), config['WAIT_SECONDS'])
+    except asyncio.TimeoutError:
+        _count('timeouts')
+        logger.warning(f"Timed out waiting for in-flight {key} scrape")
+        return await sync_to_async(cached_results)(platform, query)
+
+
+def _lead(key, platform, query, scrape, config):
+    lock = _process_lock(key, config)
+    if lock is None:
+        return scrape()
+    try:
+        acquired = lock.acquire()
+    except Exception as e:
+        logger.warning(f"Single-flight lock unavailable for {key}, scraping anyway: {e}")
+        return scrape()
+
+    if acquired:
+        try:
+            return scrape()
+        finally:
+            try:
+                lock.release()
+            except Exception as e:
+                logger.warning(f"Could not release single-flight lock for {key}: {e}")
+
+    _count('waited_on_other_process')
+    logger.info(f"{key} is being scraped by another process, waiting for its results")
+    if not lock.wait(config['WAIT_SECONDS']):
+        _count('timeouts')
+        logger.warning(f"Timed out waiting for another process to scrape {key}")
+    return cached_results(platform, query)
+
+
+def single_flight_snapshot():
+    with _flights_lock:
+        return dict(_stats, in_flight=sorted(_flights))
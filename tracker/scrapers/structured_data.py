@@ -0,0 +1,161 @@
+import html
+import json
+import logging
+import re
+from functools import cached_property
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# One left-to-right scan over the raw markup. Comments and non-JSON-LD scripts are
+# consumed whole so <meta> strings inside them are never mistaken for tags.
+_TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<meta\b(?P<meta>[^>]*)>'
+    r'|<script\b(?P<script_attrs>[^>]*)>(?P<script_body>.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+_ATTR_RE = re.compile(r'''([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?''')
+_LD_JSON_RE = re.compile(r'''type\s*=\s*["']?application/ld\+json''', re.IGNORECASE)
+
+
+def parse_attributes(attr_text):
+    attrs = {}
+    for match in _ATTR_RE.finditer(attr_text):
+        name = match.group(1).lower()
+        if name in attrs:
+            continue
+        value = next((v for v in match.group(2, 3, 4) if v is not None), '')
+        attrs[name] = html.unescape(value)
+    return attrs
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _has_type(node, type_name):
+    return isinstance(node, dict) and type_name in _as_list(node.get('@type'))
+
+
+class StructuredData:
+    """``<meta>`` tags and JSON-LD blocks pulled from a page without building a DOM."""
+
+    def __init__(self, metas, json_ld_sources):
+        self.metas = metas                      # attribute dicts, in document order
+        self.json_ld_sources = json_ld_sources  # raw script bodies, in document order
+
+    def find_meta(self, **attrs):
+        """First meta tag whose attributes match, like ``soup.find("meta", attrs)``."""
+        for meta in self.metas:
+            if all(meta.get(key) == value for key, value in attrs.items()):
+                return meta
+        return None
+
+    def meta_content(self, **attrs):
+        meta = self.find_meta(**attrs)
+        return meta.get('content') if meta else None
+
+    @cached_property
+    def json_ld(self):
+        """Every parsed JSON-LD object, with ``@graph`` containers flattened."""
+        objects = []
+        for source in self.json_ld_sources:
+            try:
+                data = json.loads(source)
+            except ValueError as e:
+                logger.debug(f"Skipping invalid JSON-LD block: {e}")
+                continue
+            for node in _as_list(data):
+                if isinstance(node, dict) and '@graph' in node:
+                    objects.extend(_as_list(node['@graph']))
+                else:
+                    objects.append(node)
+        return objects
+
+    def of_type(self, type_name):
+        return [node for node in self.json_ld if _has_type(node, type_name)]
+
+    @cached_property
+    def product(self):
+        products = self.of_type('Product')
+        return products[0] if products else None
+
+    def _offer(self):
+        if not self.product:
+            return None
+        offers = _as_list(self.product.get('offers'))
+        for offer in offers:
+            if isinstance(offer, dict):
+                return offer
+        return None
+
+    def product_price(self):
+        """Numeric price string from the JSON-LD Product offer, if any."""
+        offer = self._offer()
+        if not offer:
+            return None
+        price = offer.get('price', offer.get('lowPrice'))
+        if price is None:
+            return None
+        price = str(price).strip()
+        return price if price.replace(",", "").replace(".", "").isdigit() else None
+
+    def product_image(self):
+        if not self.product:
+            return None
+        for image in _as_list(self.product.get('image')):
+            if isinstance(image, dict):
+                image = image.get('url') or image.get('contentUrl')
+            if image:
+                return image
+        return None
+
+    def product_availability(self):
+        """'In Stock' / 'Out of Stock' from schema.org availability, or None."""
+        offer = self._offer()
+        availability = str(offer.get('availability', '')) if offer else ''
+        if not availability:
+            return None
+        return "Out of Stock" if 'OutOfStock' in availability or 'SoldOut' in availability else "In Stock"
+
+
+def extract_structured_data(page_html):
+    metas = []
+    json_ld_sources = []
+    for match in _TOKEN_RE.finditer(page_html or ''):
+        if match.group('meta') is not None:
+            metas.append(parse_attributes(match.group('meta')))
+        elif match.group('script_attrs') is not None and _LD_JSON_RE.search(match.group('script_attrs')):
+            json_ld_sources.append(match.group('script_body').strip())
+    return StructuredData(metas, json_ld_sources)
+
+
+class HtmlPage:
+    """Raw page HTML with a cheap structured-data pre-pass and a lazily built soup.
+
+    Extraction code reads ``page.data`` first and only touches ``page.soup`` for
+    fields the pre-pass could not fill, so the slow html.parser tree is built
+    only when it is really needed.
+    """
+
+    def __init__(self, page_html):
+        self.html = page_html or ''
+
+    @cached_property
+    def data(self):
+        return extract_structured_data(self.html)
+
+    @cached_property
+    def soup(self):
+        return BeautifulSoup(self.html, 'html.parser')
+
+    @property
+    def soup_built(self):
+        return 'soup' in self.__dict__
+
+    def contains(self, marker):
+        return marker in self.html
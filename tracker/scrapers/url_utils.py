@@ -1,67 +1,30 @@
-import requests
-import random
-import time
 import re
 from urllib.parse import quote_plus
 import html
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import logging
 from selenium.common.exceptions import WebDriverException, TimeoutException
-# User-Agent rotation to avoid detection
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.5735.110 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.5481.177 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.5672.124 Safari/537.36",
-]
 
-session = requests.Session()
+from .async_fetch import fetch, fetch_streaming, run_sync
+from .discovery_cache import cached_discovery
+from .driver_pool import pooled_driver
+from .rate_limit import get_rate_limiter
+from .structured_data import extract_structured_data
 
-def init_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-popup-blocking")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.page_load_strategy = 'eager'  # Don't wait for all resources to load
-    return webdriver.Chrome(options=options)
+def fetch_url_with_retries(url, max_retries=5, use_cache=True, stream_to=None):
+    """Blocking wrapper around the asyncio fetch engine for single-URL callers.
 
-def fetch_url_with_retries(url, max_retries=5):
-    delay = 2  # Initial delay
-    for attempt in range(max_retries):
-        headers = {
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Connection": "keep-alive",
-            "Referer": "https://www.google.com/",
-        }
-        try:
-            response = session.get(url, headers=headers, timeout=10)
-            if response.status_code == 503:
-                print(f"⚠️ 503 Error (Attempt {attempt+1}/{max_retries}). Retrying in {delay}s...")
-                time.sleep(delay)
-                delay *= 2  # Exponential backoff
-                continue
-            if response.status_code == 200:
-                return response
-            print(f"❌ Unexpected Status Code: {response.status_code}")
-            return None
-        except requests.exceptions.RequestException as err:
-            print(f"❌ Request Error: {err}")
-            time.sleep(delay)
-            delay *= 2
-    print("❌ Max retries reached. Skipping request.")
-    return None
+    With ``stream_to`` (e.g. ``extractor.streaming(fields)``) the body is fed to
+    it chunk by chunk and the download stops once it has what it needs.
+    """
+    if stream_to is not None:
+        return run_sync(fetch_streaming(url, stream_to, max_retries))
+    return run_sync(fetch(url, max_retries, use_cache))
 
+@cached_discovery('amazon')
 def get_amazon_product_urls(product_name, max_results=5):
     search_url = f"https://www.amazon.in/s?k={quote_plus(product_name)}"
     response = fetch_url_with_retries(search_url)
@@ -78,6 +41,7 @@ def get_amazon_product_urls(product_name, max_results=5):
             break
     return urls
 
+@cached_discovery('flipkart')
 def get_flipkart_product_urls(product_name, max_results=5):
     search_url = f"https://www.flipkart.com/search?q={quote_plus(product_name)}"
     response = fetch_url_with_retries(search_url)
@@ -94,42 +58,31 @@ def get_flipkart_product_urls(product_name, max_results=5):
             break
     return urls
 
+@cached_discovery('reliance')
 def get_reliance_product_urls(product_name, max_results=5):
     search_url = f"https://www.reliancedigital.in/products?q={quote_plus(product_name)}"
     response = fetch_url_with_retries(search_url)
     if not response:
         return []
     
-    # Look for structured JSON-LD data
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Find JSON-LD scripts
-    json_ld_scripts = soup.find_all('script', type='application/ld+json')
+    # Look for structured JSON-LD data without building a DOM
+    data = extract_structured_data(response.text)
     urls = []
     
-    for script in json_ld_scripts:
-        try:
-            # Try to parse the JSON content
-            if script.string and 'ItemList' in script.string:
-                import json
-                data = json.loads(script.string)
+    for node in data.of_type('ItemList'):
+        # Check if this is the product listing JSON
+        for item in node.get('itemListElement') or []:
+            if isinstance(item, dict) and item.get('@type') == 'ListItem' and 'url' in item:
+                # Fix URL by decoding HTML entities
+                url = html.unescape(item['url'])
                 
-                # Check if this is the product listing JSON
-                if data.get('@type') == 'ItemList' and 'itemListElement' in data:
-                    for item in data['itemListElement']:
-                        if item.get('@type') == 'ListItem' and 'url' in item:
-                            # Fix URL by decoding HTML entities
-                            url = html.unescape(item['url'])
-                            
-                            # Make sure it's a full URL
-                            if url.startswith('www.'):
-                                url = 'https://' + url
-                            
-                            urls.append(url)
-                            if len(urls) >= max_results:
-                                return urls
-        except Exception as e:
-            print(f"Error parsing JSON-LD: {e}")
+                # Make sure it's a full URL
+                if url.startswith('www.'):
+                    url = 'https://' + url
+                
+                urls.append(url)
+                if len(urls) >= max_results:
+                    return urls
     
     # Fallback to the original regex method
     if not urls:
@@ -144,26 +97,27 @@ def get_reliance_product_urls(product_name, max_results=5):
     
     return urls
 
+@cached_discovery('croma')
 def get_croma_product_urls(product_name, max_results=5, max_retries=3):
     encoded_product = quote_plus(product_name)
     search_url = f"https://www.croma.com/searchB?q={encoded_product}%3Arelevance&text={encoded_product}"
     print("Search URL:", search_url)
 
-    driver = None
     retry_count = 0
     
     while retry_count < max_retries:
         try:
-            driver = init_driver()
-            driver.get(search_url)
-            
-            # Wait for products to load with increased timeout
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "product-list"))
-            )
-            
-            # Grab the page source after content has been dynamically loaded
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            with pooled_driver(platform='croma') as driver:
+                driver.get(search_url)
+
+                # Wait for products to load with increased timeout
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "product-list"))
+                )
+
+                # Grab the page source after content has been dynamically loaded
+                page_source = driver.page_source
+            soup = BeautifulSoup(page_source, 'html.parser')
             
             urls = []
             seen = set()
@@ -193,6 +147,7 @@ def get_croma_product_urls(product_name, max_results=5, max_retries=3):
             retry_count += 1
             if retry_count == max_retries:
                 print("Max retries reached. Could not load the page.")
+                get_rate_limiter(search_url).on_gave_up()
                 return []
                 
         except Exception as e:
@@ -200,13 +155,7 @@ def get_croma_product_urls(product_name, max_results=5, max_retries=3):
             retry_count += 1
             if retry_count == max_retries:
                 print("Max retries reached. Could not load the page.")
+                get_rate_limiter(search_url).on_gave_up()
                 return []
-                
-        finally:
-            if driver:
-                try:
-                    driver.quit()
-                except Exception as e:
-                    print(f"Error closing driver: {str(e)}")
     
     return []
\ No newline at end of file
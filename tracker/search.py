@@ -0,0 +1,50 @@
+import logging
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import F, Q
+
+from tracker.models import ScrapedProduct
+
+logger = logging.getLogger(__name__)
+
+# Must match the text search config in the tracker_scrapedproduct_search_vector trigger (migration 0009)
+SEARCH_CONFIG = 'english'
+
+
+def search_vector_expression():
+    """What the trigger stores in ScrapedProduct.search_vector: the name weighted above the description."""
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def search_queryset(query, store=None, limit=5):
+    """Best matching products for a search box query, most relevant first.
+
+    On PostgreSQL this is a ranked full-text match on ``search_vector`` (any word
+    order, stemmed) OR'd with a pg_trgm word-similarity match on ``name`` that
+    catches misspellings. Both are served by GIN indexes. Other databases fall
+    back to the old ``name__icontains`` scan.
+    """
+    products = ScrapedProduct.objects.defer('search_vector')
+    if store:
+        products = products.filter(store=store.lower())
+
+    if connection.vendor != 'postgresql':
+        return products.filter(name__icontains=query).order_by('-scraped_at')[:limit]
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return products.annotate(
+        rank=SearchRank(F('search_vector'), search_query),
+        similarity=TrigramWordSimilarity(query, 'name'),
+    ).filter(
+        Q(search_vector=search_query) | Q(name__trigram_word_similar=query)
+    ).order_by('-rank', '-similarity', '-scraped_at')[:limit]
+
+
+def search_products(query, store=None, limit=5):
+    return list(search_queryset(query, store, limit))
@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+
+from tracker.benchmarks.runner import (
+    BENCHMARKS, compare_to_baseline, load_fixtures, percentile, run_benchmarks,
+)
+
+
+class FixtureExtractionTests(SimpleTestCase):
+    """The saved store pages still parse to the fields the scrapers promise."""
+
+    def extract(self, platform, fixture, case):
+        pages = dict(load_fixtures(platform))
+        return BENCHMARKS[platform][case](pages[fixture])
+
+    def test_every_platform_has_fixtures(self):
+        for platform in BENCHMARKS:
+            self.assertTrue(load_fixtures(platform), f"no fixtures for {platform}")
+
+    def test_amazon_product(self):
+        data = self.extract('amazon', 'iphone_15.html', 'extract_product_data')
+        self.assertEqual(data['name'], 'Apple iPhone 15 (128 GB) - Black')
+        self.assertEqual(data['price'], '₹69,900.00')
+        self.assertEqual(data['rating'], '4.4 out of 5 stars')
+        self.assertEqual(data['availability'], 'In stock')
+
+    def test_amazon_out_of_stock(self):
+        data = self.extract('amazon', 'out_of_stock_headphones.html', 'price_refresh')
+        self.assertEqual(data, {'price': 'N/A', 'availability': 'Currently unavailable.'})
+
+    def test_flipkart_product(self):
+        data = self.extract('flipkart', 'iphone_15.html', 'extract_product_data')
+        self.assertEqual(data['name'], 'Apple iPhone 15 (Black, 128 GB)')
+        self.assertEqual(data['price'], '₹69,900')
+        self.assertEqual(data['rating'], '4.6')
+
+    def test_flipkart_sold_out(self):
+        data = self.extract('flipkart', 'sold_out_watch.html', 'price_refresh')
+        self.assertEqual(data, {'price': '₹3,999', 'availability': 'Sold Out'})
+
+    def test_croma_structured_data_and_dom(self):
+        tv = self.extract('croma', 'structured_data_tv.html', 'parse_product_page')
+        self.assertEqual(tv['price'], '₹31990')
+        self.assertEqual(tv['availability'], 'In Stock')
+        laptop = self.extract('croma', 'dom_only_laptop.html', 'parse_product_page')
+        self.assertEqual(laptop['name'], 'HP 15s Intel Core i5 12th Gen Laptop')
+        self.assertEqual(laptop['price'], '₹52,990.00')
+        self.assertEqual(laptop['num_reviews'], '8')
+
+    def test_reliance_structured_data_and_dom(self):
+        fridge = self.extract('reliance', 'structured_data_fridge.html', 'parse_product_page')
+        self.assertEqual(fridge['price'], '₹24490')
+        self.assertEqual(fridge['rating'], '4.1')
+        earbuds = self.extract('reliance', 'dom_only_earbuds.html', 'parse_product_page')
+        self.assertEqual(earbuds['price'], '₹1,299.00')
+        self.assertEqual(earbuds['availability'], 'Out of Stock')
+
+    def test_brand_page(self):
+        data = self.extract('brand', 'nested_price_classes.html', 'parse_brand_page')
+        self.assertEqual(data['name'], 'boAt Rockerz 450 Bluetooth Headphones')
+        self.assertEqual(data['image_url'], 'https://cdn.brand.example/products/rockerz450_main.jpg?v=17')
+
+
+class RunnerTests(SimpleTestCase):
+    def test_percentile_is_nearest_rank(self):
+        ordered = list(range(1, 101))
+        self.assertEqual(percentile(ordered, 50), 50)
+        self.assertEqual(percentile(ordered, 99), 99)
+        self.assertEqual(percentile([7.0], 99), 7.0)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_run_benchmarks_reports_every_case(self):
+        results = run_benchmarks(platforms=['amazon'], iterations=1)
+        self.assertEqual({result.case for result in results}, set(BENCHMARKS['amazon']))
+        for result in results:
+            self.assertEqual(result.pages, len(load_fixtures('amazon')))
+            self.assertGreater(result.pages_per_sec, 0)
+            self.assertGreater(result.peak_kb, 0)
+
+    def test_compare_to_baseline(self):
+        result = run_benchmarks(platforms=['flipkart'], cases=['price_refresh'], iterations=1)[0]
+        baseline = {result.key: {
+            'p50_ms': result.p50_ms * 2, 'pages_per_sec': result.pages_per_sec / 2, 'peak_kb': result.peak_kb,
+        }}
+        change = compare_to_baseline(result, baseline)
+        self.assertAlmostEqual(change['p50'], -0.5)
+        self.assertAlmostEqual(change['pages_per_sec'], 1.0)
+        self.assertAlmostEqual(change['peak_kb'], 0.0)
+        self.assertIsNone(compare_to_baseline(result, {}))
@@ -0,0 +1,193 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker import views
+from tracker.scrapers import circuit_breaker, rate_limit
+from tracker.scrapers.api import ScrapedItem
+from tracker.scrapers.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('tracker.scrapers.circuit_breaker.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('amazon', window=4, min_calls=3, failure_threshold=0.5,
+                                      slow_call_seconds=10, open_seconds=60)
+
+    def test_stays_closed_below_min_calls(self):
+        self.breaker.record(False, 1)
+        self.breaker.record(False, 1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_opens_at_failure_threshold_and_skips(self):
+        self.breaker.record(True, 1)
+        self.breaker.record(False, 1)
+        self.breaker.record(False, 1)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.snapshot()['skipped'], 1)
+
+    def test_slow_calls_count_as_failures(self):
+        for _ in range(3):
+            self.breaker.record(True, 11)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_failures_roll_out_of_the_window(self):
+        self.breaker.record(False, 1)
+        for _ in range(4):
+            self.breaker.record(True, 1)
+        self.assertEqual(self.breaker.snapshot()['failure_rate'], 0.0)
+        self.breaker.record(False, 1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_lets_one_probe_through(self):
+        for _ in range(3):
+            self.breaker.record(False, 1)
+        self.clock.now += 61
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_successful_probe_closes(self):
+        for _ in range(3):
+            self.breaker.record(False, 1)
+        self.clock.now += 61
+        self.breaker.allow_request()
+        self.breaker.record(True, 1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()['calls'], 0)
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record(False, 1)
+        self.clock.now += 61
+        self.breaker.allow_request()
+        self.breaker.record(False, 1)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.clock.now += 61
+        self.assertTrue(self.breaker.allow_request())
+
+
+class ScrapeOutcomeTests(SimpleTestCase):
+    """What the search path reports to the breaker for each kind of scrape outcome."""
+
+    def setUp(self):
+        for patcher in (mock.patch.dict(circuit_breaker._breakers, clear=True),
+                        mock.patch.dict(rate_limit._limiters, clear=True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.breaker = circuit_breaker.get_circuit_breaker('flipkart')
+
+    def scrape(self, side_effect):
+        with mock.patch.object(views, 'scrape_platform', side_effect=side_effect), \
+                mock.patch.object(views, 'remember_results'):
+            return views._scrape_and_store('flipkart', 'some niche query')
+
+    def outcomes(self):
+        return [ok for ok, _ in self.breaker._calls]
+
+    def item(self, name='Watch', price='₹3,999'):
+        return ScrapedItem('flipkart', 'https://www.flipkart.com/x/p/itm1', name=name, price=price)
+
+    def test_empty_result_is_a_failure(self):
+        for _ in range(5):
+            self.assertEqual(self.scrape(lambda platform, query: []), [])
+        self.assertEqual(self.outcomes(), [False] * 5)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_all_na_result_is_a_failure(self):
+        # What the scrapers return once the store's markup has changed under the selectors
+        with mock.patch.object(views, 'ingest_scraped_items'):
+            self.scrape(lambda platform, query: [self.item(name='N/A', price='N/A'), self.item(price='N/A')])
+        self.assertEqual(self.outcomes(), [False])
+
+    def test_results_are_a_success(self):
+        with mock.patch.object(views, 'ingest_scraped_items'):
+            results = self.scrape(lambda platform, query: [self.item(), self.item(price='N/A')])
+        self.assertEqual(results[0]['product_name'], 'Watch')
+        self.assertEqual(self.outcomes(), [True])
+
+    def test_exception_is_a_failure(self):
+        self.assertEqual(self.scrape(RuntimeError('driver crashed')), [])
+        self.assertEqual(self.outcomes(), [False])
+
+    def test_block_page_is_a_failure(self):
+        def blocked(platform, query):
+            rate_limit.get_rate_limiter('https://www.flipkart.com/search?q=x').on_blocked_page()
+            return [self.item()]
+
+        with mock.patch.object(views, 'ingest_scraped_items'):
+            for _ in range(5):
+                self.scrape(blocked)
+        self.assertEqual(self.outcomes(), [False] * 5)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_given_up_fetch_is_a_failure(self):
+        def partly_failed(platform, query):
+            # One product page ran out of retries; the others still came back
+            rate_limit.get_rate_limiter('https://www.flipkart.com/x/p/itm2').on_gave_up()
+            return [self.item()]
+
+        with mock.patch.object(views, 'ingest_scraped_items'):
+            self.scrape(partly_failed)
+        self.assertEqual(self.outcomes(), [False])
+
+
+@override_settings(SCRAPER_RATE_LIMITS={'default': {'rate': 100.0, 'min_rate': 100.0, 'burst': 10}})
+class GiveUpCountTests(SimpleTestCase):
+    """Failures the scrapers swallow still reach the platform's failure count."""
+
+    def setUp(self):
+        patcher = mock.patch.dict(rate_limit._limiters, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetch_out_of_retries(self):
+        from aiohttp import web
+
+        from tracker.scrapers.async_fetch import AsyncFetcher
+
+        async def unavailable(request):
+            return web.Response(status=503)
+
+        async def run():
+            app = web.Application()
+            app.router.add_get('/s', unavailable)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            fetcher = AsyncFetcher()
+            try:
+                return await fetcher.fetch(f'http://127.0.0.1:{port}/s', max_retries=2, use_cache=False)
+            finally:
+                await fetcher.close()
+                await runner.cleanup()
+
+        self.assertIsNone(asyncio.run(run()))
+        self.assertEqual(rate_limit.failure_count('127.0.0.1'), 1)
+
+    def test_croma_discovery_timeouts(self):
+        from selenium.common.exceptions import TimeoutException
+
+        from tracker.scrapers import url_utils
+
+        with mock.patch.object(url_utils, 'pooled_driver', side_effect=TimeoutException('search page')):
+            urls = url_utils.get_croma_product_urls.__wrapped__('tv', 5, max_retries=3)
+        self.assertEqual(urls, [])
+        self.assertEqual(rate_limit.failure_count('croma'), 1)
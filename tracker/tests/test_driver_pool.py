@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker.scrapers import driver_pool
+from tracker.scrapers.driver_pool import BLOCK_CATEGORIES, DriverPool, blocked_url_patterns
+
+
+class FakeDriver:
+    def __init__(self):
+        self.pages_loaded = 0
+        self.blocked = None
+        self.quit_called = False
+
+    def block_resources(self, patterns):
+        self.blocked = patterns
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@override_settings(SCRAPER_RESOURCE_BLOCKING={'default': ['images', 'fonts'], 'brand': ['fonts']})
+class ResourceBlockingTests(SimpleTestCase):
+    def test_patterns_per_platform(self):
+        self.assertEqual(blocked_url_patterns('amazon'), BLOCK_CATEGORIES['images'] + BLOCK_CATEGORIES['fonts'])
+        self.assertEqual(blocked_url_patterns('brand'), BLOCK_CATEGORIES['fonts'])
+
+    def test_checkout_applies_the_platform_policy(self):
+        pool = DriverPool(max_size=1, factory=FakeDriver)
+        with mock.patch.object(driver_pool.webdriver.Chrome, 'get'):
+            with pool.driver(platform='croma') as driver:
+                self.assertIn('*.jpg*', driver.blocked)
+            # Same browser, next checkout for a platform that needs images
+            with pool.driver(platform='brand') as same_driver:
+                self.assertIs(same_driver, driver)
+                self.assertNotIn('*.jpg*', driver.blocked)
+
+    def test_no_startup_image_pref(self):
+        # Images are switched off per checkout only, so a platform's policy can turn them back on
+        with mock.patch.object(driver_pool, 'PooledChrome') as chrome:
+            driver_pool.create_driver()
+        options = chrome.call_args.kwargs['options']
+        self.assertNotIn('prefs', options.experimental_options)
+
+
+class DriverPoolTests(SimpleTestCase):
+    def test_size_bound(self):
+        pool = DriverPool(max_size=1, factory=FakeDriver)
+        pool.checkout()
+        with self.assertRaises(TimeoutError):
+            pool.checkout(timeout=0.01)
+
+    def test_recycles_after_max_pages(self):
+        pool = DriverPool(max_size=1, max_pages=2, factory=FakeDriver)
+        driver = pool.checkout()
+        driver.pages_loaded = 2
+        pool.checkin(driver)
+        self.assertTrue(driver.quit_called)
+        self.assertIsNot(pool.checkout(), driver)
@@ -0,0 +1,146 @@
+from django.test import SimpleTestCase
+from selectorlib import Extractor
+
+from tracker.benchmarks.runner import load_fixtures
+from tracker.scrapers.amazon import AMAZON_SELECTORS
+from tracker.scrapers.extractors import CompiledExtractor, is_single_step
+from tracker.scrapers.flipkart import FLIPKART_SELECTORS
+
+PRICE_FIELDS = ['price', 'availability']
+CHUNK_SIZE = 16 * 1024
+
+
+def padded(page_html, filler_bytes=1024 * 1024):
+    """The page with a long tail of markup after the product block, like real product pages."""
+    filler = '<div class="recs"><a href="/dp/X">related product</a></div>' * (filler_bytes // 60)
+    return page_html.replace('</body>', filler + '</body>').encode('utf-8')
+
+
+def chunks(body, size=CHUNK_SIZE):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class CompiledExtractorTests(SimpleTestCase):
+    def test_matches_selectorlib_on_store_fixtures(self):
+        for platform, selectors in [('amazon', AMAZON_SELECTORS), ('flipkart', FLIPKART_SELECTORS)]:
+            reference = Extractor.from_yaml_string(selectors)
+            compiled = CompiledExtractor.from_yaml_string(selectors)
+            for name, page_html in load_fixtures(platform):
+                with self.subTest(platform=platform, fixture=name):
+                    self.assertEqual(compiled.extract(page_html), reference.extract(page_html))
+
+    def test_field_subset(self):
+        compiled = CompiledExtractor.from_yaml_string(AMAZON_SELECTORS)
+        page_html = dict(load_fixtures('amazon'))['iphone_15.html']
+        self.assertEqual(compiled.extract(page_html, fields=PRICE_FIELDS),
+                         {'price': '₹69,900.00', 'availability': 'In stock'})
+
+    def test_empty_page(self):
+        compiled = CompiledExtractor.from_yaml_string(AMAZON_SELECTORS)
+        self.assertEqual(compiled.extract('', fields=PRICE_FIELDS), {'price': None, 'availability': None})
+
+    def test_is_single_step(self):
+        self.assertTrue(is_single_step("descendant-or-self::span[@id = 'productTitle']"))
+        self.assertFalse(is_single_step("descendant-or-self::span/descendant-or-self::*/span"))
+        self.assertTrue(is_single_step("descendant-or-self::a[contains(@href, 'a/b|c')]"))
+
+
+class StreamingExtractionTests(SimpleTestCase):
+    def setUp(self):
+        self.extractor = CompiledExtractor.from_yaml_string(AMAZON_SELECTORS)
+        self.body = padded(dict(load_fixtures('amazon'))['iphone_15.html'])
+
+    def feed_until_done(self, stream):
+        for chunk in chunks(self.body):
+            if stream.feed(chunk):
+                return True
+        return False
+
+    def test_stops_early_once_fields_are_resolved(self):
+        stream = self.extractor.streaming(PRICE_FIELDS)
+        self.assertTrue(self.feed_until_done(stream))
+        self.assertLess(stream.bytes_fed, len(self.body) // 4)
+        self.assertEqual(stream.result(), self.extractor.extract(self.body.decode('utf-8'), fields=PRICE_FIELDS))
+
+    def test_multiple_fields_need_the_whole_page(self):
+        stream = self.extractor.streaming(['price', 'reviews'])
+        self.assertFalse(self.feed_until_done(stream))
+        self.assertEqual(stream.bytes_fed, len(self.body))
+        self.assertTrue(stream.result()['reviews'])
+
+    def test_reset_starts_over(self):
+        stream = self.extractor.streaming(PRICE_FIELDS)
+        stream.feed(self.body[:CHUNK_SIZE])
+        stream.reset()
+        self.assertEqual(stream.bytes_fed, 0)
+        self.assertTrue(self.feed_until_done(stream))
+        self.assertEqual(stream.result()['price'], '₹69,900.00')
+
+    def test_result_can_be_read_twice(self):
+        stream = self.extractor.streaming(PRICE_FIELDS)
+        self.feed_until_done(stream)
+        first = stream.result()
+        self.assertEqual(first['price'], '₹69,900.00')
+        self.assertEqual(stream.result(), first)
+
+
+class StreamingFetchTests(SimpleTestCase):
+    """fetch_streaming parses chunks off the shared engine loop and hangs up early."""
+
+    def test_feed_runs_off_the_event_loop(self):
+        import asyncio
+        import threading
+
+        from aiohttp import web
+
+        from tracker.scrapers.async_fetch import AsyncFetcher
+
+        body = padded(dict(load_fixtures('amazon'))['iphone_15.html'])
+        extractor = CompiledExtractor.from_yaml_string(AMAZON_SELECTORS)
+
+        class RecordingStream:
+            def __init__(self):
+                self.stream = extractor.streaming(PRICE_FIELDS)
+                self.threads = set()
+
+            def reset(self):
+                self.stream.reset()
+
+            def feed(self, chunk):
+                self.threads.add(threading.get_ident())
+                return self.stream.feed(chunk)
+
+            def result(self):
+                self.threads.add(threading.get_ident())
+                return self.stream.result()
+
+        async def handler(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/html; charset=utf-8'})
+            await response.prepare(request)
+            for chunk in chunks(body):
+                await response.write(chunk)
+            return response
+
+        async def run():
+            app = web.Application()
+            app.router.add_get('/dp/B0CHX1W1XY', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            fetcher = AsyncFetcher()
+            consumer = RecordingStream()
+            try:
+                response = await fetcher.fetch_streaming(f'http://127.0.0.1:{port}/dp/B0CHX1W1XY', consumer, 1)
+            finally:
+                await fetcher.close()
+                await runner.cleanup()
+            return response, consumer, threading.get_ident()
+
+        response, consumer, loop_thread = asyncio.run(run())
+        self.assertTrue(response.truncated)
+        # Every parse step on one thread (lxml parsers are thread-bound), and not the loop's
+        self.assertEqual(len(consumer.threads), 1)
+        self.assertNotIn(loop_thread, consumer.threads)
+        self.assertEqual(consumer.stream.result()['price'], '₹69,900.00')
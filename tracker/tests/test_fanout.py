@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+from selenium.common.exceptions import TimeoutException
+
+from tracker.scrapers import croma, reliance
+from tracker.scrapers.fanout import Deadline, run_with_deadline
+
+
+class DeadlineTests(SimpleTestCase):
+    def test_unbounded_deadline_never_expires(self):
+        deadline = Deadline()
+        self.assertFalse(deadline.expired)
+        self.assertEqual(deadline.cap(20), 20)
+
+    def test_cap_and_expiry(self):
+        deadline = Deadline(0.05)
+        self.assertLessEqual(deadline.cap(20), 0.05)
+        self.assertFalse(deadline.sleep(1))
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.cap(20), 0.0)
+
+    def test_cancel_wakes_sleepers(self):
+        deadline = Deadline(60)
+        threading.Timer(0.05, deadline.cancel).start()
+        started = time.monotonic()
+        self.assertFalse(deadline.sleep(30))
+        self.assertLess(time.monotonic() - started, 5)
+
+
+class RunWithDeadlineTests(SimpleTestCase):
+    def test_partial_results_in_order(self):
+        def work(item, deadline):
+            if item == 'slow':
+                deadline.sleep(30)
+                return None
+            return item.upper()
+
+        started = time.monotonic()
+        results = run_with_deadline(work, ['a', 'slow', 'b', None], fanout=4, deadline=0.2)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(results, ['A', 'B'])
+
+    def test_abandoned_workers_stop_before_their_next_attempt(self):
+        attempts = []
+        stopped = threading.Event()
+
+        def retrying(item, deadline):
+            while not deadline.expired:
+                attempts.append(item)
+                deadline.sleep(0.05)
+            stopped.set()
+
+        run_with_deadline(retrying, ['x'], fanout=1, deadline=0.2)
+        self.assertTrue(stopped.wait(2), "abandoned worker kept retrying after the deadline")
+        count = len(attempts)
+        time.sleep(0.2)
+        self.assertEqual(len(attempts), count)
+
+
+class SeleniumScraperDeadlineTests(SimpleTestCase):
+    """Abandoned Croma/Reliance workers must not check out (or keep retrying for) a pooled driver."""
+
+    def test_croma_stops_retrying_once_the_deadline_passes(self):
+        with mock.patch.object(croma, 'pooled_driver', side_effect=TimeoutException('page load')) as pooled:
+            started = time.monotonic()
+            self.assertIsNone(croma.scrape_single_product('https://www.croma.com/x/p/1', 3, Deadline(0.1)))
+        # One attempt; the 2s retry sleep is cut short and no second checkout happens
+        self.assertEqual(pooled.call_count, 1)
+        self.assertLess(time.monotonic() - started, 1.5)
+
+    def test_croma_checkout_wait_is_capped_by_the_deadline(self):
+        with mock.patch.object(croma, 'pooled_driver', side_effect=TimeoutError('pool busy')) as pooled:
+            croma.scrape_single_product('https://www.croma.com/x/p/1', 1, Deadline(5))
+        self.assertLessEqual(pooled.call_args.kwargs['timeout'], 5)
+
+    def test_expired_deadline_skips_checkout(self):
+        deadline = Deadline(60)
+        deadline.cancel()
+        with mock.patch.object(croma, 'pooled_driver') as croma_pool, \
+                mock.patch.object(reliance, 'pooled_driver') as reliance_pool:
+            self.assertIsNone(croma.scrape_single_product('https://www.croma.com/x/p/1', 3, deadline))
+            self.assertIsNone(reliance.scrape_single_product('https://www.reliancedigital.in/product/1', deadline))
+        croma_pool.assert_not_called()
+        reliance_pool.assert_not_called()
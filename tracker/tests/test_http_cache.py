@@ -0,0 +1,101 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from tracker.scrapers.http_cache import HttpCache, classify_url, is_blocked_page
+
+PRODUCT_URL = 'https://www.amazon.in/dp/B0CHX1W1XY'
+SEARCH_URL = 'https://www.amazon.in/s?k=iphone+15'
+
+
+class HttpCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = HttpCache(self.tmp.name, ttls={'search': 60, 'product': 600})
+
+    def page(self, n, size=2000):
+        # Incompressible-ish bodies so blob sizes are predictable enough to bound
+        return f"<html>{n}</html>" + ''.join(chr(0x4e00 + (n * 7919 + i * 104729) % 20000) for i in range(size))
+
+    def test_classify_url(self):
+        self.assertEqual(classify_url(SEARCH_URL), 'search')
+        self.assertEqual(classify_url(PRODUCT_URL), 'product')
+        self.assertEqual(classify_url('https://example.com/'), 'default')
+
+    def test_round_trip_and_freshness_by_url_class(self):
+        self.cache.store(SEARCH_URL, 'search page', {'ETag': '"s1"'})
+        self.cache.store(PRODUCT_URL, 'product page', {})
+        entry, text = self.cache.lookup(SEARCH_URL)
+        self.assertEqual(text, 'search page')
+        self.assertEqual(entry.etag, '"s1"')
+        self.assertTrue(self.cache.is_fresh(entry))
+
+        later = time.time() + 120  # past the search TTL, inside the product TTL
+        with mock.patch('tracker.scrapers.http_cache.time.time', return_value=later):
+            self.assertFalse(self.cache.is_fresh(self.cache.lookup(SEARCH_URL)[0]))
+            self.assertTrue(self.cache.is_fresh(self.cache.lookup(PRODUCT_URL)[0]))
+
+    def test_revalidate_makes_entry_fresh_again(self):
+        self.cache.store(SEARCH_URL, 'search page', {'ETag': '"s1"'})
+        later = time.time() + 120
+        with mock.patch('tracker.scrapers.http_cache.time.time', return_value=later):
+            entry, _ = self.cache.lookup(SEARCH_URL)
+            self.cache.revalidate(entry, {'ETag': '"s2"'})
+            entry, text = self.cache.lookup(SEARCH_URL)
+            self.assertTrue(self.cache.is_fresh(entry))
+        self.assertEqual((entry.etag, text), ('"s2"', 'search page'))
+        self.assertEqual(self.cache.stats()['revalidated'], 1)
+
+    def test_other_processes_share_the_index(self):
+        other = HttpCache(self.tmp.name)
+        self.cache.store(PRODUCT_URL, 'written by worker 1', {})
+        self.assertEqual(other.lookup(PRODUCT_URL)[1], 'written by worker 1')
+        self.assertEqual(other.stats()['entries'], 1)
+
+    def test_shared_blob_survives_replacement_in_another_process(self):
+        other = HttpCache(self.tmp.name)
+        self.cache.store(PRODUCT_URL, 'same body', {})
+        other.store(PRODUCT_URL + '?th=1', 'same body', {})
+        self.cache.store(PRODUCT_URL, 'new body', {})
+        self.assertEqual(other.lookup(PRODUCT_URL + '?th=1')[1], 'same body')
+        self.assertEqual(other.lookup(PRODUCT_URL)[1], 'new body')
+
+    def test_lru_eviction_bounds_total_size_across_instances(self):
+        first = self.page(0)
+        self.cache.store(PRODUCT_URL + '0', first, {})
+        blob_size = self.cache.stats()['bytes']
+        cache = HttpCache(self.tmp.name, max_bytes=int(blob_size * 3.5))
+        other = HttpCache(self.tmp.name, max_bytes=int(blob_size * 3.5))
+        base = time.time()
+        for n in range(1, 6):
+            with mock.patch('tracker.scrapers.http_cache.time.time', return_value=base + n):
+                (cache if n % 2 else other).store(PRODUCT_URL + str(n), self.page(n), {})
+            if n == 3:
+                with mock.patch('tracker.scrapers.http_cache.time.time', return_value=base + 3.5):
+                    cache.lookup(PRODUCT_URL + '1')  # touch: 1 is now more recent than 2 and 3
+
+        self.assertLessEqual(cache.stats()['bytes'], cache.max_bytes)
+        self.assertIsNone(cache.lookup(PRODUCT_URL + '0'))
+        self.assertIsNone(cache.lookup(PRODUCT_URL + '2'))
+        self.assertIsNone(cache.lookup(PRODUCT_URL + '3'))
+        self.assertIsNotNone(cache.lookup(PRODUCT_URL + '1'))
+        self.assertIsNotNone(cache.lookup(PRODUCT_URL + '4'))
+        self.assertIsNotNone(cache.lookup(PRODUCT_URL + '5'))
+
+    def test_block_pages_are_not_cached(self):
+        robot_check = '<html><form action="/errors/validateCaptcha">Enter the characters you see below</form></html>'
+        self.assertTrue(is_blocked_page(robot_check))
+        self.assertFalse(self.cache.store(PRODUCT_URL, robot_check, {}))
+        self.assertIsNone(self.cache.lookup(PRODUCT_URL))
+        self.assertEqual(self.cache.stats()['blocked_not_cached'], 1)
+
+    def test_missing_blob_is_a_miss(self):
+        self.cache.store(PRODUCT_URL, 'product page', {})
+        entry, _ = self.cache.lookup(PRODUCT_URL)
+        os.remove(self.cache._blob_path(entry.body_hash))
+        self.assertIsNone(self.cache.lookup(PRODUCT_URL))
+        self.assertEqual(self.cache.stats()['entries'], 0)
@@ -0,0 +1,102 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from tracker import ingest
+from tracker.ingest import ingest_scraped_items, ingest_tracked_prices
+from tracker.models import AmazonProduct, PriceHistory, PriceOfProductsHistory, ScrapedProduct
+from tracker.scrapers.api import ScrapedItem
+
+
+class IngestScrapedItemsTests(TestCase):
+    def setUp(self):
+        # Review analysis is not under test here
+        patcher = mock.patch.object(ingest, '_post_batch_hooks', [])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def item(self, n, price, name=None):
+        return ScrapedItem('croma', f'https://www.croma.com/p/{n}', name=name or f'TV {n}', price=price,
+                           image_url=f'https://img.croma.com/{n}.jpg', rating='4.3')
+
+    def test_inserts_products_prices_and_latest_price(self):
+        result = ingest_scraped_items('Croma', [self.item(1, '₹31,990.00'), self.item(2, 'N/A')])
+
+        self.assertEqual((result.products, result.prices, result.changed), (2, 1, 2))
+        tv = ScrapedProduct.objects.get(url='https://www.croma.com/p/1')
+        self.assertEqual((tv.store, tv.rating, tv.latest_price), ('croma', Decimal('4.3'), Decimal('31990.00')))
+        self.assertIsNotNone(tv.latest_price_at)
+        self.assertIsNone(ScrapedProduct.objects.get(url='https://www.croma.com/p/2').latest_price)
+        self.assertEqual(PriceOfProductsHistory.objects.count(), 1)
+
+    def test_rescrape_updates_in_place(self):
+        ingest_scraped_items('croma', [self.item(1, '₹31,990')])
+        first = ScrapedProduct.objects.get()
+
+        result = ingest_scraped_items('croma', [self.item(1, '₹29,990')])
+        self.assertEqual((result.products, result.prices, result.changed), (0, 1, 0))
+        product = ScrapedProduct.objects.get()
+        self.assertEqual(product.pk, first.pk)
+        self.assertEqual(product.latest_price, Decimal('29990'))
+        self.assertEqual(
+            list(PriceOfProductsHistory.objects.order_by('pk').values_list('price', flat=True)),
+            [Decimal('31990'), Decimal('29990')],
+        )
+
+        result = ingest_scraped_items('croma', [self.item(1, '₹29,990', name='TV 1 (2024)')])
+        self.assertEqual(result.changed, 1)
+        self.assertEqual(ScrapedProduct.objects.get().name, 'TV 1 (2024)')
+
+    def test_duplicate_url_in_batch_keeps_last_scrape(self):
+        ingest_scraped_items('croma', [self.item(1, '₹100'), self.item(1, '₹90')])
+        self.assertEqual(ScrapedProduct.objects.get().latest_price, Decimal('90'))
+        self.assertEqual(PriceOfProductsHistory.objects.count(), 1)
+
+    def test_oversized_row_is_skipped_not_rolled_back(self):
+        too_long = self.item(2, '₹29,990')
+        too_long.url += '/' + 'x' * 1000
+        result = ingest_scraped_items('croma', [
+            self.item(1, '₹31,990', name='TV ' * 300),  # Truncated to the column, still stored
+            too_long,
+            self.item(3, '₹1' + '0' * 12),               # Price beyond max_digits
+            self.item(4, '₹999'),
+        ])
+
+        self.assertEqual((result.products, result.prices), (2, 2))
+        self.assertEqual(
+            sorted(ScrapedProduct.objects.values_list('url', flat=True)),
+            ['https://www.croma.com/p/1', 'https://www.croma.com/p/4'],
+        )
+        self.assertEqual(len(ScrapedProduct.objects.get(url='https://www.croma.com/p/1').name), 500)
+
+    def test_missing_image_is_stored_blank(self):
+        item = self.item(1, '₹31,990')
+        item.image_url = 'N/A'
+        ingest_scraped_items('croma', [item])
+        self.assertEqual(ScrapedProduct.objects.get().image_url, '')
+
+
+class IngestTrackedPricesTests(TestCase):
+    def item(self, asin, price, url=None, image_url='https://m.media-amazon.com/images/I/phone.jpg'):
+        return ScrapedItem('amazon', url or f'https://www.amazon.in/dp/{asin}', name='Phone', price=price,
+                           image_url=image_url)
+
+    def test_item_without_image_is_tracked(self):
+        # parse_product_data reports a missing image as 'N/A'
+        result = ingest_tracked_prices('amazon', [self.item('B0CHX1W1XY', '₹69,900.00', image_url='N/A')])
+
+        self.assertEqual(result.products, 1)
+        self.assertEqual(AmazonProduct.objects.get().image_url, '')
+        self.assertEqual(PriceHistory.objects.get().price, Decimal('69900.00'))
+
+    def test_bad_row_is_skipped_not_rolled_back(self):
+        result = ingest_tracked_prices('amazon', [
+            self.item('B0CHX1W1XY', '₹69,900.00'),
+            self.item('B0CHX2F5QT', '₹1' + '0' * 12),                              # beyond max_digits
+            self.item('B0CHX3QBCH', '₹79,900', url='https://www.amazon.in/dp/B0CHX3QBCH?' + 'x' * 300),
+        ])
+
+        self.assertEqual(result.products, 1)
+        self.assertEqual(list(AmazonProduct.objects.values_list('asin', flat=True)), ['B0CHX1W1XY'])
+        self.assertEqual(PriceHistory.objects.get().price, Decimal('69900.00'))
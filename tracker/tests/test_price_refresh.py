@@ -0,0 +1,36 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from tracker.management.commands import update_tracked_prices
+from tracker.models import FlipkartProduct, PriceHistory, TrackedProduct
+
+
+class RefreshKnownProductsTests(TestCase):
+    def setUp(self):
+        self.tracked = TrackedProduct.objects.create(name='Watch', user=User.objects.create(username='shopper'))
+        self.product = FlipkartProduct.objects.create(
+            flipkart_id='WATGZ7FHYHZ', name='Noise Watch', url='https://www.flipkart.com/noise-watch/p/itm1',
+            current_price=Decimal('4499'),
+        )
+
+    def refresh(self, price):
+        fields = {'price': price, 'availability': 'In stock'}
+        with mock.patch.object(update_tracked_prices, 'refresh_prices', return_value={self.product.url: fields}):
+            return update_tracked_prices.Command(stdout=StringIO()).refresh_known_products(self.tracked)
+
+    def test_flipkart_strikethrough_price(self):
+        # Flipkart's price text carries the old price and discount after the current one
+        self.assertTrue(self.refresh('₹3,999 ₹5,999 33% off'))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.current_price, Decimal('3999'))
+        self.assertEqual(PriceHistory.objects.get().price, Decimal('3999'))
+
+    def test_missing_price_leaves_product_alone(self):
+        self.assertFalse(self.refresh('N/A'))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.current_price, Decimal('4499'))
+        self.assertFalse(PriceHistory.objects.exists())
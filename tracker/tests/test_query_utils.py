@@ -0,0 +1,78 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from tracker.models import QuerySynonym, TrackedProduct
+from tracker.scrapers import query_utils
+from tracker.scrapers.query_utils import canonicalize_query, query_collapse_snapshot, record_query
+
+
+@override_settings(QUERY_CANONICALIZER={'SYNONYMS': False, 'TRACKED_KEYS': 3})
+class CanonicalizeQueryTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(query_utils, '_query_stats', query_utils.OrderedDict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_spellings_collapse_to_one_key(self):
+        keys = {canonicalize_query(q) for q in (
+            'iPhone 15 128GB', 'iphone 15 128 gb', 'Apple iPhone 15 (128 Gigabytes)', 'buy iphone 15 128gb online',
+        )}
+        self.assertEqual(keys, {'128gb 15 iphone'})
+
+    def test_units(self):
+        self.assertEqual(canonicalize_query('Galaxy S24 6.2" 4000 mAh'), '4000mah 6.2in galaxy s24')
+        self.assertEqual(canonicalize_query('Bravia 55 inches 120 Hz'), '120hz 55in bravia')
+
+    def test_brands(self):
+        self.assertEqual(canonicalize_query('One Plus Nord CE4'), 'ce4 nord')
+        self.assertEqual(canonicalize_query('Mi 11X'), '11x xiaomi')
+        self.assertEqual(canonicalize_query('1+ 12R'), '12r oneplus')
+
+    def test_stopword_only_query_keeps_its_tokens(self):
+        self.assertEqual(canonicalize_query('The Best'), 'best the')
+        self.assertEqual(canonicalize_query(''), '')
+
+    def test_record_query_counts_variants(self):
+        record_query('iPhone 15')
+        record_query('apple  iphone 15')
+        record_query('iphone 15')
+        snapshot = query_collapse_snapshot()
+        self.assertEqual((snapshot['queries'], snapshot['raw_spellings'], snapshot['canonical_keys']), (3, 3, 1))
+        self.assertEqual(snapshot['top'][0]['key'], '15 iphone')
+        self.assertIn('apple iphone 15', snapshot['top'][0]['variants'])
+
+    def test_tracked_keys_are_bounded(self):
+        for query in ('tv', 'fridge', 'laptop', 'earbuds'):
+            record_query(query)
+        snapshot = query_collapse_snapshot()
+        self.assertEqual(snapshot['canonical_keys'], 3)
+        self.assertNotIn('tv', [entry['key'] for entry in snapshot['top']])
+
+
+class QuerySynonymTests(TestCase):
+    def setUp(self):
+        query_utils.clear_synonym_cache()
+        self.addCleanup(query_utils.clear_synonym_cache)
+
+    def test_synonyms_apply_and_reload_on_save(self):
+        self.assertEqual(canonicalize_query('ip15'), 'ip15')
+        QuerySynonym.objects.create(phrase='ip15', canonical='iphone 15')
+        self.assertEqual(canonicalize_query('IP15 128gb'), '128gb 15 iphone')
+        QuerySynonym.objects.all().delete()
+        self.assertEqual(canonicalize_query('ip15'), 'ip15')
+
+    def test_recanonicalize_tracked_products(self):
+        user = User.objects.create(username='shopper')
+        tracked = TrackedProduct.objects.create(name='ip15 pro', user=user)
+        self.assertEqual(tracked.canonical_name, 'ip15 pro')
+
+        QuerySynonym.objects.create(phrase='ip15', canonical='iphone 15')
+        out = StringIO()
+        call_command('recanonicalize_tracked_products', stdout=out)
+        tracked.refresh_from_db()
+        self.assertEqual(tracked.canonical_name, '15 iphone pro')
+        self.assertIn('Re-keyed 1 of 1', out.getvalue())
@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker.scrapers import rate_limit
+from tracker.scrapers.rate_limit import HostRateLimiter, get_rate_limiter, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class HostRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('tracker.scrapers.rate_limit.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = HostRateLimiter('www.amazon.in', rate=2.0, burst=2, min_rate=0.5,
+                                       max_rate=3.0, increase=0.5, decrease=0.5)
+
+    def test_burst_then_queue_in_order(self):
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        # Bucket empty: each further caller waits one more refill interval (1 / 2 req/s)
+        self.assertAlmostEqual(self.limiter.reserve(), 0.5)
+        self.assertAlmostEqual(self.limiter.reserve(), 1.0)
+
+    def test_tokens_refill_over_time_up_to_burst(self):
+        for _ in range(2):
+            self.limiter.reserve()
+        self.clock.now += 10
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        self.assertGreater(self.limiter.reserve(), 0.0)
+
+    def test_success_increases_rate_additively_up_to_max(self):
+        self.limiter.on_success()
+        self.assertEqual(self.limiter.rate, 2.5)
+        for _ in range(5):
+            self.limiter.on_success()
+        self.assertEqual(self.limiter.rate, 3.0)
+
+    def test_throttle_cuts_rate_and_drops_saved_burst(self):
+        self.limiter.on_throttle()
+        self.assertEqual(self.limiter.rate, 1.0)
+        # No burst left: the next caller waits a full interval at the new rate
+        self.assertAlmostEqual(self.limiter.reserve(), 1.0)
+        for _ in range(5):
+            self.limiter.on_throttle()
+        self.assertEqual(self.limiter.rate, 0.5)
+
+    def test_retry_after_blocks_every_caller(self):
+        self.limiter.on_throttle(retry_after=30)
+        self.assertAlmostEqual(self.limiter.reserve(), 30.0)
+        self.clock.now += 31
+        self.assertEqual(self.limiter.reserve(), 0.0)
+        self.assertEqual(self.limiter.snapshot()['blocked_for'], 0.0)
+
+
+class RateLimiterRegistryTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(rate_limit._limiters, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(SCRAPER_RATE_LIMITS={'default': {'rate': 1.0}, 'www.flipkart.com': {'burst': 1}})
+    def test_one_limiter_per_host_with_overrides(self):
+        limiter = get_rate_limiter('https://www.flipkart.com/search?q=tv')
+        self.assertIs(get_rate_limiter('https://www.flipkart.com/p/itm1'), limiter)
+        self.assertEqual((limiter.rate, limiter.burst), (1.0, 1))
+        self.assertEqual(get_rate_limiter('www.amazon.in').burst, rate_limit.DEFAULT_LIMITS['burst'])
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('12'), 12.0)
+        self.assertEqual(parse_retry_after('-3'), 0.0)
+        self.assertIsNone(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+        self.assertIsNone(parse_retry_after(None))
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from tracker import views
+from tracker.scrapers import circuit_breaker
+from tracker.scrapers.api import ScrapedItem
+
+
+class ScrapedResultFormatTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(circuit_breaker._breakers, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scrape(self, platform, items):
+        with mock.patch.object(views, 'scrape_platform', return_value=items), \
+                mock.patch.object(views, 'ingest_scraped_items'), \
+                mock.patch.object(views, 'remember_results'):
+            return views._scrape_and_store(platform, 'iphone 15')
+
+    def test_fresh_prices_match_stored_price_format(self):
+        # Scrapers return the store's text, currency included; results carry the bare amount
+        results = self.scrape('croma', [
+            ScrapedItem('croma', 'https://www.croma.com/a/p/1', name='iPhone 15', price='₹69,900.00'),
+            ScrapedItem('croma', 'https://www.croma.com/a/p/2', name='iPhone 15 Plus', price='N/A'),
+        ])
+        self.assertEqual([r['price'] for r in results], ['69900.00', 'N/A'])
+
+    def test_flipkart_price_with_strikethrough(self):
+        results = self.scrape('flipkart', [
+            ScrapedItem('flipkart', 'https://www.flipkart.com/a/p/itm1', name='Watch', price='₹3,999 ₹5,999 33% off'),
+        ])
+        self.assertEqual(results[0]['price'], '3999')
+
+    def test_display_price(self):
+        self.assertEqual(views.display_price('amazon', '₹1,23,999.00'), '123999.00')
+        self.assertEqual(views.display_price('amazon', ''), 'N/A')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'scraper': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'refresh-tests'}},
+    QUERY_CANONICALIZER={'SYNONYMS': False},
+)
+class StaleRefreshTests(SimpleTestCase):
+    def setUp(self):
+        caches['scraper'].clear()
+        self.refreshed = []
+
+        class InlineExecutor:
+            def submit(self, fn):
+                fn()
+
+        for patcher in (mock.patch.object(views, '_refresh_executor', InlineExecutor()),
+                        mock.patch.object(views, 'scrape_and_store',
+                                          side_effect=lambda platform, query: self.refreshed.append(query))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def search(self, query):
+        # A matched product that never got a price keeps the key stale after every refresh
+        product = SimpleNamespace(name='TV', latest_price=None, latest_price_at=None, image_url='', rating=None,
+                                  url='https://www.croma.com/p/1', description='')
+        return views.format_stored_products('croma', query, [product])
+
+    def test_stale_key_is_refreshed_once_per_ttl(self):
+        self.assertTrue(self.search('Sony TV')[0]['stale'])
+        self.assertTrue(self.search('sony tv')[0]['stale'])
+        self.assertEqual(self.refreshed, ['Sony TV'])
+
+    def test_other_keys_are_refreshed(self):
+        self.search('sony tv')
+        self.search('lg tv')
+        self.assertEqual(self.refreshed, ['sony tv', 'lg tv'])
@@ -0,0 +1,151 @@
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from tracker import views
+from tracker.scrapers import single_flight
+from tracker.scrapers.single_flight import single_flight_async
+
+
+@override_settings(SCRAPER_SINGLE_FLIGHT={'BACKEND': None, 'WAIT_SECONDS': 5})
+class SingleFlightAsyncTests(SimpleTestCase):
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown)
+        self.release = threading.Event()
+        self.calls = 0
+
+    def slow_scrape(self):
+        self.calls += 1
+        self.release.wait(5)
+        return [{'product_name': 'iPhone 15'}]
+
+    def test_followers_share_the_leaders_scrape(self):
+        async def burst():
+            searches = [
+                asyncio.ensure_future(single_flight_async('croma', 'iPhone 15', self.slow_scrape, self.executor))
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            return await asyncio.gather(*searches)
+
+        results = asyncio.run(burst())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [[{'product_name': 'iPhone 15'}]] * 5)
+
+    def test_followers_do_not_hold_executor_threads(self):
+        async def burst():
+            searches = [
+                asyncio.ensure_future(single_flight_async('croma', 'iphone 15', self.slow_scrape, self.executor))
+                for _ in range(10)
+            ]
+            await asyncio.sleep(0.05)
+            # Two workers: the leader holds one, the other is still free for unrelated work
+            other = await asyncio.wait_for(asyncio.wrap_future(self.executor.submit(lambda: 'free')), 1)
+            self.release.set()
+            await asyncio.gather(*searches)
+            return other
+
+        self.assertEqual(asyncio.run(burst()), 'free')
+
+    def test_leader_error_reaches_followers(self):
+        def failing_scrape():
+            self.release.wait(5)
+            raise ValueError('boom')
+
+        async def burst():
+            searches = [
+                asyncio.ensure_future(single_flight_async('croma', 'tv', failing_scrape, self.executor))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            self.release.set()
+            return await asyncio.gather(*searches, return_exceptions=True)
+
+        results = asyncio.run(burst())
+        self.assertEqual([type(r) for r in results], [ValueError] * 3)
+
+    @override_settings(SCRAPER_SINGLE_FLIGHT={'BACKEND': None, 'WAIT_SECONDS': 0.05})
+    def test_timeout_serves_cached_results(self):
+        with mock.patch.object(single_flight, 'cached_results', return_value=['cached']) as cached:
+            result = asyncio.run(single_flight_async('croma', 'fridge', self.slow_scrape, self.executor))
+        self.release.set()
+        self.executor.shutdown()
+        self.assertEqual(result, ['cached'])
+        cached.assert_called_once_with('croma', 'fridge')
+        # The abandoned leader still lands its flight
+        self.assertEqual(single_flight.single_flight_snapshot()['in_flight'], [])
+
+    def test_sync_callers_coalesce(self):
+        results = []
+
+        def search():
+            results.append(single_flight.single_flight('croma', 'iphone 15', self.slow_scrape))
+
+        threads = [threading.Thread(target=search) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 3)
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class StreamingSearchTests(SimpleTestCase):
+    DELAYS = {'Amazon': 0, 'Reliance': 0.6}
+
+    def setUp(self):
+        async def fake_search(platform, query):
+            await asyncio.sleep(self.DELAYS.get(platform, 0.05))
+            return platform, [{'product_name': f'{platform} {query}'}]
+
+        for name, value in (('get_scraped_data_async', fake_search), ('record_query', lambda query: None)):
+            patcher = mock.patch.object(views, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def events(self, chunks):
+        for chunk in chunks:
+            chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+            if chunk.startswith('event:'):
+                lines = chunk.strip().split('\n')
+                yield lines[0].split(': ', 1)[1], json.loads(lines[1].split(': ', 1)[1])
+
+    def test_wsgi_streams_each_platform_as_it_finishes(self):
+        response = self.client.get('/search/', {'q': 'tv', 'stream': '1'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertFalse(response.is_async)
+
+        started = time.monotonic()
+        first_event, first = next(self.events(response.streaming_content))
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual((first_event, first['platform']), ('platform', 'amazon'))
+
+        rest = list(self.events(response.streaming_content))
+        response.close()
+        self.assertEqual(rest[-1][0], 'done')
+        self.assertEqual(rest[-1][1]['total'], len(views.SEARCH_PLATFORMS))
+
+    def test_closing_early_cancels_pending_platforms(self):
+        response = self.client.get('/search/', {'q': 'tv', 'stream': '1'})
+        next(self.events(response.streaming_content))
+        started = time.monotonic()
+        response.close()
+        self.assertLess(time.monotonic() - started, 0.4)
+
+    async def test_asgi_streams_the_async_generator(self):
+        response = await self.async_client.get('/search/', {'q': 'tv', 'stream': '1'})
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        events = list(self.events(chunks))
+        self.assertEqual(events[0][1]['platform'], 'amazon')
+        self.assertEqual(events[-1][0], 'done')
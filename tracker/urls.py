@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('index/', views.index, name='index'),
     path('search/', views.search, name='search'),  # Map the root URL to the index view
+    path('api/scraper-health/', views.scraper_health, name='scraper_health'),
     path('track/', views.track, name='track'),
     path('price-history/', views.price_history, name='price_history'),
     path('add-tracked-product/', views.add_tracked_product, name='add_tracked_product'),
@@ -1,162 +1,217 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.core.management import call_command
 from django.contrib.auth.decorators import login_required
 from django.db.models import Min, Max, Avg
-from io import StringIO
 from datetime import datetime, timedelta
 from tracker.models import *
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import login, authenticate, logout, update_session_auth_hash
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
+from asgiref.sync import sync_to_async
 from scipy.signal import argrelextrema
 from prophet import Prophet
 import pandas as pd
 import numpy as np
+import hashlib
 import json
 import logging
-import re
+import asyncio
 import concurrent.futures
+import threading
+import time
 from .price_prediction_views import predict_future_prices, find_price_dips
+from .scrapers.api import scrape_platform
+from .scrapers.circuit_breaker import get_circuit_breaker, circuit_breaker_snapshot, cached_results, remember_results
+from .scrapers.http_cache import get_http_cache
+from .scrapers.query_utils import canonicalize_query, query_collapse_snapshot, record_query
+from .scrapers.rate_limit import failure_count, rate_limiter_snapshot
+from .scrapers.single_flight import single_flight, single_flight_async, single_flight_snapshot
+from .ingest import ingest_scraped_items, parse_price
+from .search import search_queryset
 
 logging.basicConfig(filename='scraper.log', level=logging.DEBUG)
 
-def get_scraped_data(platform, query):
-    output = StringIO()
-    
+# -------------------- STALE-WHILE-REVALIDATE --------------------
+# Known queries are answered from the DB immediately; once their newest price is
+# older than the platform's TTL a single background refresh re-scrapes them, and
+# the same key is not refreshed again until another TTL has passed.
+_refresh_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=getattr(settings, 'SEARCH_REFRESH_WORKERS', 2), thread_name_prefix='search-refresh'
+)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def search_result_ttl(platform):
+    ttls = getattr(settings, 'SEARCH_RESULT_TTL', {})
+    return ttls.get(platform.lower(), ttls.get('default', 6 * 60 * 60))
+
+def _refreshed_key(platform, canonical):
+    return f"refreshed:{platform}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+def schedule_refresh(platform, query):
+    """Re-scrape ``query`` in the background, at most once per platform TTL.
+
+    Some keys stay stale after a refresh (no matched product ever gets a price,
+    or the search also matches products the re-scrape doesn't touch), so the
+    last refresh is remembered in the shared scraper cache for the TTL.
+    """
+    key = (platform.lower(), canonicalize_query(query))
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+    try:
+        # add() only succeeds when no refresh of this key happened within the TTL, in any process
+        due = caches['scraper'].add(_refreshed_key(*key), time.time(), search_result_ttl(platform))
+    except Exception as e:
+        logging.warning(f"Could not check the last {platform} refresh of {query!r}: {e}")
+        due = True
+    if not due:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+        return False
+
+    def refresh():
+        try:
+            print(f"🔄 Background refresh of {platform} results for: {query}")
+            scrape_and_store(platform, query)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+            close_old_connections()
+
+    _refresh_executor.submit(refresh)
+    return True
+
+def display_price(platform, raw_price):
+    """A scraped price ('₹69,900.00') in the plain form stored results use ('69900.00')."""
+    price = parse_price(platform, raw_price)
+    return str(price) if price is not None else 'N/A'
+
+def has_usable_results(platform, items):
+    """Whether a scrape found at least one product with a name and a price."""
+    return any(item.name and item.name != 'N/A' and parse_price(platform, item.price) is not None for item in items)
+
+def format_stored_products(platform, query, products):
+    """Search-result dicts for products already in the DB; queues a refresh when they are stale."""
+    print(f"✅ Found {len(products)} products in database for {platform}")
+    formatted_data = []
+    freshest = None
+    for product in products:
+        product_data = {
+            'product_name': product.name,
+            'price': str(product.latest_price) if product.latest_price is not None else 'N/A',
+            'image_url': product.image_url or '',
+            'rating': str(product.rating) if product.rating is not None else 'N/A',
+            'url': product.url,
+            'description': product.description or ''
+        }
+        formatted_data.append(product_data)
+        if product.latest_price_at and (freshest is None or product.latest_price_at > freshest):
+            freshest = product.latest_price_at
+    print(f"📊 Retrieved latest prices for {len(formatted_data)} products from database")
+    logging.debug(f"Retrieved {len(formatted_data)} products from database for {platform}")
+
+    stale = freshest is None or timezone.now() - freshest > timedelta(seconds=search_result_ttl(platform))
+    if stale and schedule_refresh(platform, query):
+        print(f"⏳ {platform} results are stale, refreshing in the background")
+    for product_data in formatted_data:
+        product_data['stale'] = stale
+    return formatted_data
+
+# -------------------- ASYNC SEARCH --------------------
+# Blocking scrapes (Selenium, scrape_products) from the async search view share this
+# bounded pool, so concurrent searches queue for scraper threads instead of each
+# spawning their own. Only a flight's leader takes a thread; identical searches
+# arriving meanwhile await its result on the event loop.
+_scrape_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=getattr(settings, 'SEARCH_SCRAPE_WORKERS', 8), thread_name_prefix='search-scrape'
+)
+
+async def get_scraped_data_async(platform, query):
+    """Stored results for ``query`` via the async ORM, or a fresh scrape on the shared executor."""
     try:
         logging.debug(f"Starting scrape for {platform} with query: {query}")
         print(f"\n🔍 Checking database for {platform} products matching: {query}")
-        existing_products = ScrapedProduct.objects.filter(
-            name__icontains=query,
-            store=platform.lower()
-        ).order_by('-scraped_at')[:5]
-
-        if existing_products.exists():
-            print(f"✅ Found {existing_products.count()} products in database for {platform}")
-            formatted_data = []
-            for product in existing_products:
-                latest_price = PriceOfProductsHistory.objects.filter(
-                    url=product
-                ).order_by('-timestamp').first()
-                
-                product_data = {
-                    'product_name': product.name,
-                    'price': str(latest_price.price) if latest_price else 'N/A',
-                    'image_url': product.image_url or '',
-                    'rating': str(product.rating) if product.rating is not None else 'N/A',
-                    'url': product.url,
-                    'description': product.description or ''
-                }
-                formatted_data.append(product_data)
-            print(f"📊 Retrieved latest prices for {len(formatted_data)} products from database")
-            logging.debug(f"Retrieved {len(formatted_data)} products from database for {platform}")
-            return platform, formatted_data
-        
-        print(f"❌ No products found in database for {platform}, proceeding with scraping...")
-        logging.debug(f"No products found, scraping {platform}")
-        call_command('scrape_products', platform, query, stdout=output)
-        raw_data = json.loads(output.getvalue())
-        logging.debug(f"Raw data for {platform}: {raw_data}")
-        
-        formatted_data = []
-        if isinstance(raw_data, list):
-            for item in raw_data:
-                if isinstance(item, dict):
-                    details = item.get('details', {})
-                    url = item.get('url', '')
-                    if not url or not details:
-                        logging.warning(f"Skipping item with missing url/details: {item}")
-                        continue
-                    product_data = {
-                        'product_name': details.get('name', ''),
-                        'price': details.get('price', ''),
-                        'image_url': details.get('image_url', ''),
-                        'rating': details.get('rating', 'N/A').strip(),
-                        'url': url,
-                        'description': details.get('description', ''),
-                        'reviews': details.get('reviews', [])
-                    }
-                    if product_data['product_name'] and product_data['url']:
-                        formatted_data.append(product_data)
-                    
-                    try:
-                        # Parse price
-                        price_str = str(product_data['price'] or '')
-                        logging.debug(f"Original price string for {url}: {price_str}")
-                        
-                        if platform.lower() == 'flipkart':
-                            price_str = price_str.split()[0]
-                            logging.debug(f"After Flipkart split: {price_str}")
-                        
-                        price_str = price_str.replace('\u20b9', '').replace('₹', '').replace(',', '').strip()
-                        logging.debug(f"Cleaned price string: {price_str}")
-                        
-                        price = None
-                        if price_str and price_str.lower() != 'n/a':
-                            try:
-                                price_str = ''.join(c for c in price_str if c.isdigit() or c == '.')
-                                if price_str.count('.') > 1:
-                                    price_str = price_str.rsplit('.', 1)[0]
-                                if price_str:  # Ensure string is not empty
-                                    price = float(price_str)
-                                    logging.debug(f"Converted price: {price}")
-                            except ValueError as ve:
-                                logging.error(f"Price conversion error for {url}: {ve}")
-                        
-                        # Parse rating
-                        rating_str = product_data.get('rating', 'N/A').strip()
-                        rating = None
-                        if rating_str.lower() != 'n/a':
-                            try:
-                                # Extract numeric part (e.g., "4.2" from "4.2 out of 5 stars")
-                                match = re.match(r'(\d+\.\d+)', rating_str)
-                                if match:
-                                    rating = float(match.group(1))
-                                    logging.debug(f"Converted rating: {rating}")
-                            except ValueError as ve:
-                                logging.error(f"Rating conversion error for {url}: {ve}")
-                        
-                        with transaction.atomic():
-                            scraped_product, created = ScrapedProduct.objects.get_or_create(
-                                url=url,
-                                defaults={
-                                    'name': product_data['product_name'],
-                                    'description': product_data['description'],
-                                    'image_url': product_data['image_url'],
-                                    'store': platform.lower(),
-                                    'reviews': product_data.get('reviews', []),
-                                    'rating': rating  # Store numeric rating or None
-                                }
-                            )
-                            logging.debug(f"ScrapedProduct created: {created}, URL: {url}")
-                            if not created:
-                                scraped_product.name = product_data['product_name']
-                                scraped_product.description = product_data['description']
-                                scraped_product.image_url = product_data['image_url']
-                                scraped_product.rating = rating
-                                scraped_product.reviews = product_data.get('reviews', [])
-                                scraped_product.save()
-                            if price is not None:
-                                PriceOfProductsHistory.objects.create(
-                                    url=scraped_product,
-                                    price=price
-                                )
-                                logging.debug(f"Price history saved for {url}: {price}")
-                    
-                    except Exception as e:
-                        logging.error(f"Error storing product {url}: {str(e)}")
-        
-        return platform, formatted_data
-    except json.JSONDecodeError as je:
-        logging.error(f"Invalid JSON from scrape_products for {platform}: {str(je)}")
+        # Ranked index search; latest_price is denormalized onto the product, so this is the only query
+        existing_products = [product async for product in search_queryset(query, store=platform, limit=5)]
+        if existing_products:
+            return platform, format_stored_products(platform, query, existing_products)
+
+        return platform, await single_flight_async(
+            platform, query, lambda: _scrape_and_store(platform, query), _scrape_executor
+        )
+    except Exception as e:
+        logging.error(f"Error reading {platform} results: {str(e)}")
         return platform, []
+
+def scrape_and_store(platform, query):
+    """Scrape ``platform`` for ``query`` now and upsert the products and prices.
+
+    Concurrent identical searches share one scrape (see single_flight).
+    """
+    return platform, single_flight(platform, query, lambda: _scrape_and_store(platform, query))
+
+def _scrape_and_store(platform, query):
+    try:
+        # A platform that keeps failing or timing out is skipped until its breaker probes again
+        breaker = get_circuit_breaker(platform)
+        if not breaker.allow_request():
+            cached = cached_results(platform, query)
+            print(f"⚡ {platform} circuit is open, skipping scrape ({len(cached)} cached results)")
+            return cached
+
+        print(f"🕸️ Scraping {platform} for: {query}")
+        logging.debug(f"Scraping {platform} for {query}")
+        started = time.monotonic()
+        failures_before = failure_count(platform)
+        try:
+            items = scrape_platform(platform, query)
+        except Exception:
+            breaker.record(False, time.monotonic() - started)
+            raise
+        # The scrapers swallow bot-check pages, exhausted retries and timed-out page loads,
+        # and markup changes leave every field 'N/A'; all of those count against the breaker
+        breaker.record(
+            failure_count(platform) == failures_before and has_usable_results(platform, items),
+            time.monotonic() - started,
+        )
+        logging.debug(f"Scraped {len(items)} {platform} items for {query}")
+        
+        formatted_data = [
+            {
+                'product_name': item.name,
+                'price': display_price(platform, item.price),
+                'image_url': item.image_url,
+                'rating': item.rating,
+                'url': item.url,
+                'description': item.description,
+                'reviews': item.reviews
+            }
+            for item in items if item.name
+        ]
+
+        try:
+            # One batch of upserts and price inserts for the whole platform (see tracker.ingest)
+            result = ingest_scraped_items(platform, items)
+            print(f"💾 Stored {result}")
+        except Exception as e:
+            logging.error(f"Error storing {platform} products: {str(e)}")
+
+        if formatted_data:
+            remember_results(platform, query, formatted_data)
+        return formatted_data
     except Exception as e:
         logging.error(f"Error scraping {platform}: {str(e)}")
-        return platform, []
+        return []
 
 
 
@@ -169,28 +224,94 @@ def index(request):
 def track(request):
     return render(request, 'tracker/track.html')
 
+def scraper_health(request):
+    """Circuit-breaker state per platform plus fetch-engine, coalescing and query-collapse stats, for monitoring."""
+    http_cache = get_http_cache()
+    return JsonResponse({
+        'platforms': circuit_breaker_snapshot(),
+        'rate_limits': rate_limiter_snapshot(),
+        'http_cache': http_cache.stats() if http_cache else None,
+        'single_flight': single_flight_snapshot(),
+        'queries': query_collapse_snapshot(),
+    })
+
+SEARCH_PLATFORMS = ['Amazon', 'Flipkart', 'Reliance', 'Brand', 'Croma']
+SSE_KEEPALIVE_SECONDS = 15
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_search_results(query):
+    """Server-sent events: one ``platform`` event per platform as soon as it finishes, then ``done``."""
+    started = time.monotonic()
+    counts = {}
+    pending = {asyncio.ensure_future(get_scraped_data_async(platform, query)) for platform in SEARCH_PLATFORMS}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=SSE_KEEPALIVE_SECONDS, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                yield ": keep-alive\n\n"  # Stops proxies dropping the connection during slow Selenium runs
+            for task in done:
+                platform, result = task.result()
+                counts[platform.lower()] = len(result)
+                yield sse_event('platform', {
+                    'platform': platform.lower(),
+                    'results': result,
+                    'elapsed': round(time.monotonic() - started, 2),
+                })
+        yield sse_event('done', {
+            'counts': counts,
+            'total': sum(counts.values()),
+            'elapsed': round(time.monotonic() - started, 2),
+        })
+    finally:
+        # The client may hang up early; don't hold the response open for the remaining scrapes
+        for task in pending:
+            task.cancel()
+
+def iterate_on_private_loop(async_iterator):
+    """Yield an async iterator's items to sync code, driving it on an event loop of its own.
+
+    WSGI servers (runserver, gunicorn) read a response body synchronously, and
+    Django collects an async streaming body into a list before sending any of
+    it; iterating on a private loop keeps each SSE event flowing as it happens.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        # Client hung up or the stream ended: let the generator cancel its pending scrapes
+        loop.run_until_complete(async_iterator.aclose())
+        cancelled = asyncio.all_tasks(loop)
+        if cancelled:
+            loop.run_until_complete(asyncio.gather(*cancelled, return_exceptions=True))
+        loop.close()
+
 @csrf_exempt
-def search(request):
+async def search(request):
     if request.method == 'GET':
         query = request.GET.get('q', '').strip()
         if query:
-            # Define platforms
-            platforms = ['Amazon', 'Flipkart', 'Reliance', 'Brand', 'Croma']
-
-            # Create a dictionary to store results
-            results = {}
-
-            # Use ThreadPoolExecutor to run scraping concurrently
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                # Map get_scraped_data to each platform and query concurrently
-                future_to_platform = {executor.submit(get_scraped_data, platform, query): platform for platform in platforms}
-
-                # Collect results as they complete
-                for future in concurrent.futures.as_completed(future_to_platform):
-                    platform, result = future.result()
-                    results[platform.lower()] = result
+            # Off the event loop: canonicalizing may (re)load the synonym table
+            await sync_to_async(record_query)(query)
+            if request.GET.get('stream'):
+                events = stream_search_results(query)
+                if not isinstance(request, ASGIRequest):
+                    events = iterate_on_private_loop(events)
+                response = StreamingHttpResponse(events, content_type='text/event-stream')
+                response['Cache-Control'] = 'no-cache'
+                response['X-Accel-Buffering'] = 'no'
+                return response
 
-            return JsonResponse(results, safe=False)
+            # All platforms concurrently on the event loop
+            results = await asyncio.gather(*(get_scraped_data_async(platform, query) for platform in SEARCH_PLATFORMS))
+            return JsonResponse({platform.lower(): result for platform, result in results}, safe=False)
         else:
             return JsonResponse({'error': 'No query provided'}, status=400)
     return JsonResponse({'error': 'Invalid request method'}, status=405)
@@ -210,14 +331,21 @@ def add_tracked_product(request):
                 from django.contrib.auth.models import User
                 user, created = User.objects.get_or_create(username='demo_user')
             
-            # Create or get TrackedProduct entry
-            tracked_product, created = TrackedProduct.objects.get_or_create(
-                name=product_name,
-                user=user
-            )
+            # Spellings of the same product ("iphone 15 128 gb", "Apple iPhone 15 (128GB)") share one entry
+            canonical_name = record_query(product_name)[:200]
+            already_tracked = TrackedProduct.objects.filter(canonical_name=canonical_name).exists()
+            tracked_product = TrackedProduct.objects.filter(canonical_name=canonical_name, user=user).first()
+            if tracked_product is None:
+                tracked_product = TrackedProduct.objects.create(
+                    name=product_name,
+                    canonical_name=canonical_name,
+                    user=user
+                )
             
-            # Scrape and store prices immediately
-            call_command('scrape_and_store_prices', product_name)
+            # Scrape and store prices immediately, unless someone already tracks it and
+            # update_tracked_prices keeps its prices fresh
+            if not already_tracked:
+                call_command('scrape_and_store_prices', product_name)
             
             return JsonResponse({'success': True, 'product_name': product_name})
         except Exception as e:
@@ -791,7 +919,6 @@ def product_page(request):
     if product_url:
         # Try to get the specific product by URL
         product = ScrapedProduct.objects.filter(url=product_url).first()
-        latest_price = PriceOfProductsHistory.objects.filter(url=product_url).order_by('-timestamp').first()
         review_analysis = ReviewAnalysis.objects.filter(url=product_url).first()
         # Get price history for chart
         price_history = PriceOfProductsHistory.objects.filter(url=product_url).order_by('timestamp')
@@ -799,10 +926,10 @@ def product_page(request):
     if not product:
         # Fallback to latest product if no URL provided or product not found
         product = ScrapedProduct.objects.order_by('-scraped_at').first()
-        latest_price = PriceOfProductsHistory.objects.filter(url=product.url).order_by('-timestamp').first()
         review_analysis = ReviewAnalysis.objects.filter(url=product.url).first()
         price_history = PriceOfProductsHistory.objects.filter(url=product.url).order_by('timestamp')
 
+    latest_price = product.latest_price
     # Create DataFrame for prediction
     df = pd.DataFrame([
         {
@@ -840,8 +967,8 @@ def product_page(request):
     
     # Calculate average and lowest prices from history
     prices = [ph.price for ph in price_history]
-    avg_price = sum(prices) / len(prices) if prices else latest_price.price if latest_price else None
-    lowest_price = min(prices) if prices else latest_price.price if latest_price else None
+    avg_price = sum(prices) / len(prices) if prices else latest_price
+    lowest_price = min(prices) if prices else latest_price
     lowest_price_date = None
     for ph in price_history:
         if ph.price == lowest_price:
@@ -849,11 +976,11 @@ def product_page(request):
             break
     
     # Get highest price from history to use as "original" price
-    highest_price = max(prices) if prices else latest_price.price if latest_price else None    # Calculate discount percentage and estimated savings
+    highest_price = max(prices) if prices else latest_price    # Calculate discount percentage and estimated savings
     discount_percentage = None
     estimated_savings = None
     if latest_price and highest_price:
-        current_price = float(latest_price.price)
+        current_price = float(latest_price)
         original_price = float(highest_price)
         if current_price != original_price:
             discount = original_price - current_price
@@ -947,10 +1074,14 @@ def add_price_alert(request):
         if not product_url or not target_price:
             return JsonResponse({'status': 'error', 'message': 'Missing required fields'}, status=400)
 
-        # Get current price from saved product or recent search
+        # Get current price from the latest scrape, else the price the product was saved at
         try:
             saved_product = SavedProduct.objects.get(user=request.user, product_url=product_url)
-            current_price = saved_product.price
+            current_price = ScrapedProduct.objects.filter(
+                url=product_url, latest_price__isnull=False
+            ).values_list('latest_price', flat=True).first()
+            if current_price is None:
+                current_price = saved_product.price
             if not product_name:
                 product_name = saved_product.product_name
         except SavedProduct.DoesNotExist: